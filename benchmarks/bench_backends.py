@@ -0,0 +1,75 @@
+"""
+Compares ResumeGenerator's 'pylatex' and 'string' backends.
+
+Generates .tex files for large synthetic resumes with both backends, checks
+that they are byte-identical and reports the time spent in generate(). YAML
+loading is left out of the timings. No TeX installation is needed.
+
+    python -m benchmarks.bench_backends --sections 40 --items 20 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import synthetic_resume  # noqa: E402
+from src.core.generator import ResumeGenerator  # noqa: E402
+
+
+def time_backend(yaml_path, backend, repeat, out_dir):
+    """Returns (timings in seconds, generated LaTeX) for one backend."""
+    timings = []
+    tex_name = os.path.join(out_dir, backend)
+    cwd = os.getcwd()
+    os.chdir(out_dir)
+    try:
+        for _ in range(repeat):
+            generator = ResumeGenerator(yaml_path, 'deedy.cls', backend=backend)
+            start = time.perf_counter()
+            generator.generate(backend)
+            timings.append(time.perf_counter() - start)
+    finally:
+        os.chdir(cwd)
+    with open(tex_name + '.tex', encoding='utf-8') as f:
+        return timings, f.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sections', type=int, default=40)
+    parser.add_argument('--items', type=int, default=20, help='Items per section.')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        yaml_path = os.path.join(out_dir, 'resume.yaml')
+        with open(yaml_path, 'w') as f:
+            yaml.safe_dump(synthetic_resume(args.sections, args.items, args.seed), f, sort_keys=False)
+
+        results = {backend: time_backend(yaml_path, backend, args.repeat, out_dir)
+                   for backend in ResumeGenerator.BACKENDS}
+
+    outputs = {tex for _, tex in results.values()}
+    if len(outputs) != 1:
+        print('Backends produced different LaTeX!')
+        return 1
+    size = len(outputs.pop())
+    print(f'{args.sections} sections x {args.items} items, {size} bytes of LaTeX, {args.repeat} runs')
+    base = statistics.median(results['pylatex'][0])
+    for backend, (timings, _) in results.items():
+        median = statistics.median(timings)
+        print(f'{backend:>8}: median {median * 1000:8.2f} ms  min {min(timings) * 1000:8.2f} ms  '
+              f'({base / median:.1f}x)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
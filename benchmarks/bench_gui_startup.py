@@ -0,0 +1,95 @@
+"""
+Measures GUI startup: time to first paint and until the editor is ready.
+
+Starts ``MainWindow`` in fresh interpreters on a synthetic ``resume.yaml``
+and reports, from the start of the process, when the main module was
+imported, when the window was first mapped, when the YAML file was loaded
+and when the last section view was built. Needs a display (or ``xvfb-run``);
+no TeX installation.
+
+    python -m benchmarks.bench_gui_startup --size 40x20 --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_suite import parse_size  # noqa: E402
+from benchmarks.synthetic import synthetic_resume  # noqa: E402
+
+# Gives up on a window that is not ready after this long
+TIMEOUT_S = 60
+
+# Runs in the child: open the window, pump events until it is ready, report
+_CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+sys.path[:0] = {paths!r}
+from gui.main_window import MainWindow
+imported = time.perf_counter() - start
+window = MainWindow()
+offset = window._started - start
+while not window.ready and time.perf_counter() - start < {timeout!r}:
+    window.update()
+stages = window.startup_profile.summary()["stages"]
+window.destroy()
+print(json.dumps({{"imported": imported, "ready": window.ready,
+                   "marks": {{name[len("startup."):]: offset + entry["seconds"] for name, entry in stages.items()
+                             if name in ("startup.first_paint", "startup.loaded", "startup.ready")}},
+                   "stages": stages}}))
+'''
+
+MARKS = ('imported', 'first_paint', 'loaded', 'ready')
+
+
+def start_window(cwd) -> dict:
+    """Opens and closes the main window once in a new interpreter; returns its timings."""
+    code = _CHILD.format(paths=[str(ROOT / 'src'), str(ROOT)], timeout=TIMEOUT_S)
+    proc = subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'window failed to start')
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    if not result['ready']:
+        raise RuntimeError(f'window not ready after {TIMEOUT_S} s')
+    return {'imported': result['imported'], **result['marks'], 'stages': result['stages']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=parse_size, default=parse_size('12x8'),
+                        help='Resume size as SECTIONSxITEMS[xDEPTH].')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sections, items, depth = args.size
+    with tempfile.TemporaryDirectory(prefix='latexcv-bench-') as work:
+        with open(os.path.join(work, 'resume.yaml'), 'w') as f:
+            yaml.safe_dump(synthetic_resume(sections, items, args.seed, depth=depth), f, sort_keys=False)
+        try:
+            runs = [start_window(work) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f'GUI did not start: {e}')
+            return 1
+
+    print(f'MainWindow startup, {sections}x{items}x{depth} resume, {args.repeat} cold starts (ms from process start)')
+    for mark in MARKS:
+        times = [run[mark] * 1000 for run in runs if mark in run]
+        if times:
+            print(f'  {mark:<12} median {statistics.median(times):8.1f} ms  min {min(times):8.1f} ms')
+    sections_ms = [run['stages'].get('startup.section', {}).get('seconds', 0) * 1000 for run in runs]
+    print(f'  section views built in {statistics.median(sections_ms):.1f} ms (median), one per event-loop turn')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
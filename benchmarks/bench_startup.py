@@ -0,0 +1,106 @@
+"""
+Measures cold start of ``latexcv generate`` with ``python -X importtime``.
+
+Runs the CLI entry point in fresh interpreters on a small resume and reports
+the wall time, the total time spent importing, and the slowest imports. It
+fails when a module that ``generate`` should never load (pylatex with the
+string backend, the GUI toolkits) shows up, or when ``--max-import-ms`` is
+exceeded. No TeX installation is needed.
+
+    python -m benchmarks.bench_startup --repeat 5 --max-import-ms 150
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import synthetic_resume  # noqa: E402
+
+# Top-level packages `generate` must not import (pylatex is fine with its own backend)
+FORBIDDEN = ('pylatex', 'ttkbootstrap', 'tkfontawesome', 'tkinter', 'PIL', 'pdf2image')
+
+# Runs the installed `latexcv` entry point from the source tree
+_LAUNCHER = (
+    'import sys; sys.path[:0] = {paths!r}; sys.argv = ["latexcv"] + {argv!r}; '
+    'from latexcv.main import main; main()'
+)
+
+
+def startup_profile(argv, cwd=None) -> dict:
+    """Runs ``latexcv <argv>`` in a new interpreter under ``-X importtime``.
+
+    Returns the exit code, wall time in seconds, and a ``{module: (self us,
+    cumulative us)}`` map of everything imported.
+    """
+    code = _LAUNCHER.format(paths=[str(ROOT / 'src'), str(ROOT)], argv=list(argv))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=cwd,
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative))
+    return {'returncode': proc.returncode, 'wall': wall, 'modules': modules, 'stderr': proc.stderr}
+
+
+def forbidden_imports(modules, allow=()) -> list:
+    return sorted(name for name in modules if name.split('.')[0] in FORBIDDEN and name.split('.')[0] not in allow)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--backend', default='string')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list.')
+    parser.add_argument('--max-import-ms', type=float, default=None,
+                        help='Fail if the median total import time exceeds this.')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work:
+        yaml_path = os.path.join(work, 'resume.yaml')
+        with open(yaml_path, 'w') as f:
+            yaml.safe_dump(synthetic_resume(4, 4), f, sort_keys=False)
+        cli = ['generate', yaml_path, '--output', os.path.join(work, 'resume.tex'), '--backend', args.backend]
+        runs = [startup_profile(cli, cwd=work) for _ in range(args.repeat)]
+
+    failed = [run for run in runs if run['returncode'] != 0]
+    if failed:
+        print(failed[0]['stderr'][-2000:])
+        print('latexcv generate failed')
+        return 1
+    imports = [sum(s for s, _ in run['modules'].values()) / 1000 for run in runs]
+    walls = [run['wall'] * 1000 for run in runs]
+    print(f'latexcv generate --backend {args.backend}, {args.repeat} cold starts')
+    print(f'  wall:    median {statistics.median(walls):7.1f} ms  min {min(walls):7.1f} ms')
+    print(f'  imports: median {statistics.median(imports):7.1f} ms  min {min(imports):7.1f} ms  '
+          f'({len(runs[-1]["modules"])} modules)')
+    print('  slowest imports (cumulative):')
+    slowest = sorted(runs[-1]['modules'].items(), key=lambda kv: -kv[1][1])[:args.top]
+    for name, (_, cumulative) in slowest:
+        print(f'    {cumulative / 1000:7.1f} ms  {name}')
+
+    status = 0
+    forbidden = forbidden_imports(runs[-1]['modules'], allow=('pylatex',) if args.backend == 'pylatex' else ())
+    if forbidden:
+        print(f'Imported modules generate should not need: {", ".join(forbidden)}')
+        status = 1
+    if args.max_import_ms is not None and statistics.median(imports) > args.max_import_ms:
+        print(f'Median import time is over the {args.max_import_ms} ms budget')
+        status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
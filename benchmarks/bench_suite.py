@@ -0,0 +1,215 @@
+"""
+Benchmark suite: the hot paths of a build across resume sizes.
+
+Times ``ResumeGenerator.generate`` (every installed backend), LaTeX text
+escaping, YAML load and dump, and ``SectionManager.autosave_order`` on
+synthetic resumes of each ``--sizes`` entry (``SECTIONSxITEMS`` or
+``SECTIONSxITEMSxDEPTH``). Results are written as JSON; ``--compare`` checks
+them against an earlier run and fails on any case that got slower than
+``--tolerance`` allows. No TeX installation or display is needed.
+
+    python -m benchmarks.bench_suite --output bench.json
+    python -m benchmarks.bench_suite --compare bench.json --tolerance 0.25
+"""
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# the GUI modules import `core.*` with src/ on the path
+sys.path[:0] = [str(ROOT / 'src'), str(ROOT)]
+
+from benchmarks.synthetic import synthetic_resume  # noqa: E402
+from core import yaml_loader  # noqa: E402
+from core.generator import BACKENDS, ResumeGenerator  # noqa: E402
+from models.resume_model import ResumeModel  # noqa: E402
+
+DEFAULT_SIZES = ('4x4', '12x8', '40x20', '12x8x6')
+FORMAT = 1
+
+
+def _section_manager_class():
+    # gui/__init__ pulls in the Tk main window; the manager itself needs no toolkit
+    spec = importlib.util.spec_from_file_location('section_manager', ROOT / 'src' / 'gui' / 'section_manager.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SectionManager
+
+
+class _Section:
+    """Stands in for a SectionView: autosave_order only reads its data and visibility."""
+
+    def __init__(self, data, visible=True):
+        self.data = data
+        self.visible = visible
+
+    def get_data(self):
+        return self.data
+
+
+def parse_size(text):
+    """``'12x8'`` -> ``(12, 8, 2)``; a third number sets the nesting depth."""
+    numbers = [int(n) for n in text.lower().split('x')]
+    if len(numbers) not in (2, 3):
+        raise argparse.ArgumentTypeError(f'Expected SECTIONSxITEMS[xDEPTH], got {text!r}')
+    return tuple(numbers) if len(numbers) == 3 else (*numbers, 2)
+
+
+def _strings(node):
+    if isinstance(node, str):
+        yield node
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            yield from _strings(key)
+            yield from _strings(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _strings(value)
+
+
+def measure(func, repeat, setup=None):
+    """Runs ``func(setup())`` ``repeat`` times; returns the timings in seconds."""
+    timings = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _has_pylatex():
+    try:
+        import pylatex  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def cases(data, work_dir):
+    """Yields ``(name, func, setup)`` for every benchmark on one resume."""
+    tex_path = os.path.join(work_dir, 'resume.tex')
+    has_pylatex = _has_pylatex()
+    for backend in BACKENDS:
+        if backend == 'pylatex' and not has_pylatex:
+            continue
+        yield (f'generate.{backend}',
+               lambda generator: generator.generate(tex_path),
+               lambda backend=backend: ResumeGenerator.from_data(data, 'deedy.cls', backend=backend))
+
+    texts = list(_strings(data))
+    yield 'latex_text', lambda _: [ResumeGenerator._latex_text(text) for text in texts], None
+    if has_pylatex:
+        generator = ResumeGenerator.from_data(data, 'deedy.cls', backend='pylatex')
+        yield ('process_text_for_latex',
+               lambda _: [generator._process_text_for_latex(text) for text in texts], None)
+
+    text = yaml_loader.dump(data, sort_keys=False)
+    yield 'yaml.load', lambda _: yaml_loader.loads(text), None
+    yield 'yaml.dump', lambda _: yaml_loader.dump(data, sort_keys=False), None
+
+    yaml_path = os.path.join(work_dir, 'order.yaml')
+    with open(yaml_path, 'w') as f:
+        f.write(text)
+    model = ResumeModel(yaml_path)
+    names = list(data)
+    sections = {name: _Section(value, visible=n % 5 != 4) for n, (name, value) in enumerate(data.items())}
+    manager = _section_manager_class()(model, sections, names, [])
+    # every section unchanged since the last save, then every section new
+    yield 'autosave_order', lambda _: manager.autosave_order(), None
+    yield 'autosave_order.cold', lambda _: manager.autosave_order(), lambda: manager._blocks.clear()
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat=5, seed=0, only=None, on_case=None) -> dict:
+    """Runs every case on every size and returns the JSON-ready results.
+
+    ``only`` limits the run to case names starting with one of its prefixes.
+    ``on_case(key, result)`` is called as each case finishes.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='latexcv-bench-') as work_dir:
+        for size in sizes:
+            sections, items, depth = parse_size(size) if isinstance(size, str) else size
+            data = synthetic_resume(sections, items, seed, depth=depth)
+            for name, func, setup in cases(data, work_dir):
+                if only and not name.startswith(tuple(only)):
+                    continue
+                func(setup() if setup else None)  # warm-up
+                timings = measure(func, repeat, setup)
+                key = f'{name}/{sections}x{items}x{depth}'
+                results[key] = {
+                    'case': name, 'sections': sections, 'items': items, 'depth': depth, 'runs': repeat,
+                    'median_ms': round(statistics.median(timings) * 1000, 4),
+                    'min_ms': round(min(timings) * 1000, 4),
+                }
+                if on_case:
+                    on_case(key, results[key])
+    return {
+        'format': FORMAT,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'libyaml': yaml_loader.HAS_LIBYAML,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance=0.25) -> list:
+    """Returns ``(key, baseline ms, current ms)`` of every case slower than the baseline allows.
+
+    Cases compare on their median; ones missing from either run are skipped.
+    """
+    slower = []
+    for key, result in current['results'].items():
+        before = baseline.get('results', {}).get(key)
+        if before is None or not before['median_ms']:
+            continue
+        if result['median_ms'] > before['median_ms'] * (1 + tolerance):
+            slower.append((key, before['median_ms'], result['median_ms']))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=parse_size, nargs='+', default=[parse_size(s) for s in DEFAULT_SIZES],
+                        help='Resume sizes as SECTIONSxITEMS[xDEPTH].')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='+', default=None, help='Run only the cases starting with these names.')
+    parser.add_argument('--output', type=str, default=None, help='Write the results as JSON to this file.')
+    parser.add_argument('--compare', type=str, default=None, help='Results JSON of an earlier run to compare with.')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown against --compare, as a fraction of the old median.')
+    args = parser.parse_args(argv)
+
+    def report(key, result):
+        print(f'{key:<40} median {result["median_ms"]:10.3f} ms  min {result["min_ms"]:10.3f} ms')
+
+    results = run_suite(args.sizes, args.repeat, args.seed, args.only, on_case=report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'Results written to {args.output}')
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        slower = compare(results, baseline, args.tolerance)
+        for key, before, after in slower:
+            print(f'SLOWER {key}: {before:.3f} ms -> {after:.3f} ms ({after / before:.2f}x)')
+        if slower:
+            return 1
+        print(f'No case slower than {args.tolerance:.0%} over {args.compare}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
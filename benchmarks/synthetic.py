@@ -0,0 +1,81 @@
+"""
+Synthetic resume data for benchmarks.
+
+``synthetic_resume()`` returns a resume mapping shaped like resume.yaml but
+as large as asked for, exercising every formatting path of the generator:
+both columns, bullet lists, nested items, links, metadata lines, keyword
+lists and characters that need escaping. ``depth`` controls how deep item
+lists nest inside ``contribution``/``description`` fields.
+"""
+import random
+
+WORDS = (
+    'design build ship scale latency throughput cache compiler parser model '
+    'service queue index shard replica pipeline kernel driver widget layout '
+    'resume template section python rust go c++ 50% R&D $cost #1 snake_case {braces}'
+).split()
+
+TITLE_KEYS = ['position', 'degree', 'title', 'project', 'name']
+SUBTITLE_KEYS = ['company', 'institution', 'issuer']
+
+
+def _words(rng, n):
+    return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+
+def _item(rng, depth=0, max_depth=2):
+    item = {rng.choice(TITLE_KEYS): _words(rng, 3).title()}
+    if rng.random() < 0.8:
+        item[rng.choice(SUBTITLE_KEYS)] = _words(rng, 2).title()
+    if rng.random() < 0.7:
+        item['dates'] = f'{rng.randint(2000, 2020)} - {rng.randint(2021, 2030)}'
+    if rng.random() < 0.5:
+        item['location'] = _words(rng, 2).title()
+    if rng.random() < 0.3:
+        item['url'] = f'https://example.com/{rng.randint(1, 10**6)}'
+        if rng.random() < 0.5:
+            item['url_href'] = _words(rng, 2)
+    if rng.random() < 0.2:
+        item['pull_request'] = f'#{rng.randint(1, 9999)}'
+    roll = rng.random()
+    # nested items mostly nest further, so a large depth gives deep lists
+    if depth < max_depth and (roll >= 0.8 or (depth > 0 and roll < 0.5)):
+        # nested item lists alternate between the two keys that accept them
+        key = 'contribution' if depth % 2 == 0 else 'description'
+        item[key] = [_item(rng, depth + 1, max_depth) for _ in range(rng.randint(1, 3))]
+    elif roll < 0.5:
+        lines = []
+        for _ in range(rng.randint(1, 6)):
+            lines.append('- ' + _words(rng, rng.randint(4, 16)))
+            if rng.random() < 0.2:
+                lines.append('  ' + _words(rng, 5))
+        item['description'] = '\n'.join(lines)
+    elif roll < 0.8:
+        item['details'] = _words(rng, rng.randint(8, 40))
+    if rng.random() < 0.4:
+        item['technologies'] = [rng.choice(WORDS) for _ in range(rng.randint(1, 6))]
+    return item
+
+
+def synthetic_resume(sections=12, items_per_section=8, seed=0, depth=2) -> dict:
+    """Returns a reproducible resume mapping with ``sections`` sections."""
+    rng = random.Random(seed)
+    data = {
+        'name': {'first': 'Jane', 'last': 'Synthetic'},
+        'contact': {
+            'email': 'jane@example.com',
+            'github': 'https://github.com/jane',
+            'linkedin': 'https://www.linkedin.com/in/jane/',
+            'phone': '+1 555 0100',
+        },
+    }
+    for n in range(sections):
+        name = f'section_{n}_{rng.choice(WORDS).replace(" ", "_")}'
+        if rng.random() < 0.2:
+            items = [_words(rng, 2) for _ in range(items_per_section)]
+        else:
+            items = [_item(rng, max_depth=depth) for _ in range(items_per_section)]
+            if rng.random() < 0.4:
+                items.insert(0, {'left': True})
+        data[name] = items
+    return data
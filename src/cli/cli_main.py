@@ -1,11 +1,43 @@
 """
 CLI entry point for LaTexCV project (moved to src/cli/cli_main.py).
+
+Each subcommand imports what it needs when it runs, so a short job such as
+``generate`` does not pay for the compiler, daemon or pylatex imports.
 """
 import argparse
 import sys
 import os
-from src.core.cv_compiler import CVCompiler
-from src.core.generator.resume_generator import ResumeGenerator
+from contextlib import contextmanager
+from src.core.generator import BACKENDS
+
+
+@contextmanager
+def _profiled(args):
+    """Records the stages run in the block if --profile or --profile-json asked for it.
+
+    Yields the active Profile, or None when not profiling.
+    """
+    if not (args.profile or args.profile_json):
+        yield None
+        return
+    from src.core.profiling import Profile
+    profile = Profile(trace=bool(args.profile_json))
+    try:
+        with profile.active():
+            yield profile
+    finally:
+        if args.profile:
+            print(profile.report(), file=sys.stderr)
+        if args.profile_json:
+            profile.write_trace(args.profile_json)
+            print(f"Profile trace written: {args.profile_json}", file=sys.stderr)
+
+
+def _add_profile_arguments(subparser):
+    subparser.add_argument("--profile", action="store_true", help="Print the time spent in each build stage.")
+    subparser.add_argument("--profile-json", type=str, default=None, metavar="PATH",
+                           help="Write the build stages as a Chrome/Perfetto trace to PATH.")
+
 
 def run_cli():
     parser = argparse.ArgumentParser(description="LaTexCV CLI - Compile and generate resumes from YAML.")
@@ -15,30 +47,169 @@ def run_cli():
     compile_parser = subparsers.add_parser("compile", help="Compile CV from YAML file.")
     compile_parser.add_argument("yaml_file", type=str, help="Path to the resume YAML file.")
     compile_parser.add_argument("--output", type=str, default="resume.pdf", help="Output PDF filename.")
+    compile_parser.add_argument("--no-cache", action="store_true", help="Always run LaTeX, bypassing the PDF cache.")
+    compile_parser.add_argument("--no-daemon", action="store_true", help="Compile in this process even if a compile daemon is running.")
+    compile_parser.add_argument("--backend", choices=BACKENDS, default="string", help="LaTeX emitter used by the generator.")
+    _add_profile_arguments(compile_parser)
 
     # Generate resume command
     generate_parser = subparsers.add_parser("generate", help="Generate resume from YAML.")
     generate_parser.add_argument("yaml_file", type=str, help="Path to the resume YAML file.")
     generate_parser.add_argument("--template", type=str, default="deedy", help="LaTeX template to use.")
     generate_parser.add_argument("--output", type=str, default="resume.tex", help="Output LaTeX filename.")
+    generate_parser.add_argument("--backend", choices=BACKENDS, default="string", help="LaTeX emitter used by the generator.")
+    _add_profile_arguments(generate_parser)
+
+    # Batch compile command
+    batch_parser = subparsers.add_parser("batch", help="Compile many resumes in parallel.")
+    batch_parser.add_argument("source", type=str, help="Glob of resume YAML files, a .txt/.json manifest listing them, or a .jsonl file of resumes.")
+    batch_parser.add_argument("--template", type=str, default="deedy", help="LaTeX template to use.")
+    batch_parser.add_argument("--output-dir", type=str, default="batch_output", help="Directory for the generated PDFs.")
+    batch_parser.add_argument("--jobs", type=int, default=None, help="Number of worker processes (default: CPU count).")
+    batch_parser.add_argument("--report", type=str, default=None, help="Path of the JSON results report (default: <output-dir>/batch_report.json).")
+    batch_parser.add_argument("--keep-build", action="store_true", help="Keep per-job build directories of successful jobs.")
+    batch_parser.add_argument("--no-cache", action="store_true", help="Always run LaTeX, bypassing the PDF cache.")
+    batch_parser.add_argument("--no-daemon", action="store_true", help="Compile in the batch workers even if a compile daemon is running.")
+    batch_parser.add_argument("--stream", action="store_true", help="Read SOURCE as one multi-document YAML file with a resume per document.")
+    batch_parser.add_argument("--backend", choices=BACKENDS, default="string", help="LaTeX emitter used by the generator.")
+    _add_profile_arguments(batch_parser)
+
+    # PDF cache maintenance
+    cache_parser = subparsers.add_parser("cache", help="Inspect or prune the compiled PDF cache.")
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command", required=True)
+    cache_subparsers.add_parser("stats", help="Show cache size and entry count.")
+    prune_parser = cache_subparsers.add_parser("prune", help="Evict least recently used PDFs.")
+    prune_parser.add_argument("--max-size", type=float, default=None, help="Shrink the cache to this many MB (default: configured limit).")
+    prune_parser.add_argument("--all", action="store_true", help="Remove every cached PDF.")
+
+    # Warm compile daemon
+    daemon_parser = subparsers.add_parser("daemon", help="Run or control the warm compile daemon.")
+    daemon_subparsers = daemon_parser.add_subparsers(dest="daemon_command", required=True)
+    start_parser = daemon_subparsers.add_parser("start", help="Run the daemon in the foreground.")
+    start_parser.add_argument("--workers", type=int, default=None, help="Number of warm worker processes (default: CPU count).")
+    start_parser.add_argument("--warm", type=str, nargs="*", default=None, help="Templates to precompile at start-up (default: all in cls/).")
+    daemon_subparsers.add_parser("stop", help="Stop a running daemon.")
+    daemon_subparsers.add_parser("status", help="Show whether a daemon is running.")
+
+    # Local HTTP render service
+    serve_parser = subparsers.add_parser("serve", help="Serve PDF/LaTeX rendering over local HTTP.")
+    serve_parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on.")
+    serve_parser.add_argument("--port", type=int, default=8737, help="Port to listen on.")
+    serve_parser.add_argument("--workers", type=int, default=None, help="Number of render workers (default: CPU count).")
+    serve_parser.add_argument("--queue-size", type=int, default=32, help="Requests allowed to wait for a worker before answering 503.")
+    serve_parser.add_argument("--no-cache", action="store_true", help="Always run LaTeX, bypassing the PDF cache.")
+    serve_parser.add_argument("--backend", choices=BACKENDS, default="string", help="LaTeX emitter used by the generator.")
+    serve_parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    _add_profile_arguments(serve_parser)
 
     args = parser.parse_args()
 
     if args.command == "compile":
+        from src.core.compile_daemon import DaemonClient
+        from src.core.cv_compiler import CVCompiler
+        from src.core.pdf_cache import PDFCache
+        from src.core.tex_format import FormatCache
         cls_file = os.path.join("cls", "deedy.cls")
-        compiler = CVCompiler("build")
-        success, msg = compiler.build_pipeline(args.yaml_file, args.output.replace(".pdf", ".tex"), cls_file)
+        compiler = CVCompiler("build", cache=None if args.no_cache else PDFCache(), formats=FormatCache(),
+                              daemon=None if args.no_daemon else DaemonClient(), backend=args.backend)
+        with _profiled(args):
+            success, msg = compiler.build_pipeline(args.yaml_file, args.output.replace(".pdf", ".tex"), cls_file)
         print(msg)
         sys.exit(0 if success else 1)
     elif args.command == "generate":
+        from src.core.generator.resume_generator import ResumeGenerator
         cls_file = os.path.join("cls", f"{args.template}.cls")
-        generator = ResumeGenerator(args.yaml_file, cls_file)
         try:
-            generator.generate(args.output)
+            with _profiled(args):
+                ResumeGenerator(args.yaml_file, cls_file, backend=args.backend).generate(args.output)
             print(f"LaTeX resume generated: {args.output}")
         except Exception as e:
             print(f"Error generating resume: {e}")
             sys.exit(1)
+    elif args.command == "batch":
+        from src.core.batch import run_batch
+        from src.core.compile_daemon import DaemonClient
+        from src.core.pdf_cache import PDFCache
+        from src.core.tex_format import FormatCache
+        cls_file = os.path.join("cls", f"{args.template}.cls")
+
+        def report_progress(result):
+            status = "ok" if result["success"] else "FAILED"
+            print(f"[{status}] {result['name']}: {result['message']}")
+
+        # the workers' stages are merged into the active profile
+        with _profiled(args):
+            report = run_batch(args.source, args.output_dir, cls_file, workers=args.jobs,
+                               report_path=args.report, keep_build=args.keep_build,
+                               on_result=report_progress, cache=None if args.no_cache else PDFCache(),
+                               formats=FormatCache(), daemon=None if args.no_daemon else DaemonClient(),
+                               stream=args.stream, backend=args.backend)
+        if not report["jobs"]:
+            print(f"No resumes matched: {args.source}")
+            sys.exit(1)
+        print(f"{report['succeeded']}/{report['jobs']} resumes compiled in {report['seconds']}s")
+        sys.exit(0 if not report["failed"] else 1)
+    elif args.command == "cache":
+        from src.core.pdf_cache import PDFCache
+        cache = PDFCache()
+        if args.cache_command == "prune":
+            if args.all:
+                removed = cache.clear()
+            elif args.max_size is not None:
+                removed = cache.prune(int(args.max_size * 1024 * 1024))
+            else:
+                removed = cache.prune()
+            print(f"Removed {removed} cached PDF(s)")
+        stats = cache.stats()
+        print(f"Cache directory: {stats['directory']}")
+        print(f"Entries: {stats['entries']}")
+        print(f"Size: {stats['bytes'] / (1024 * 1024):.1f} MB of {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+    elif args.command == "daemon":
+        from src.core.compile_daemon import DaemonClient
+        client = DaemonClient()
+        if args.daemon_command == "start":
+            import glob
+            from src.core.compile_daemon import CompileDaemon
+            if client.ping():
+                print("A compile daemon is already running.")
+                sys.exit(1)
+            warm = args.warm if args.warm is not None else glob.glob(os.path.join("cls", "*.cls"))
+            daemon = CompileDaemon(workers=args.workers, warm=warm)
+            print(f"Compile daemon listening on {daemon.address} with {daemon.workers} workers")
+            try:
+                daemon.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        elif args.daemon_command == "stop":
+            if not client.shutdown():
+                print("No compile daemon is running.")
+                sys.exit(1)
+            print("Compile daemon stopped.")
+        else:
+            status = client.ping()
+            if not status:
+                print("No compile daemon is running.")
+                sys.exit(1)
+            print(f"Compile daemon running (pid {status['pid']}, {status['workers']} workers, "
+                  f"{status['completed']} builds, {status['failed']} failed, up {status['uptime']}s)")
+    elif args.command == "serve":
+        from src.core.cv_compiler import CVCompiler
+        from src.core.generator import FragmentCache
+        from src.core.pdf_cache import PDFCache
+        from src.core.render_server import RenderServer
+        from src.core.tex_format import FormatCache
+        compiler = CVCompiler("build", silent=True, cache=None if args.no_cache else PDFCache(), formats=FormatCache(),
+                              fragment_cache=FragmentCache(), backend=args.backend)
+        # the report or trace covers every render until the server stops
+        with _profiled(args) as profile:
+            server = RenderServer(compiler, (args.host, args.port), workers=args.workers,
+                                  queue_size=args.queue_size, verbose=args.verbose, profile=profile)
+            host, port = server.address
+            print(f"Render service listening on http://{host}:{port} with {server.workers} workers")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
     else:
         parser.print_help()
 
@@ -0,0 +1,236 @@
+"""asyncio front end for CVCompiler.
+
+``AsyncCompiler`` runs the TeX engine through asyncio subprocesses, so a
+single event loop can drive many compiles without a thread per job:
+
+    async with AsyncCompiler(CVCompiler(silent=True), concurrency=4) as compiler:
+        ok, msg = await compiler.compile('resume.yaml', 'cls/deedy.cls', 'out/resume.pdf')
+        future = await compiler.submit('other.yaml', 'cls/deedy.cls', 'out/other.pdf')
+        ok, msg = await future
+
+At most ``concurrency`` jobs run at once. ``submit()`` puts jobs on a bounded
+queue and waits while it is full, which pushes back on producers;
+``submit_nowait()`` raises ``asyncio.QueueFull`` instead. Every job has a
+deadline after which its engine process is killed, and cancelling a job
+(or the future ``submit()`` returned) kills it as well.
+
+Generation and cache lookups are short and run in the default thread pool.
+So does dumping a template's format on its first use; that engine gets only
+the time left before the deadline, and a job's directory goes back to the
+pool only once the thread working in it has returned.
+A compile daemon configured on the CVCompiler is not used here.
+"""
+import asyncio
+import os
+
+from .cv_compiler import MAX_LATEX_PASSES, aux_state, compiled_message
+from .profiling import count, stage
+from .tex_format import DUMP_TIMEOUT
+
+DEFAULT_TIMEOUT = 120
+DEFAULT_QUEUE_SIZE = 64
+
+
+class AsyncCompiler:
+    def __init__(self, compiler, concurrency=None, queue_size=DEFAULT_QUEUE_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.compiler = compiler
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._workers = []
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    # --- engine --------------------------------------------------------------
+
+    async def run_command(self, cmd, cwd=None):
+        """Async counterpart of CVCompiler.run_command; kills the process if cancelled."""
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, cwd=cwd, stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        try:
+            stdout, stderr = await proc.communicate()
+        except BaseException:
+            # timed out or cancelled: never leave a runaway engine behind
+            if proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+                await asyncio.shield(proc.wait())
+            raise
+        stdout = stdout.decode(errors='replace')
+        stderr = stderr.decode(errors='replace')
+        if proc.returncode != 0:
+            # TeX engines report errors on stdout
+            return False, stderr or stdout
+        return True, stdout
+
+    async def run_latex(self, tex_name, fmt_name=None, cwd=None):
+        """Async counterpart of CVCompiler.run_latex; returns ``(success, output, passes)``."""
+        state = aux_state(cwd or '.', tex_name)
+        for number in range(1, MAX_LATEX_PASSES + 1):
+            with stage('latex.pass', number=number, format=fmt_name):
+                success, output = await self.run_command(self.compiler.latex_command(tex_name, fmt_name), cwd=cwd)
+            previous, state = state, aux_state(cwd or '.', tex_name)
+            if not success or state == previous:
+                break
+        return success, output, number
+
+    # --- single jobs -----------------------------------------------------------
+
+    async def compile(self, source, cls_file, output_pdf, tex_output=None, timeout=None):
+        """Compiles one resume, waiting for a free slot first. Returns ``(success, message)``.
+
+        ``source`` is a YAML path or the resume data as a dict, as for CVCompiler.compile.
+        """
+        timeout = timeout or self.timeout
+        async with self._slots:
+            self.running += 1
+            try:
+                async with asyncio.timeout(timeout) as scope:
+                    with stage('compile', template=os.path.basename(cls_file)):
+                        success, msg = await self._compile(source, cls_file, output_pdf, tex_output, scope.when())
+            except TimeoutError:
+                self.timed_out += 1
+                success, msg = False, f'LaTeX compilation timed out after {timeout}s'
+            finally:
+                self.running -= 1
+        if success:
+            self.completed += 1
+        else:
+            self.failed += 1
+        return success, msg
+
+    async def _compile(self, source, cls_file, output_pdf, tex_output, deadline):
+        compiler = self.compiler
+        key = None
+        if compiler.cache is not None:
+            try:
+                with stage('compile.cache'):
+                    key = await asyncio.to_thread(compiler.cache_key, source, cls_file)
+                    os.makedirs(os.path.dirname(os.path.abspath(output_pdf)), exist_ok=True)
+                    hit = await asyncio.to_thread(compiler.cache.get, key, output_pdf)
+                if hit:
+                    count('compile.cache_hits')
+                    if tex_output is not None:
+                        await asyncio.to_thread(compiler.write_tex, source, cls_file, tex_output)
+                    return True, 'PDF served from cache'
+            except Exception:
+                # A broken cache must never break a build
+                key = None
+        tex_name = os.path.splitext(os.path.basename(output_pdf))[0]
+        with compiler.workspaces.workspace() as work_dir:
+            result = await self._compile_in(work_dir, source, cls_file, tex_name, deadline)
+            success, msg = compiler._finish(work_dir, tex_name, output_pdf, tex_output, result)
+        if success and key is not None and os.path.exists(output_pdf):
+            try:
+                await asyncio.to_thread(compiler.cache.put, key, output_pdf)
+            except Exception:
+                pass
+        return success, msg
+
+    async def _in_thread(self, func, *args):
+        """Runs ``func`` in a thread like asyncio.to_thread, but if cancelled
+        waits for the thread to return before passing the cancellation on, so
+        the job's directory is never released while the thread still uses it.
+        """
+        task = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            await asyncio.wait([task])
+            raise
+
+    async def _compile_in(self, work_dir, source, cls_file, tex_name, deadline):
+        compiler = self.compiler
+        success, msg = await self._in_thread(compiler._prepare, work_dir, source, cls_file, tex_name)
+        if not success:
+            return success, msg
+        # may dump a format on first use of a template, in the time that is left
+        remaining = max(deadline - asyncio.get_running_loop().time(), 0) if deadline is not None else DUMP_TIMEOUT
+        fmt = await self._in_thread(compiler._link_format, work_dir, tex_name, os.path.abspath(cls_file), remaining)
+        if fmt is not None:
+            try:
+                success, output, passes = await self.run_latex(tex_name, fmt.stem, cwd=work_dir)
+            except OSError as e:
+                success, output = False, str(e)
+            if success and os.path.exists(os.path.join(work_dir, tex_name + '.pdf')):
+                return True, compiled_message(passes)
+        try:
+            success, output, passes = await self.run_latex(tex_name, cwd=work_dir)
+        except OSError:
+            return False, f'LaTeX compilation failed: no LaTeX compiler found ({compiler.engine})'
+        return compiler._typeset_result(work_dir, tex_name, success, output, fmt, passes)
+
+    # --- queue -----------------------------------------------------------------
+
+    def _start_workers(self):
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def submit(self, source, cls_file, output_pdf, **kwargs) -> asyncio.Future:
+        """Queues a job, waiting while the queue is full; returns a future of its result."""
+        self._start_workers()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((future, (source, cls_file, output_pdf), kwargs))
+        return future
+
+    def submit_nowait(self, source, cls_file, output_pdf, **kwargs) -> asyncio.Future:
+        """Like submit(), but raises asyncio.QueueFull instead of waiting."""
+        self._start_workers()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((future, (source, cls_file, output_pdf), kwargs))
+        return future
+
+    async def _worker(self):
+        while True:
+            future, args, kwargs = await self._queue.get()
+            try:
+                if future.cancelled():
+                    continue
+                job = asyncio.create_task(self.compile(*args, **kwargs))
+                # cancelling the caller's future cancels the running job
+                future.add_done_callback(lambda f, job=job: job.cancel() if f.cancelled() else None)
+                try:
+                    result = await job
+                except asyncio.CancelledError:
+                    if asyncio.current_task().cancelling():
+                        # the worker itself is being shut down
+                        future.cancel()
+                        raise
+                    continue
+                except Exception as e:
+                    result = (False, f'LaTeX compilation failed: {e}')
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    async def join(self):
+        """Waits until every queued job has finished."""
+        await self._queue.join()
+
+    async def aclose(self):
+        """Stops the workers; queued and running jobs are cancelled."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            future, _, _ = self._queue.get_nowait()
+            future.cancel()
+            self._queue.task_done()
@@ -0,0 +1,255 @@
+"""Batch compilation of many resume YAML files across a process pool.
+
+Each job is compiled by its own ``CVCompiler`` in an isolated build
+directory, so jobs never wipe each other's files. The outcome of every job
+is collected into a JSON report written next to the generated PDFs.
+
+In stream mode the source is a single file holding many resumes, either as a
+multi-document YAML stream or as JSON Lines. Documents are read one at a
+time, and only as fast as the workers take them, so memory use does not
+grow with the size of the input.
+"""
+import glob
+import json
+import os
+import shutil
+import time
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from pathlib import Path
+
+from .cv_compiler import CVCompiler
+from .profiling import Profile, current
+from .workspace import WorkspacePool
+from .yaml_loader import JSONL_SUFFIXES, iter_documents
+
+# Sources ending in one of these suffixes are read as manifests (a list of
+# YAML files) rather than being expanded as a glob pattern.
+MANIFEST_SUFFIXES = ('.txt', '.json')
+REPORT_NAME = 'batch_report.json'
+# Jobs submitted to the pool but not finished yet, per worker
+IN_FLIGHT_PER_WORKER = 2
+
+
+def _read_manifest(path: Path) -> list:
+    """Returns the manifest entries as dicts with a ``yaml`` key.
+
+    A ``.txt`` manifest lists one YAML path per line (``#`` starts a comment).
+    A ``.json`` manifest is a list of paths or of objects with a ``yaml`` key
+    and an optional ``template`` overriding the batch template.
+    """
+    base = path.parent
+    entries = []
+    if path.suffix == '.json':
+        with path.open() as f:
+            raw = json.load(f)
+        if not isinstance(raw, list):
+            raise ValueError(f'{path}: manifest must be a JSON list')
+        for entry in raw:
+            if isinstance(entry, str):
+                entry = {'yaml': entry}
+            if not isinstance(entry, dict) or 'yaml' not in entry:
+                raise ValueError(f'{path}: invalid manifest entry {entry!r}')
+            entries.append(dict(entry))
+    else:
+        with path.open() as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    entries.append({'yaml': line})
+    # Relative paths in a manifest are relative to the manifest itself
+    for entry in entries:
+        entry['yaml'] = str(base / entry['yaml'])
+    return entries
+
+
+def resolve_sources(source: str) -> list:
+    """Expands a glob pattern or manifest file into a list of job entries."""
+    path = Path(source)
+    if path.suffix in MANIFEST_SUFFIXES and path.is_file():
+        return _read_manifest(path)
+    return [{'yaml': p} for p in sorted(glob.glob(source, recursive=True))]
+
+
+def plan_jobs(entries: list, output_dir: str, cls_file: str) -> list:
+    """Assigns each entry a unique name, build directory and output PDF."""
+    output_dir = os.path.abspath(output_dir)
+    jobs, used = [], set()
+    for entry in entries:
+        stem = Path(entry['yaml']).stem
+        name, n = stem, 1
+        while name in used:
+            n += 1
+            name = f'{stem}-{n}'
+        used.add(name)
+        template = entry.get('template')
+        jobs.append({
+            'name': name,
+            'yaml': os.path.abspath(entry['yaml']),
+            'cls': os.path.abspath(os.path.join('cls', f'{template}.cls') if template else cls_file),
+            'build_dir': os.path.join(output_dir, '.build', name),
+            'pdf': os.path.join(output_dir, f'{name}.pdf'),
+        })
+    return jobs
+
+
+def stream_jobs(source: str, output_dir: str, cls_file: str):
+    """Yields one job per document of a multi-document YAML or JSON Lines file.
+
+    A job carries its parsed document as ``data``, which the worker compiles
+    directly. Documents that are not mappings yield a job with an ``error``
+    instead.
+    """
+    output_dir = os.path.abspath(output_dir)
+    stem = Path(source).stem
+    for number, document in enumerate(iter_documents(source), 1):
+        name = f'{stem}-{number}'
+        job = {
+            'name': name,
+            'yaml': source,
+            'document': number,
+            'data': document,
+            'cls': os.path.abspath(cls_file),
+            'build_dir': os.path.join(output_dir, '.build', name),
+            'pdf': os.path.join(output_dir, f'{name}.pdf'),
+        }
+        if not isinstance(document, dict):
+            job['error'] = f'Document {number} is not a mapping'
+        yield job
+
+
+def _job_result(job: dict, pdf, success: bool, message: str, seconds) -> dict:
+    result = {
+        'name': job['name'],
+        'yaml': job['yaml'],
+        'pdf': pdf,
+        'success': success,
+        'message': message,
+        'seconds': seconds,
+    }
+    if 'document' in job:
+        result['document'] = job['document']
+    return result
+
+
+def _failed(job: dict, message: str) -> dict:
+    return _job_result(job, None, False, message, None)
+
+
+def compile_job(job: dict, keep_build: bool = False, cache=None, daemon=None, formats=None,
+                profile=False) -> dict:
+    """Compiles a single job in its own build directory.
+
+    Runs inside a worker process, so it only takes and returns plain data
+    (a ``PDFCache``, ``FormatCache`` or ``DaemonClient`` is just a path and
+    a few settings). With ``profile``, the result carries the job's stage
+    timings under ``'profile'`` as a ``Profile.export()``.
+    """
+    start = time.perf_counter()
+    recorder = Profile() if profile else None
+    # atexit never runs in pool workers, so the default pool would leak its directories
+    workspaces = WorkspacePool()
+    try:
+        with recorder.active() if recorder else nullcontext():
+            # auxiliary files stay in the job's own build directory; no store to keep them in
+            compiler = CVCompiler(job['build_dir'], silent=True, cache=cache, formats=formats, daemon=daemon,
+                                  keep_aux=False, workspaces=workspaces, backend=job.get('backend', 'string'))
+            source = job['data'] if 'data' in job else job['yaml']
+            success, msg = compiler.compile(source, job['cls'], job['pdf'], work_dir=job['build_dir'])
+    finally:
+        workspaces.close()
+    pdf = job['pdf'] if success else None
+    if success and not keep_build:
+        shutil.rmtree(job['build_dir'], ignore_errors=True)
+    result = _job_result(job, pdf, success, msg, round(time.perf_counter() - start, 3))
+    if recorder:
+        result['profile'] = recorder.export()
+    return result
+
+
+def is_stream(source: str) -> bool:
+    """JSON Lines sources are always read as a stream of resumes."""
+    return source.endswith(JSONL_SUFFIXES) and os.path.isfile(source)
+
+
+def run_batch(source: str, output_dir: str, cls_file: str, workers=None,
+              report_path=None, keep_build=False, on_result=None, cache=None, daemon=None, formats=None,
+              stream=False, backend='string') -> dict:
+    """Compiles every resume matched by ``source`` and writes a JSON report.
+
+    With ``stream`` (or a JSON Lines ``source``), ``source`` is one file
+    holding a resume per document. ``on_result`` is called with each job
+    result as soon as it finishes. Every job is generated with the
+    ``backend`` LaTeX emitter. Returns the report dict. When a
+    ``Profile`` is active, the stages of every job are merged into it.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if stream or is_stream(source):
+        jobs = stream_jobs(source, output_dir, cls_file)
+    else:
+        jobs = iter(plan_jobs(resolve_sources(source), output_dir, cls_file))
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    results, order = [], {}
+    profile = current()
+
+    def finish(result):
+        exported = result.pop('profile', None)
+        if exported and profile is not None:
+            profile.merge(exported)
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    def collect(futures):
+        for future in futures:
+            job = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # A crashed worker still gets a line in the report
+                result = _failed(job, f'Worker failed: {e}')
+            finish(result)
+
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            try:
+                job = next(jobs, None)
+            except Exception as e:
+                # The rest of an unreadable stream cannot be recovered
+                number = len(order) + 1
+                job = {'name': f'{Path(source).stem}-{number}', 'yaml': source}
+                order[job['name']] = len(order)
+                finish(_failed(job, f'Could not read document {number}: {e}'))
+                break
+            if job is None:
+                break
+            order[job['name']] = len(order)
+            if 'error' in job:
+                finish(_failed(job, job['error']))
+                continue
+            job['backend'] = backend
+            # Read ahead of the workers only a little
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[pool.submit(compile_job, job, keep_build, cache, daemon, formats, profile is not None)] = job
+        collect(as_completed(list(pending)))
+    results.sort(key=lambda r: order[r['name']])
+
+    succeeded = sum(1 for r in results if r['success'])
+    report = {
+        'source': source,
+        'template': cls_file,
+        'backend': backend,
+        'jobs': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'seconds': round(time.perf_counter() - start, 3),
+        'results': results,
+    }
+    report_path = report_path or os.path.join(output_dir, REPORT_NAME)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
@@ -0,0 +1,91 @@
+"""Single-threaded build queue where the newest request wins.
+
+The GUI asks for a build after every burst of edits. Builds share one build
+directory, so they must not overlap, and a build of data that has been edited
+since is wasted work. ``BuildWorker`` runs builds one at a time on a
+dedicated thread and only ever keeps the latest pending request: submitting
+replaces whatever was waiting, the running build is told it is stale through
+its ``cancelled`` callback, and results of superseded builds are dropped.
+A ``merge`` function can carry over what the replaced request must not lose.
+"""
+import queue
+import threading
+
+
+class BuildWorker:
+    def __init__(self, build, name='latexcv-build', merge=None):
+        # build(request, cancelled) -> result; cancelled() turns True once a
+        # newer request has been submitted
+        self._build = build
+        # merge(replaced, request) -> the request to queue instead of request
+        self._merge = merge
+        self._name = name
+        self._cond = threading.Condition()
+        self._pending = None
+        self._generation = 0
+        self._results = queue.SimpleQueue()
+        self._thread = None
+        self._running = False
+        self._stopped = False
+
+    def submit(self, request) -> int:
+        """Queues ``request``, superseding any pending or running one."""
+        with self._cond:
+            if self._pending is not None and self._merge is not None:
+                request = self._merge(self._pending[1], request)
+            self._generation += 1
+            self._pending = (self._generation, request)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return self._generation
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self._generation
+
+    @property
+    def busy(self) -> bool:
+        """True while a request is waiting or being built."""
+        with self._cond:
+            return self._pending is not None or self._running
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                generation, request = self._pending
+                self._pending = None
+                self._running = True
+            try:
+                result = self._build(request, lambda: not self.is_current(generation))
+            except Exception as e:
+                result = (False, str(e))
+            with self._cond:
+                self._running = False
+            if self.is_current(generation):
+                self._results.put((generation, request, result))
+
+    def poll(self):
+        """Returns ``(request, result)`` of the newest finished build, or None.
+
+        Meant to be called periodically from the UI thread; results that were
+        overtaken by a newer request are skipped.
+        """
+        latest = None
+        while True:
+            try:
+                latest = self._results.get_nowait()
+            except queue.Empty:
+                break
+        if latest is None or not self.is_current(latest[0]):
+            return None
+        return latest[1], latest[2]
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
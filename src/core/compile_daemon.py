@@ -0,0 +1,267 @@
+"""Long-lived compile daemon with warm worker processes.
+
+Each worker imports the generator once and keeps a dumped preamble format
+per template, so a job only pays for typesetting instead of Python, pylatex
+and TeX start-up. Clients talk to the daemon over a local socket, one JSON
+request and one JSON reply per connection::
+
+    {"op": "compile", "yaml": "/abs/resume.yaml", "cls": "/abs/deedy.cls",
+     "output": "/abs/build/resume.pdf", "backend": "string"}
+    {"op": "compile", "data": {...resume...}, "cls": ..., "output": ...}
+    {"op": "ping"}
+    {"op": "shutdown"}
+
+``CVCompiler`` hands builds to the daemon whenever one is running and falls
+back to compiling in-process otherwise.
+
+The Unix socket is only accessible to its owner. Any local user can reach
+the TCP fallback, so there every request must carry the token the daemon
+writes to a file only its owner can read.
+"""
+import hmac
+import json
+import os
+import secrets
+import shutil
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
+from pathlib import Path
+
+from .cv_compiler import CVCompiler
+from .tex_format import FormatCache
+from .workspace import WorkspacePool
+
+# Platforms without Unix sockets fall back to a loopback TCP port
+HAS_UNIX_SOCKETS = hasattr(socket, 'AF_UNIX')
+DEFAULT_PORT = 48731
+
+
+def default_address():
+    """Returns the socket path (or TCP address) the daemon listens on."""
+    if os.environ.get('LATEXCV_DAEMON_SOCKET'):
+        return os.environ['LATEXCV_DAEMON_SOCKET']
+    if HAS_UNIX_SOCKETS:
+        user = getattr(os, 'getuid', lambda: 'user')()
+        return os.path.join(tempfile.gettempdir(), f'latexcv-{user}.sock')
+    return ('127.0.0.1', DEFAULT_PORT)
+
+
+def default_token_path():
+    """Returns the file holding the token of a daemon on a TCP address."""
+    return os.environ.get('LATEXCV_DAEMON_TOKEN_FILE') or os.path.join(os.path.expanduser('~'),
+                                                                         '.latexcv-daemon-token')
+
+
+def _write_token(path, token):
+    if os.path.exists(path):
+        os.remove(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(token)
+
+
+# --- worker side: runs inside the pool processes ---------------------------
+
+_worker = {}
+
+
+def _init_worker(fmt_dir, warm_cls, engine='pdflatex', parent_dir=None):
+    """Sets up a worker's private build directory and warms it up.
+
+    Warming compiles an empty resume per template, which imports pylatex and
+    dumps the template's preamble format before the first real job arrives.
+    The worker's section fragment cache lives as long as the worker does.
+    Everything the worker writes lives under one directory in ``parent_dir``,
+    removed when the worker exits (atexit does not run in pool workers).
+    """
+    from .generator import FragmentCache
+    root = tempfile.mkdtemp(prefix='latexcv-worker-', dir=parent_dir)
+    workspaces = WorkspacePool(root)
+    Finalize(None, _cleanup_worker, args=(workspaces, root), exitpriority=10)
+    compiler = CVCompiler(os.path.join(root, 'build'), silent=True, formats=FormatCache(fmt_dir, engine=engine),
+                          fragment_cache=FragmentCache(), engine=engine, workspaces=workspaces)
+    _worker['compiler'] = compiler
+    warm_yaml = os.path.join(root, 'warm.yaml')
+    with open(warm_yaml, 'w') as f:
+        f.write('{}\n')
+    for cls_file in warm_cls:
+        compiler.compile(warm_yaml, cls_file, os.path.join(root, 'warm.pdf'))
+
+
+def _cleanup_worker(workspaces, root):
+    workspaces.close()
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def _run_job(request: dict) -> dict:
+    compiler = _worker['compiler']
+    # each client builds with its own backend; a worker runs one job at a time
+    compiler.backend = request.get('backend', 'pylatex')
+    source = request['data'] if 'data' in request else request['yaml']
+    success, msg = compiler.compile(source, request['cls'], request['output'])
+    return {'ok': success, 'message': msg, 'worker': os.getpid()}
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+# --- server side -------------------------------------------------------------
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            reply = self.server.compile_daemon.handle(request)
+        except Exception as e:
+            reply = {'ok': False, 'message': f'Bad request: {e}'}
+        self.wfile.write(json.dumps(reply).encode() + b'\n')
+
+
+if HAS_UNIX_SOCKETS:
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class CompileDaemon:
+    def __init__(self, address=None, workers=None, warm=(), fmt_dir=None, engine='pdflatex', token_path=None):
+        self.address = address or default_address()
+        self.workers = workers or os.cpu_count() or 1
+        self.warm = [os.path.abspath(c) for c in warm]
+        self.fmt_dir = fmt_dir
+        self.engine = engine
+        # Clients on a TCP address prove they are the daemon's user with this
+        self.token = secrets.token_hex(16) if isinstance(self.address, tuple) else None
+        self.token_path = token_path or default_token_path()
+        self.pool = None
+        self.server = None
+        self.started = None
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request: dict) -> dict:
+        if self.token is not None and not hmac.compare_digest(str(request.get('token', '')), self.token):
+            return {'ok': False, 'message': 'Bad or missing daemon token'}
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid(), 'workers': self.workers,
+                    'completed': self.completed, 'failed': self.failed,
+                    'uptime': round(time.time() - self.started, 1)}
+        if op == 'compile':
+            result = self.pool.submit(_run_job, request).result()
+            with self._lock:
+                if result['ok']:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            return result
+        if op == 'shutdown':
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {'ok': True, 'message': 'Shutting down'}
+        return {'ok': False, 'message': f'Unknown op: {op!r}'}
+
+    def serve_forever(self):
+        # the workers' directories go in here, so even a killed worker leaves nothing behind
+        work_dir = tempfile.mkdtemp(prefix='latexcv-daemon-')
+        try:
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                            initargs=(self.fmt_dir, self.warm, self.engine, work_dir))
+            # Start every worker now rather than on the first jobs
+            for future in [self.pool.submit(_ready) for _ in range(self.workers)]:
+                future.result()
+            if isinstance(self.address, tuple):
+                self.server = _TCPServer(self.address, _Handler)
+                _write_token(self.token_path, self.token)
+            else:
+                if os.path.exists(self.address):
+                    os.remove(self.address)  # stale socket from a crashed daemon
+                # owner-only from the moment it exists
+                umask = os.umask(0o177)
+                try:
+                    self.server = _UnixServer(self.address, _Handler)
+                finally:
+                    os.umask(umask)
+            self.server.compile_daemon = self
+            self.started = time.time()
+            try:
+                self.server.serve_forever()
+            finally:
+                self.server.server_close()
+                try:
+                    os.remove(self.token_path if isinstance(self.address, tuple) else self.address)
+                except OSError:
+                    pass
+        finally:
+            if self.pool is not None:
+                # waits for the workers, which clean up after themselves as they exit
+                self.pool.shutdown(cancel_futures=True)
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+class DaemonClient:
+    def __init__(self, address=None, timeout=300, token_path=None):
+        self.address = address or default_address()
+        self.timeout = timeout
+        self.token_path = token_path or default_token_path()
+
+    def available(self) -> bool:
+        """Cheap check used before every build: is a daemon socket there?"""
+        if isinstance(self.address, tuple):
+            return True
+        return Path(self.address).exists()
+
+    def request(self, payload: dict) -> dict:
+        """Sends one request; raises OSError if no daemon is listening."""
+        if isinstance(self.address, tuple):
+            # a missing token file means no daemon of ours is running
+            with open(self.token_path) as f:
+                payload = {**payload, 'token': f.read().strip()}
+        family = socket.AF_INET if isinstance(self.address, tuple) else socket.AF_UNIX
+        with socket.socket(family, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.address)
+            # YAML dates and the like travel as strings, as in PDF cache keys
+            sock.sendall(json.dumps(payload, default=str).encode() + b'\n')
+            with sock.makefile('rb') as f:
+                line = f.readline()
+        if not line:
+            raise ConnectionError('Compile daemon closed the connection')
+        return json.loads(line)
+
+    def ping(self):
+        try:
+            return self.request({'op': 'ping'})
+        except OSError:
+            return None
+
+    def shutdown(self) -> bool:
+        try:
+            return self.request({'op': 'shutdown'}).get('ok', False)
+        except OSError:
+            return False
+
+    def compile(self, source, cls_file, output, backend='pylatex'):
+        """Compiles a YAML path, or resume data passed as a dict, in the daemon."""
+        request = {
+            'op': 'compile',
+            'cls': os.path.abspath(cls_file),
+            'output': os.path.abspath(output),
+            'backend': backend,
+        }
+        if isinstance(source, dict):
+            request['data'] = source
+        else:
+            request['yaml'] = os.path.abspath(source)
+        reply = self.request(request)
+        return reply.get('ok', False), reply.get('message', '')
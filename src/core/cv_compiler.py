@@ -1,10 +1,43 @@
+import hashlib
 import os
 import shutil
 import subprocess
+import tempfile
+
+from .profiling import count, stage
+from .tex_format import DUMP_TIMEOUT, split_preamble
+from .workspace import default_pool, link_asset
+from .yaml_loader import load_file
+
+# pdflatex passes to run at most when the auxiliary files keep changing
+MAX_LATEX_PASSES = 3
+# Files a pass writes for the next one to read; once a pass leaves them as
+# they were, another pass would typeset the same document
+AUX_SUFFIXES = ('.aux', '.out', '.toc')
 
 class CVCompiler:
-    def __init__(self, build_dir='build'):
+    def __init__(self, build_dir='build', silent=False, cache=None, formats=None,
+                 daemon=None, engine='pdflatex', fragment_cache=None, backend='pylatex', keep_aux=True,
+                 workspaces=None):
         self.build_dir = build_dir
+        self.silent = silent
+        # Optional PDFCache; unchanged resumes are then served without LaTeX
+        self.cache = cache
+        # Optional FormatCache; compiles then start from a dumped preamble
+        self.formats = formats
+        # Optional DaemonClient; builds go to a running compile daemon if one is up
+        self.daemon = daemon
+        self.engine = engine
+        # Optional FragmentCache shared by every build of this compiler, so
+        # unchanged sections are not re-rendered
+        self.fragment_cache = fragment_cache
+        # ResumeGenerator backend: 'pylatex' or 'string'
+        self.backend = backend
+        # Auxiliary files of each job's last successful build, by job name.
+        # A build starts from them, so an unchanged document converges in one pass
+        self.aux_dir = os.path.join(build_dir, '.aux') if keep_aux else None
+        # WorkspacePool handing out the private directory of each compile
+        self.workspaces = workspaces if workspaces is not None else default_pool()
         os.makedirs(self.build_dir, exist_ok=True)
 
     def run_command(self, cmd, cwd=None):
@@ -12,57 +45,281 @@ class CVCompiler:
             result = subprocess.run(cmd, cwd=cwd, check=True, capture_output=True, text=True)
             return True, result.stdout
         except subprocess.CalledProcessError as e:
-            return False, e.stderr
+            # TeX engines report errors on stdout
+            return False, e.stderr or e.stdout
+
+    def latex_command(self, tex_name, fmt_name=None):
+        cmd = [self.engine, '-interaction=nonstopmode', '-halt-on-error']
+        if fmt_name:
+            cmd.append(f'-fmt={fmt_name}')
+        return cmd + [tex_name + '.tex']
+
+    def run_latex(self, tex_name, fmt_name=None, cwd=None):
+        """Runs the engine on ``tex_name``.tex until its auxiliary files stop changing.
+
+        Returns ``(success, output, passes)``.
+        """
+        state = aux_state(cwd or '.', tex_name)
+        for number in range(1, MAX_LATEX_PASSES + 1):
+            with stage('latex.pass', number=number, format=fmt_name):
+                success, output = self.run_command(self.latex_command(tex_name, fmt_name), cwd=cwd)
+            previous, state = state, aux_state(cwd or '.', tex_name)
+            if not success or state == previous:
+                break
+        return success, output, number
+
+    def _restore_aux(self, work_dir, tex_name):
+        """Seeds ``work_dir`` with the auxiliary files of the job's last build.
+
+        Stale files are harmless: the pass that reads them writes different
+        ones, and run_latex then runs another pass.
+        """
+        if self.aux_dir is None:
+            return
+        restored = 0
+        for suffix in AUX_SUFFIXES:
+            target = os.path.join(work_dir, tex_name + suffix)
+            if os.path.exists(target):
+                continue
+            try:
+                shutil.copyfile(os.path.join(self.aux_dir, tex_name + suffix), target)
+                restored += 1
+            except OSError:
+                pass
+        if restored:
+            count('latex.aux_restored')
+
+    def _save_aux(self, work_dir, tex_name):
+        if self.aux_dir is None:
+            return
+        for suffix in AUX_SUFFIXES:
+            path = os.path.join(work_dir, tex_name + suffix)
+            stored = os.path.join(self.aux_dir, tex_name + suffix)
+            try:
+                if os.path.exists(path):
+                    _publish(path, stored)
+                elif os.path.exists(stored):
+                    os.remove(stored)
+            except OSError:
+                pass  # the next build just takes an extra pass
+
+    def _link_format(self, work_dir, tex_name, cls_path, timeout=DUMP_TIMEOUT):
+        """Makes the dumped format for this document available in ``work_dir``.
 
-    def copy_files(self, tex_file, cls_file):
-        # Step 2: Copy files to build dir, rename cls file to match template name
+        Returns the format, or None when there is none; callers then compile
+        the regular way. A format dump gets at most ``timeout`` seconds.
+        """
+        if self.formats is None:
+            return None
+        with open(os.path.join(work_dir, tex_name + '.tex'), 'r', encoding='utf-8') as f:
+            preamble = split_preamble(f.read())
+        with stage('compile.format'):
+            fmt = self.formats.get(cls_path, preamble, timeout=timeout)
+        if fmt is None:
+            return None
         try:
-            import os
-            shutil.rmtree(self.build_dir)
-            os.makedirs(self.build_dir)
-            cls_basename = os.path.basename(cls_file)
-            shutil.copy(cls_file, os.path.join(self.build_dir, cls_basename))
+            # kpathsea looks for formats in the working directory first
+            link_asset(fmt, work_dir)
+        except OSError:
+            return None
+        return fmt
 
-            return True, "Files copied"
-        except Exception as e:
-            return False, f"File copy failed: {e}"
+    def generator(self, source, cls_file):
+        """A ResumeGenerator for ``source``: a YAML path or the resume data as a dict."""
+        from .generator import ResumeGenerator
+        if isinstance(source, dict):
+            return ResumeGenerator.from_data(source, cls_file, fragment_cache=self.fragment_cache,
+                                             backend=self.backend)
+        return ResumeGenerator(yaml_path=source, cls_file=cls_file, fragment_cache=self.fragment_cache,
+                               backend=self.backend)
 
-    def compile_pdf(self, tex_file, cls_file):
-        # Step 3: Ensure .cls file exists in build dir before compiling
+    def _prepare(self, work_dir, source, cls_file, tex_name):
+        """Links the template into ``work_dir`` and generates ``tex_name``.tex there."""
         # NOTE: Ensure your .cls files use fonts compatible with pdflatex (not xelatex-only fonts)
         try:
-
-            # Define the directory where your files are
-            build_dir = 'build'
-            
-            # Get the original working directory
-            original_dir = os.getcwd()
-            
-            # Change to the build directory
-            
-            from core.generator import ResumeGenerator
-            generator = ResumeGenerator(yaml_path='resume.yaml', cls_file=cls_file)
-
-            os.chdir(build_dir)
-            generator.generate()
-            generator.doc.generate_pdf('resume', clean_tex=False,  silent=False)
+            with stage('compile.link_template'):
+                link_asset(cls_file, work_dir)
+        except OSError as e:
+            return False, f"File copy failed: {e}"
+        try:
+            self.generator(source, cls_file).generate(os.path.join(work_dir, tex_name + '.tex'))
         except Exception as e:
-            if(original_dir):
-                os.chdir(original_dir)
-            return False, f"LaTeX compilation failed: {e}"
-
-        finally:
-            # Change back to the original directory, even if there's an error
-            os.chdir(original_dir)
-            return True, "PDF compiled"
-
-    def build_pipeline(self, yaml_file, tex_file, cls_file):
-        steps = [
-            (self.copy_files, [tex_file, cls_file]),
-            (self.compile_pdf, [tex_file, cls_file]),
-        ]
-        for func, args in steps:
-            success, msg = func(*args)
-            if not success:
-                return False, msg
-        return True, "Build pipeline completed"
+            return False, f"LaTeX generation failed: {e}"
+        self._restore_aux(work_dir, tex_name)
+        return True, "LaTeX generated"
+
+    def _typeset_result(self, work_dir, tex_name, success, output, fmt=None, passes=1):
+        """Turns the outcome of the engine run(s) into ``(success, message)``.
+
+        ``fmt`` is the format whose fast path failed before this run, if any.
+        """
+        if not success or not os.path.exists(os.path.join(work_dir, tex_name + '.pdf')):
+            if not self.silent:
+                print(output)
+            return False, f"LaTeX compilation failed: {output}"
+        if fmt is not None:
+            # The document is fine, so the format is what broke; stop using it
+            self.formats.mark_broken(fmt)
+        return True, compiled_message(passes)
+
+    def _compile_in(self, work_dir, source, cls_file, tex_name, cancelled=None):
+        """Generates and compiles ``tex_name`` inside ``work_dir``; never changes the cwd."""
+        success, msg = self._prepare(work_dir, source, cls_file, tex_name)
+        if not success:
+            return success, msg
+        if cancelled is not None and cancelled():
+            return False, "Build superseded"
+        fmt = self._link_format(work_dir, tex_name, os.path.abspath(cls_file))
+        if fmt is not None:
+            try:
+                success, output, passes = self.run_latex(tex_name, fmt.stem, cwd=work_dir)
+            except OSError as e:
+                success, output = False, str(e)
+            if success and os.path.exists(os.path.join(work_dir, tex_name + '.pdf')):
+                return True, compiled_message(passes)
+            if not self.silent:
+                print(output)
+        try:
+            success, output, passes = self.run_latex(tex_name, cwd=work_dir)
+        except OSError:
+            return False, f"LaTeX compilation failed: no LaTeX compiler found ({self.engine})"
+        return self._typeset_result(work_dir, tex_name, success, output, fmt, passes)
+
+    def cache_key(self, source, cls_file):
+        from .generator import ResumeGenerator
+        data = source if isinstance(source, dict) else load_file(source)
+        with open(cls_file, 'rb') as f:
+            cls_bytes = f.read()
+        return self.cache.make_key(data, cls_bytes, ResumeGenerator.FORMAT_VERSION)
+
+    def pdf_path(self, tex_file):
+        tex_name = os.path.splitext(os.path.basename(tex_file))[0]
+        return os.path.join(self.build_dir, tex_name + '.pdf')
+
+    def compile(self, source, cls_file, output_pdf, tex_output=None, work_dir=None, cancelled=None):
+        """Builds ``source`` with ``cls_file`` into ``output_pdf``.
+
+        ``source`` is the path of a resume YAML file, or the resume data
+        itself as a dict, which is then never written to disk or re-parsed.
+        Each call works in a private temporary directory (or in ``work_dir``,
+        which is created if needed and left in place), so any number of
+        compiles can run at once from different threads. ``tex_output``
+        optionally receives a copy of the generated LaTeX. ``cancelled()`` is
+        checked between steps to give up on stale builds.
+        """
+        with stage('compile', template=os.path.basename(cls_file)):
+            key = None
+            if self.cache is not None:
+                try:
+                    with stage('compile.cache'):
+                        key = self.cache_key(source, cls_file)
+                        os.makedirs(os.path.dirname(os.path.abspath(output_pdf)), exist_ok=True)
+                        hit = self.cache.get(key, output_pdf)
+                    if hit:
+                        count('compile.cache_hits')
+                        # the .tex next to the PDF must match it; if it cannot
+                        # be written, the full build below writes both
+                        if tex_output is not None:
+                            self.write_tex(source, cls_file, tex_output)
+                        return True, "PDF served from cache"
+                except Exception:
+                    # A broken cache must never break a build
+                    key = None
+            success, msg = self._compile(source, cls_file, output_pdf, tex_output, work_dir, cancelled)
+            if success and key is not None and os.path.exists(output_pdf):
+                try:
+                    with stage('compile.cache'):
+                        self.cache.put(key, output_pdf)
+                except Exception:
+                    pass
+            return success, msg
+
+    def _compile(self, source, cls_file, output_pdf, tex_output=None, work_dir=None, cancelled=None):
+        # A daemon only hands back the PDF; tex_output is generated here
+        if self.daemon is not None and self.daemon.available():
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(output_pdf)), exist_ok=True)
+                with stage('compile.daemon'):
+                    success, msg = self.daemon.compile(source, cls_file, output_pdf, backend=self.backend)
+            except OSError:
+                pass  # daemon went away; build locally
+            else:
+                if success and tex_output is not None:
+                    try:
+                        self.write_tex(source, cls_file, tex_output)
+                    except Exception as e:
+                        return False, f"Could not write output: {e}"
+                return success, msg
+        if cancelled is not None and cancelled():
+            return False, "Build superseded"
+        tex_name = os.path.splitext(os.path.basename(output_pdf))[0]
+        if work_dir is not None:
+            os.makedirs(work_dir, exist_ok=True)
+            return self._finish(work_dir, tex_name, output_pdf, tex_output,
+                                self._compile_in(work_dir, source, cls_file, tex_name, cancelled))
+        with self.workspaces.workspace() as tmp:
+            return self._finish(tmp, tex_name, output_pdf, tex_output,
+                                self._compile_in(tmp, source, cls_file, tex_name, cancelled))
+
+    def write_tex(self, source, cls_file, tex_output):
+        """Generates the LaTeX of ``source`` into ``tex_output`` without running LaTeX."""
+        with self.workspaces.workspace() as work_dir:
+            path = os.path.join(work_dir, os.path.basename(tex_output))
+            self.generator(source, cls_file).generate(path)
+            with stage('compile.publish'):
+                _publish(path, tex_output)
+
+    def _finish(self, work_dir, tex_name, output_pdf, tex_output, result):
+        """Moves the job's outputs out of ``work_dir``."""
+        success, msg = result
+        try:
+            with stage('compile.publish'):
+                if tex_output is not None and os.path.exists(os.path.join(work_dir, tex_name + '.tex')):
+                    _publish(os.path.join(work_dir, tex_name + '.tex'), tex_output)
+                if success:
+                    _publish(os.path.join(work_dir, tex_name + '.pdf'), output_pdf)
+        except OSError as e:
+            return False, f"Could not write output: {e}"
+        if success:
+            self._save_aux(work_dir, tex_name)
+        return success, msg
+
+    def build_pipeline(self, source, tex_file, cls_file, cancelled=None):
+        """Builds into ``build_dir``, leaving ``<tex_file>`` and its PDF there."""
+        tex_name = os.path.splitext(os.path.basename(tex_file))[0]
+        return self.compile(source, cls_file, self.pdf_path(tex_file),
+                            tex_output=os.path.join(self.build_dir, tex_name + '.tex'), cancelled=cancelled)
+
+
+def aux_state(work_dir, tex_name) -> str:
+    """Hash of the auxiliary files of ``tex_name`` in ``work_dir``."""
+    digest = hashlib.sha1()
+    for suffix in AUX_SUFFIXES:
+        digest.update(suffix.encode())
+        try:
+            with open(os.path.join(work_dir, tex_name + suffix), 'rb') as f:
+                digest.update(b'\1' + f.read())
+        except OSError:
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def compiled_message(passes) -> str:
+    return f"PDF compiled in {passes} LaTeX pass{'es' if passes > 1 else ''}"
+
+
+def _publish(src, dest):
+    """Copies ``src`` to ``dest`` atomically, so readers never see a half-written file."""
+    dest = os.path.abspath(dest)
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dest), prefix='.' + os.path.basename(dest) + '-')
+    try:
+        with os.fdopen(fd, 'wb') as out, open(src, 'rb') as f:
+            shutil.copyfileobj(f, out)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
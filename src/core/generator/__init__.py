@@ -1 +1,13 @@
-from .resume_generator import ResumeGenerator
+from .fragment_cache import FragmentCache
+
+# Values of ResumeGenerator(backend=...), importable without the generator
+BACKENDS = ('pylatex', 'string')
+
+
+def __getattr__(name):
+    # resume_generator imports PyYAML (and pylatex once its backend is
+    # used); the escaping and writer helpers stay importable without either
+    if name == 'ResumeGenerator':
+        from .resume_generator import ResumeGenerator
+        return ResumeGenerator
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,50 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+class FragmentCache:
+    """
+    An LRU map from a section's content hash to its rendered LaTeX fragment.
+    One instance is meant to outlive many ResumeGenerator objects (e.g. one
+    per GUI session), so re-generating after an edit only re-renders the
+    sections whose data actually changed.
+    """
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # the GUI generates from a worker thread
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(title: str, items, column: str, format_version) -> str:
+        """Hashes everything that affects how a section is rendered."""
+        payload = json.dumps([format_version, column, title, items], separators=(',', ':'), default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,44 @@
+"""
+Single-pass escaping of resume text for LaTeX.
+
+Text may contain markdown-style links, ``[text](url)``, which become
+``\\href{url}{text}``. Everything else is escaped with one ``str.translate``
+over a precompiled table, and strings without any special character are
+returned as they are. Resumes repeat the same company names, technologies
+and dates over and over, so results are memoized.
+"""
+import functools
+import re
+
+# Characters escaped in running text
+_TEXT_TABLE = str.maketrans({
+    '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_', '{': r'\{', '}': r'\}',
+    '~': r'\textasciitilde{}', '^': r'\^{}', '\\': r'\textbackslash{}',
+})
+# hyperref reads \href URLs almost verbatim; only these would break the argument
+_URL_TABLE = str.maketrans({
+    '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_', '{': r'\{', '}': r'\}',
+})
+_SPECIAL_RE = re.compile(r'[&%$#_{}~^\\]')
+_LINK_RE = re.compile(r'\[(.*?)\]\((.*?)\)')
+
+
+def _translate(text: str, table) -> str:
+    if _SPECIAL_RE.search(text) is None:
+        return text
+    return text.translate(table)
+
+
+@functools.lru_cache(maxsize=4096)
+def escape_text(text: str) -> str:
+    """Escapes LaTeX special characters and turns ``[text](url)`` into ``\\href``."""
+    if '](' not in text:
+        return _translate(text, _TEXT_TABLE)
+    parts = []
+    pos = 0
+    for match in _LINK_RE.finditer(text):
+        parts.append(_translate(text[pos:match.start()], _TEXT_TABLE))
+        parts.append(rf'\href{{{_translate(match.group(2), _URL_TABLE)}}}{{{_translate(match.group(1), _TEXT_TABLE)}}}')
+        pos = match.end()
+    parts.append(_translate(text[pos:], _TEXT_TABLE))
+    return ''.join(parts)
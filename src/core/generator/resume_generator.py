@@ -1,9 +1,13 @@
-import yaml
 import re
 from pathlib import Path
-from pylatex import Document, Section, MiniPage, Command, Enumerate
-from pylatex.utils import NoEscape
-from pylatex.basic import NewLine
+
+# pylatex is imported inside the methods of the 'pylatex' backend only, so the
+# 'string' backend (and everything importing this module) starts without it
+from ..profiling import count, stage
+from ..yaml_loader import load_file, loads
+from . import BACKENDS
+from .latex_escape import escape_text
+from .tex_writer import PYLATEX_DEFAULT_PACKAGES, SEPARATOR, TexWriter, escape_latex
 
 
 class ResumeGenerator:
@@ -13,36 +17,81 @@ class ResumeGenerator:
     based on the keys they contain, not the section they are in.
     It supports nested items, bullet points, hyperlinks, and snake_case titles.
     """
-    def __init__(self, yaml_path: str, cls_file: str = 'template.cls'):
-        self.yaml_path = Path(yaml_path)
+    # Bump whenever a change alters the generated LaTeX for the same data, so
+    # PDFs cached by an older generator are not served anymore.
+    FORMAT_VERSION = 2
+
+    # 'pylatex' builds a pylatex object tree; 'string' writes the same LaTeX
+    # directly through a TexWriter, skipping the tree
+    BACKENDS = BACKENDS
+
+    PACKAGES = ['enumitem', 'fancyhdr', 'hyperref', 'fontawesome']
+    PREAMBLE = [r'\pagestyle{fancy}', r'\fancyhf{}']
+
+    # Attribute priority used when formatting an item
+    PRIMARY_TITLE_KEYS = ['position', 'degree', 'title', 'project', 'name']
+    SECONDARY_TITLE_KEYS = ['company', 'institution', 'issuer']
+    META_KEYS = {'dates': '', 'location': '', 'url': '', 'pull_request': 'PR: '}
+    CONTENT_KEYS = ['description', 'contribution', 'details']
+    LIST_KEYS = ['technologies', 'skills_used', 'tools']
+
+    def __init__(self, yaml_path: str = None, cls_file: str = 'template.cls', fragment_cache=None,
+                 backend: str = 'pylatex', data: dict = None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f'Unknown backend {backend!r}, expected one of {", ".join(self.BACKENDS)}')
+        if yaml_path is None and data is None:
+            raise ValueError('ResumeGenerator needs a yaml_path or data')
+        self.yaml_path = Path(yaml_path) if yaml_path is not None else None
         self.cls_file = cls_file
-        self.data = self._load_data()
-        self.doc = self._setup_document()
+        # Optional FragmentCache; sections whose data did not change since a
+        # previous generate() reuse their rendered LaTeX
+        self.fragment_cache = fragment_cache
+        self.backend = backend
+        # Rendering only reads the data, so a caller's dict is used as is
+        self.data = data if data is not None else self._load_data()
+        # pylatex document, built by each render with the pylatex backend
+        self.doc = None
+
+    @classmethod
+    def from_data(cls, data: dict, cls_file: str = 'template.cls', **kwargs):
+        """A generator for resume data already in memory; nothing is read from disk."""
+        return cls(cls_file=cls_file, data=data, **kwargs)
+
+    @classmethod
+    def from_stream(cls, stream, cls_file: str = 'template.cls', **kwargs):
+        """A generator for the YAML (or JSON) document read from a string or file object."""
+        return cls(cls_file=cls_file, data=loads(stream) or {}, **kwargs)
 
     def _load_data(self) -> dict:
         """Loads and returns data from the YAML file."""
         if not self.yaml_path.exists():
             raise FileNotFoundError(f'{self.yaml_path} not found. Please provide a data file.')
-        with self.yaml_path.open() as f:
-            return yaml.safe_load(f)
+        return load_file(self.yaml_path)
 
-    def _setup_document(self) -> Document:
+    def _setup_document(self):
         """Sets up the pylatex document with packages and preamble."""
-        cls_path = Path(self.data.get('cls', self.cls_file))
-        doc = Document(documentclass=cls_path.stem)
-        doc.packages.append(Command('usepackage', 'enumitem'))
-        doc.packages.append(Command('usepackage', 'fancyhdr'))
-        doc.packages.append(Command('usepackage', 'hyperref'))
-        doc.packages.append(Command('usepackage', 'fontawesome'))
-        doc.preamble.append(NoEscape(r'\pagestyle{fancy}'))
-        doc.preamble.append(NoEscape(r'\fancyhf{}'))
+        from pylatex import Command, Document
+        from pylatex.utils import NoEscape
+        doc = Document(documentclass=self._document_class())
+        for package in self.PACKAGES:
+            doc.packages.append(Command('usepackage', package))
+        for line in self.PREAMBLE:
+            doc.preamble.append(NoEscape(line))
         return doc
 
+    def _document_class(self) -> str:
+        return Path(self.data.get('cls', self.cls_file)).stem
+
     def _add_header(self):
         """Adds the name and dynamic contact information section."""
+        from pylatex.utils import NoEscape
+        for part in self._header_parts():
+            self.doc.append(NoEscape(part))
+
+    def _header_parts(self) -> list:
+        """The three top-level chunks making up the name and contact header."""
         name = self.data.get('name', {})
         contact = self.data.get('contact', {})
-        self.doc.append(NoEscape(rf"\namesection{{{name.get('first','John')}}}{{{name.get('last','Doe')}}}{{"))
         contact_parts = []
         # Icon mapping for contact details
         icon_map = {
@@ -53,31 +102,37 @@ class ResumeGenerator:
             if not value: continue
             icon = icon_map.get(key.lower())
             if key.lower() == 'email':
-                contact_parts.append(NoEscape(rf"\href{{mailto:{value}}}{{{icon}\ {value}}}"))
+                contact_parts.append(rf"\href{{mailto:{value}}}{{{icon}\ {value}}}")
             elif icon:
                 # Remove protocol for display, but keep for link
                 display_val = re.sub(r'https?://(www\.)?', '', value)
-                contact_parts.append(NoEscape(rf"\href{{{value}}}{{{icon}\ {display_val}}}"))
+                contact_parts.append(rf"\href{{{value}}}{{{icon}\ {display_val}}}")
             else:
-                contact_parts.append(NoEscape(value))
-        self.doc.append(NoEscape(" | ".join(contact_parts)))
-        self.doc.append(NoEscape(r'}'))
+                contact_parts.append(value)
+        return [
+            rf"\namesection{{{name.get('first','John')}}}{{{name.get('last','Doe')}}}{{",
+            " | ".join(contact_parts),
+            r'}',
+        ]
 
-    def _process_text_for_latex(self, text: str) -> NoEscape:
+    def _process_text_for_latex(self, text: str):
+        """_latex_text wrapped in NoEscape, for appending to pylatex containers."""
+        from pylatex.utils import NoEscape
+        return NoEscape(self._latex_text(text))
+
+    @staticmethod
+    def _latex_text(text: str) -> str:
         """Processes a simple text string for hyperlinks and escapes special characters."""
-        if not text: return NoEscape("")
-        # Basic escaping for LaTeX special characters
-        text = text.replace('&', r'\&').replace('%', r'\%').replace('$', r'\$')
-        text = text.replace('#', r'\#').replace('_', r'\_').replace('{', r'\{').replace('}', r'\}')
-        # Markdown-style hyperlinks: [text](url) -> \href{url}{text}
-        text = re.sub(r'\[(.*?)\]\((.*?)\)', r'\\href{\2}{\1}', text)
-        return NoEscape(text)
+        if not text: return ""
+        return escape_text(text)
 
     def _process_content_field(self, content, target, is_nested=False):
         """
         Recursively processes a content field, which can be a string (with bullets)
         or a list of nested dictionary items.
         """
+        from pylatex import Enumerate, MiniPage
+        from pylatex.utils import NoEscape
         if isinstance(content, str):
             lines = content.strip().split('\n')
             # Check if the string contains bullet points
@@ -112,16 +167,12 @@ class ResumeGenerator:
         Formats a single dictionary item based on the attributes it contains.
         This is the core of the attribute-driven architecture.
         """
-        # --- 1. Define Attribute Priority ---
-        primary_title_keys = ['position', 'degree', 'title', 'project', 'name']
-        secondary_title_keys = ['company', 'institution', 'issuer']
-        meta_keys = {'dates': '', 'location': '', 'url': '', 'pull_request': 'PR: '}
-        content_keys = ['description', 'contribution', 'details']
-        list_keys = ['technologies', 'skills_used', 'tools']
-
-        # --- 2. Extract and Format Titles ---
-        primary_title = next((item[key] for key in primary_title_keys if key in item), None)
-        secondary_title = next((item[key] for key in secondary_title_keys if key in item), None)
+        from pylatex import Command
+        from pylatex.basic import NewLine
+        from pylatex.utils import NoEscape
+        # --- 1. Extract and Format Titles ---
+        primary_title = next((item[key] for key in self.PRIMARY_TITLE_KEYS if key in item), None)
+        secondary_title = next((item[key] for key in self.SECONDARY_TITLE_KEYS if key in item), None)
 
         if primary_title:
             target.append(Command('runsubsection', self._process_text_for_latex(primary_title)))
@@ -135,69 +186,121 @@ class ResumeGenerator:
         if(not secondary_title):
             target.append(NewLine())
 
-        # --- 3. Extract and Format Metadata Line ---
+        # --- 2. Extract and Format Metadata Line ---
+        meta_line = self._meta_line(item)
+        if meta_line:
+            target.append(Command('location', NoEscape(meta_line)))
+
+
+
+        # --- 3. Process Main Content (potentially recursive) ---
+        for key in self.CONTENT_KEYS:
+            if key in item:
+                self._process_content_field(item[key], target, is_nested=is_nested)
+
+        # --- 4. Process Single-Line Lists (e.g., Technologies) ---
+        for spacer, line in self._list_lines(item):
+            target.append(NoEscape(spacer))
+            target.append(NoEscape(line))
+        
+        
+        if not is_nested:
+            target.append(NewLine())
+
+    def _meta_line(self, item: dict) -> str:
+        """Joins dates, location, links and the like into one line (may be empty)."""
         meta_parts = []
-        for key, prefix in meta_keys.items():
+        for key, prefix in self.META_KEYS.items():
             if key in item:
                 value = item[key]
                 if key == 'url':
                     # NEW: Check for 'url_href' to use as custom link text
-                    display_text = self._process_text_for_latex(item.get('url_href', 'Link'))
-                    meta_parts.append(NoEscape(rf"\href{{{value}}}{{{display_text}}}"))
+                    display_text = self._latex_text(item.get('url_href', 'Link'))
+                    meta_parts.append(rf"\href{{{value}}}{{{display_text}}}")
                 else:
                     meta_parts.append(prefix + str(value))
-        if meta_parts:
-            target.append(Command('location', NoEscape(" ~|~ ".join(meta_parts))))
-
-
-
-        # --- 4. Process Main Content (potentially recursive) ---
-        for key in content_keys:
-            if key in item:
-                self._process_content_field(item[key], target, is_nested=is_nested)
+        return " ~|~ ".join(meta_parts)
 
-        # --- 5. Process Single-Line Lists (e.g., Technologies) ---
-        for key in list_keys:
+    def _list_lines(self, item: dict):
+        """Yields ``(spacer, line)`` for each single-line list such as Technologies."""
+        for key in self.LIST_KEYS:
             if key in item and isinstance(item[key], list):
                 label = key.replace('_', ' ').title()
                 values = ", ".join(item[key])
-                target.append(NoEscape(r"\\" if any(k in item for k in content_keys) else "")) # Add space if content exists
-                target.append(NoEscape(r"\textbf{" + label + r":} " + self._process_text_for_latex(values)))
-        
-        
-        if not is_nested:
-            target.append(NewLine())
+                # Add space if content exists
+                spacer = r"\\" if any(k in item for k in self.CONTENT_KEYS) else ""
+                yield spacer, r"\textbf{" + label + r":} " + self._latex_text(values)
 
-    def _add_section(self, title: str, items: list, parent):
-        """Adds a section, processing each item based on its attributes."""
+    @staticmethod
+    def _is_column_marker(item) -> bool:
+        """A ``{left: true}`` item only places its section in the left column."""
+        return isinstance(item, dict) and 'left' in item and len(item.keys()) <= 1
+
+    def _build_section(self, title: str, items: list):
+        """Builds the Section for one resume section, or None if it has no items."""
+        from pylatex import Section
+        from pylatex.utils import NoEscape
         if not items:
-            return
+            return None
 
         formatted_title = title.replace('_', ' ').title()
-        with parent.create(Section(formatted_title)) as section:
-            try:
-                for i, item in enumerate(items):
-                    if(isinstance(item, dict) and 'left' in item and len(item.keys()) <=1):
-                        items.pop(i)
-                       # Handle simple list of strings
-                if all(isinstance(item, str) for item in items):
-                    processed_items = [self._process_text_for_latex(i) for i in items]
-                    section.append(NoEscape(" ".join(processed_items)))
-                    return
+        section = Section(formatted_title)
+        try:
+            # Drop the column marker without touching self.data, so every
+            # render sees the same sections
+            items = [item for item in items if not self._is_column_marker(item)]
+                   # Handle simple list of strings
+            if all(isinstance(item, str) for item in items):
+                processed_items = [self._process_text_for_latex(i) for i in items]
+                section.append(NoEscape(" ".join(processed_items)))
+                return section
 
-                for item in items:
-                   if isinstance(item, dict):
-                        self._format_section_item(item, section)
+            for item in items:
+               if isinstance(item, dict):
+                    self._format_section_item(item, section)
 
 
-            except Exception as e:
-                           print(e)
-                           raise ValueError(e)
+        except Exception as e:
+                       print(e)
+                       raise ValueError(e)
+        return section
 
+    def _add_section(self, title: str, items: list, parent):
+        """Adds a section, processing each item based on its attributes."""
+        with stage('generate.section', section=title, items=len(items)):
+            section = self._build_section(title, items)
+        if section is not None:
+            parent.append(section)
 
-    def generate(self, tex_path: str = 'resume.tex'):
-        """Orchestrates the resume generation process."""
-        self._add_header()
+    def _add_section_fragment(self, title: str, items: list, parent, column: str):
+        """Adds a section from its memoized LaTeX, rendering it only when dirty.
+
+        The fragment is keyed on the section's data and column, so an edit to
+        one section leaves every other section's fragment valid.
+        """
+        from pylatex.utils import NoEscape
+        key = self.fragment_cache.key(title, items, column, self.FORMAT_VERSION)
+        entry = self.fragment_cache.get(key)
+        if entry is None:
+            with stage('generate.section', section=title, items=len(items)):
+                section = self._build_section(title, items)
+                if section is None:
+                    entry = ('', ())
+                else:
+                    section._propagate_packages()
+                    entry = (section.dumps_as_content(), tuple(section.packages))
+            self.fragment_cache.put(key, entry)
+        else:
+            count('generate.sections_reused')
+        fragment, packages = entry
+        if not fragment:
+            return
+        parent.append(NoEscape(fragment))
+        for package in packages:
+            parent.packages.add(package)
+
+    def _section_columns(self):
+        """Returns the ``(title, items)`` pairs of the left and right columns, in order."""
         left_sections, right_sections = [], []
         # treat internal keys as reserved
         reserved_keys = ['name', 'contact', 'cls', '_order']
@@ -233,10 +336,49 @@ class ResumeGenerator:
                 left_sections.append((section_name, items))
             else:
                 right_sections.append((section_name, items))
-        
+        return left_sections, right_sections
+
+    @staticmethod
+    def _tex_base(tex_path) -> str:
+        """``dir/resume.tex`` -> ``dir/resume``; the .tex file is written next to it."""
+        path = Path(tex_path)
+        return str(path.parent / path.stem)
+
+    def generate(self, tex_path: str = 'resume.tex'):
+        """Writes the document to ``tex_path`` (its suffix is always ``.tex``)."""
+        tex = self.to_string()
+        try:
+            with open(self._tex_base(tex_path) + '.tex', 'w', encoding='utf-8') as f:
+                f.write(tex)
+        except Exception as e:
+            raise ValueError(e)
+
+    def write(self, sink):
+        """Writes the document to any object with a ``write(str)`` method."""
+        sink.write(self.to_string())
+
+    def to_string(self) -> str:
+        """Returns the whole LaTeX document."""
+        with stage('generate', backend=self.backend):
+            if self.backend == 'string':
+                return self._render_string()
+            return self._render_pylatex()
+
+    def _render_pylatex(self) -> str:
+        """Builds the pylatex document and dumps it, as ``Document.generate_tex`` would."""
+        from pylatex import MiniPage
+        from pylatex.utils import NoEscape
+        with stage('generate.setup'):
+            self.doc = self._setup_document()
+        self._add_header()
+        left_sections, right_sections = self._section_columns()
+
         with self.doc.create(MiniPage(width=r'0.33\textwidth', pos='t')) as left:
             for title, items in left_sections:
-                self._add_section(title, items, parent=left)
+                if self.fragment_cache is not None:
+                    self._add_section_fragment(title, items, left, 'left')
+                else:
+                    self._add_section(title, items, parent=left)
 
         # self.doc.append(NoEscape('%'))
         self.doc.append(NoEscape(r'\hfill'))
@@ -244,9 +386,135 @@ class ResumeGenerator:
 
         with self.doc.create(MiniPage(width=r'0.66\textwidth', pos='t', align='t')) as right:
             for title, items in right_sections:
-                self._add_section(title, items, parent=right)
-        
-        try:
-            self.doc.generate_tex(str(Path(tex_path).stem))
-        except Exception as e:
-            raise ValueError(e)
+                if self.fragment_cache is not None:
+                    self._add_section_fragment(title, items, right, 'right')
+                else:
+                    self._add_section(title, items, parent=right)
+        with stage('generate.serialize'):
+            return self.doc.dumps()
+
+    # --- 'string' backend ----------------------------------------------------
+    # Mirrors the methods above, but writes through a TexWriter instead of
+    # building pylatex objects. The output must stay byte-identical to the
+    # pylatex backend; tests/test_tex_writer.py compares the two.
+
+    def _render_string(self) -> str:
+        """Returns the whole document as the pylatex backend would dump it."""
+        packages = PYLATEX_DEFAULT_PACKAGES + [rf'\usepackage{{{p}}}' for p in self.PACKAGES]
+        # pulled in by the minipages
+        packages.append(r'\usepackage{ragged2e}')
+        w = TexWriter()
+        w.write(rf'\documentclass{{{escape_latex(self._document_class())}}}{SEPARATOR}')
+        w.write(SEPARATOR.join(packages) + SEPARATOR)
+        w.write(SEPARATOR)
+        w.write(SEPARATOR.join(self.PREAMBLE) + SEPARATOR)
+        w.write(SEPARATOR)
+
+        left_sections, right_sections = self._section_columns()
+        with w.environment('document'):
+            w.item(r'\normalsize')
+            for part in self._header_parts():
+                w.item(part)
+            with w.environment('minipage', '[t]', r'{0.33\textwidth}'):
+                for title, items in left_sections:
+                    self._write_section_fragment(title, items, w, 'left')
+            w.item(r'\hfill')
+            with w.environment('minipage', '[t]', r'{0.66\textwidth}'):
+                for title, items in right_sections:
+                    self._write_section_fragment(title, items, w, 'right')
+        return w.getvalue()
+
+    def _write_section_fragment(self, title: str, items: list, w: TexWriter, column: str):
+        """Writes a section, through the fragment cache when there is one."""
+        if self.fragment_cache is None:
+            with stage('generate.section', section=title, items=len(items)):
+                fragment = self._render_section(title, items)
+        else:
+            key = self.fragment_cache.key(title, items, column, self.FORMAT_VERSION)
+            entry = self.fragment_cache.get(key)
+            if entry is None:
+                # Same entry layout as the pylatex backend; sections need no
+                # packages beyond the ones every document loads
+                with stage('generate.section', section=title, items=len(items)):
+                    entry = (self._render_section(title, items), ())
+                self.fragment_cache.put(key, entry)
+            else:
+                count('generate.sections_reused')
+            fragment = entry[0]
+        if fragment:
+            w.item(fragment)
+
+    def _render_section(self, title: str, items: list) -> str:
+        """String counterpart of _build_section; '' if there are no items."""
+        if not items:
+            return ''
+        w = TexWriter()
+        with w.section(title.replace('_', ' ').title()):
+            try:
+                items = [item for item in items if not self._is_column_marker(item)]
+                if all(isinstance(item, str) for item in items):
+                    w.item(" ".join(self._latex_text(i) for i in items))
+                else:
+                    for item in items:
+                        if isinstance(item, dict):
+                            self._write_section_item(item, w)
+            except Exception as e:
+                print(e)
+                raise ValueError(e)
+        return w.getvalue()
+
+    def _write_section_item(self, item: dict, w: TexWriter, is_nested=False):
+        """String counterpart of _format_section_item."""
+        primary_title = next((item[key] for key in self.PRIMARY_TITLE_KEYS if key in item), None)
+        secondary_title = next((item[key] for key in self.SECONDARY_TITLE_KEYS if key in item), None)
+
+        if primary_title:
+            w.command('runsubsection', self._latex_text(primary_title))
+        if secondary_title:
+            if primary_title:
+                w.newline()
+            w.command('descript', self._latex_text(secondary_title))
+        if not secondary_title:
+            w.newline()
+
+        meta_line = self._meta_line(item)
+        if meta_line:
+            w.command('location', meta_line)
+
+        for key in self.CONTENT_KEYS:
+            if key in item:
+                self._write_content_field(item[key], w)
+
+        for spacer, line in self._list_lines(item):
+            w.item(spacer)
+            w.item(line)
+
+        if not is_nested:
+            w.newline()
+
+    def _write_content_field(self, content, w: TexWriter):
+        """String counterpart of _process_content_field."""
+        if isinstance(content, str):
+            lines = content.strip().split('\n')
+            if any(line.strip().startswith('- ') for line in lines):
+                with w.environment('enumerate', r'[label=\textbullet,leftmargin=*]', omit_if_empty=True):
+                    current_item_lines = []
+                    for line in lines:
+                        stripped_line = line.strip()
+                        if stripped_line.startswith('- '):
+                            if current_item_lines:
+                                w.list_item(self._latex_text(" ".join(current_item_lines)))
+                            current_item_lines = [stripped_line[2:].strip()]
+                        elif current_item_lines:
+                            current_item_lines.append(stripped_line)
+                    if current_item_lines:
+                        w.list_item(self._latex_text(" ".join(current_item_lines)))
+            else:
+                w.item(self._latex_text(content))
+
+        elif isinstance(content, list):
+            with w.environment('enumerate', '[label={-},leftmargin=*]', omit_if_empty=True):
+                for sub_item in content:
+                    if isinstance(sub_item, dict):
+                        with w.environment('minipage', arguments=r'{\linewidth}'):
+                            self._write_section_item(sub_item, w, is_nested=True)
@@ -0,0 +1,117 @@
+"""
+Writes LaTeX the way pylatex serializes its object tree, straight into a
+buffer of string chunks.
+
+This is the emitter behind ResumeGenerator's ``'string'`` backend. It only
+knows the handful of constructs the generator uses (plain children, commands,
+environments and sections), but for those it reproduces pylatex's separators,
+line endings and escaping exactly, so both backends write the same bytes.
+"""
+from contextlib import contextmanager
+
+# pylatex.utils._latex_special_chars
+_LATEX_SPECIAL_CHARS = {
+    '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_', '{': r'\{', '}': r'\}',
+    '~': r'\textasciitilde{}', '^': r'\^{}', '\\': r'\textbackslash{}',
+    '\n': '\\newline%\n', '-': r'{-}', '\xA0': '~', '[': r'{[}', ']': r'{]}',
+}
+_ESCAPE_TABLE = str.maketrans(_LATEX_SPECIAL_CHARS)
+
+# Characters pylatex strips from label markers, on top of non-printable ones
+_MARKER_INVALID_CHARS = set('&%$#_{}~^\\\n\xA0[]":;\' ')
+
+# Packages every pylatex Document loads before the ones the generator adds
+PYLATEX_DEFAULT_PACKAGES = [
+    r'\usepackage[T1]{fontenc}',
+    r'\usepackage[utf8]{inputenc}',
+    r'\usepackage{lmodern}',
+    r'\usepackage{textcomp}',
+    r'\usepackage{lastpage}',
+]
+
+# Separator pylatex puts between the children of a container
+SEPARATOR = '%\n'
+
+
+def escape_latex(text: str) -> str:
+    """Same result as ``pylatex.utils.escape_latex`` on a plain string."""
+    return text.translate(_ESCAPE_TABLE)
+
+
+def section_marker(title: str) -> str:
+    """The ``sec:`` label pylatex derives from a section title."""
+    return ''.join(c for c in title if 32 <= ord(c) < 127 and c not in _MARKER_INVALID_CHARS)
+
+
+class TexWriter:
+    """
+    Appends LaTeX to a list of chunks. Every opened environment or section
+    counts its children so separators land where pylatex would put them;
+    ``getvalue()`` joins the chunks once at the end.
+    """
+    def __init__(self):
+        self._chunks = []
+        # children written so far in each open container, innermost last
+        self._counts = [0]
+
+    def getvalue(self) -> str:
+        return ''.join(self._chunks)
+
+    def write(self, text: str):
+        """Writes raw LaTeX outside of any container bookkeeping."""
+        self._chunks.append(text)
+
+    def item(self, latex: str):
+        """Adds one child to the innermost container."""
+        if self._counts[-1]:
+            self._chunks.append(SEPARATOR)
+        self._counts[-1] += 1
+        self._chunks.append(latex)
+
+    def command(self, name: str, argument: str):
+        self.item(f'\\{name}{{{argument}}}')
+
+    def newline(self):
+        self.item(r'\newline')
+
+    @contextmanager
+    def environment(self, name: str, options: str = '', arguments: str = '', omit_if_empty=False):
+        """``\\begin{name}[options]{arguments}`` ... ``\\end{name}`` as one child.
+
+        With ``omit_if_empty`` a blank environment is dropped, but like in
+        pylatex the separator in front of it stays.
+        """
+        self.item(f'\\begin{{{name}}}{options}{arguments}{SEPARATOR}')
+        start = len(self._chunks) - 1
+        self._counts.append(0)
+        try:
+            yield self
+        finally:
+            self._counts.pop()
+        if omit_if_empty and not ''.join(self._chunks[start + 1:]).strip():
+            del self._chunks[start:]
+        else:
+            self._chunks.append(f'{SEPARATOR}\\end{{{name}}}')
+
+    def list_item(self, latex: str):
+        """An ``\\item`` followed by its text, as Enumerate.add_item does."""
+        self.item(r'\item')
+        self.item(latex)
+
+    @contextmanager
+    def section(self, title: str):
+        """A numbered section with pylatex's automatic ``sec:`` label."""
+        self.item(f'\\section{{{escape_latex(title)}}}{SEPARATOR}\\label{{sec:{section_marker(title)}}}{SEPARATOR}')
+        self._counts.append(0)
+        try:
+            yield self
+        finally:
+            self._counts.pop()
+        # Sections end their paragraph: trailing newlines become one blank line
+        while self._chunks:
+            stripped = self._chunks[-1].rstrip('\n')
+            if stripped:
+                self._chunks[-1] = stripped
+                break
+            self._chunks.pop()
+        self._chunks.append('\n\n')
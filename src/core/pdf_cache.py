@@ -0,0 +1,122 @@
+"""Persistent, content-addressed cache of compiled resume PDFs.
+
+A cache key is derived from the resume data, the bytes of the ``.cls``
+template and the generator's output format version, so an unchanged
+re-submission is served from disk instead of running LaTeX again. Entries
+are evicted least-recently-used first once the cache grows past its size
+limit; a hit refreshes the entry's mtime, which is what the LRU order uses.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Returns ``$LATEXCV_CACHE_DIR`` or the per-user cache directory."""
+    if os.environ.get('LATEXCV_CACHE_DIR'):
+        return Path(os.environ['LATEXCV_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+    return Path(base) / 'latexcv' / 'pdf'
+
+
+class PDFCache:
+    def __init__(self, cache_dir=None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(data, cls_bytes: bytes, format_version) -> str:
+        """Hashes resume data, template bytes and generator version.
+
+        The data is normalized by serializing the parsed document, which drops
+        YAML formatting and comments. Mapping order is kept on purpose: without
+        an ``_order`` key it decides the section order in the PDF.
+        """
+        h = hashlib.sha256()
+        h.update(f'v{format_version}\0'.encode())
+        h.update(json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str).encode())
+        h.update(b'\0')
+        h.update(cls_bytes)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f'{key}.pdf'
+
+    def get(self, key: str, dest) -> bool:
+        """Copies the cached PDF for ``key`` to ``dest``; False on a miss."""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, dest)
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, key: str, pdf_path):
+        """Stores a copy of ``pdf_path`` under ``key`` and enforces the size limit."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name so concurrent readers never see a partial PDF
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out, open(pdf_path, 'rb') as src:
+                shutil.copyfileobj(src, out)
+            os.replace(tmp, path)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self.prune()
+
+    def _entries(self) -> list:
+        """Returns ``(mtime, size, path)`` for each entry, oldest first."""
+        entries = []
+        if not self.cache_dir.is_dir():
+            return entries
+        for path in self.cache_dir.glob('*/*.pdf'):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        return entries
+
+    def prune(self, max_bytes=None) -> int:
+        """Evicts least-recently-used entries until the cache fits ``max_bytes``.
+
+        Returns the number of entries removed.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        return self.prune(max_bytes=0)
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            'directory': str(self.cache_dir),
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,134 @@
+"""Per-page content fingerprints of a PDF.
+
+The preview only needs to re-rasterize pages that actually changed after a
+rebuild. This module reads just enough PDF to tell: it collects the indirect
+objects (including those packed in pdfTeX's compressed object streams), walks
+the page tree, and hashes every object reachable from each page except its
+``/Parent``. Object numbers are replaced by the order they are reached in, so
+a page whose content is unchanged keeps its fingerprint even when text added
+to another page renumbers the objects after it.
+
+It is not a general PDF parser; anything it does not understand makes
+``page_fingerprints`` return None and callers fall back to whole-file hashes.
+"""
+import hashlib
+import re
+import zlib
+
+_OBJ_RE = re.compile(rb'(\d+)\s+(\d+)\s+obj\b')
+_REF_RE = re.compile(rb'(\d+)\s+(\d+)\s+R\b')
+_PARENT_RE = re.compile(rb'/Parent\s+\d+\s+\d+\s+R')
+_LENGTH_RE = re.compile(rb'/Length\s+(\d+)(?!\s+\d+\s+R)')
+_STREAM_RE = re.compile(rb'stream\r?\n')
+
+
+def _split_stream(body: bytes):
+    """Returns ``(dictionary, stream bytes or None)`` of an object body."""
+    match = _STREAM_RE.search(body)
+    if match is None or b'<<' not in body[:match.start()]:
+        return body, None
+    head = body[:match.start()]
+    start = match.end()
+    length = _LENGTH_RE.search(head)
+    if length is not None:
+        return head, body[start:start + int(length.group(1))]
+    end = body.rfind(b'endstream')
+    return head, body[start:end].rstrip(b'\r\n')
+
+
+def _read_objects(data: bytes) -> dict:
+    """Maps object number to raw body for every object in the file."""
+    objects = {}
+    pos = 0
+    while True:
+        match = _OBJ_RE.search(data, pos)
+        if match is None:
+            break
+        start = match.end()
+        head_end = data.find(b'stream', start)
+        end = data.find(b'endobj', start)
+        if end < 0:
+            break
+        if 0 <= head_end < end:
+            # skip binary stream data by its length so it is never scanned for objects
+            length = _LENGTH_RE.search(data, start, head_end)
+            if length is not None:
+                stream = _STREAM_RE.match(data, head_end)
+                if stream is not None:
+                    end = data.find(b'endobj', stream.end() + int(length.group(1)))
+                    if end < 0:
+                        break
+        # a later definition (incremental update) replaces an earlier one
+        objects[int(match.group(1))] = data[start:end].strip()
+        pos = end + len(b'endobj')
+
+    for body in list(objects.values()):
+        head, stream = _split_stream(body)
+        if stream is None or not re.search(rb'/Type\s*/ObjStm', head):
+            continue
+        if b'/FlateDecode' in head:
+            stream = zlib.decompress(stream)
+        count = int(re.search(rb'/N\s+(\d+)', head).group(1))
+        first = int(re.search(rb'/First\s+(\d+)', head).group(1))
+        numbers = [int(n) for n in stream[:first].split()][:2 * count]
+        offsets = numbers[1::2] + [len(stream) - first]
+        for i, number in enumerate(numbers[0::2]):
+            objects.setdefault(number, stream[first + offsets[i]:first + offsets[i + 1]].strip())
+    return objects
+
+
+def _ref(body: bytes, key: bytes):
+    match = re.search(re.escape(key) + rb'\s+(\d+)\s+\d+\s+R', body)
+    return int(match.group(1)) if match else None
+
+
+def _page_numbers(objects: dict) -> list:
+    """Page object numbers in document order."""
+    catalog = next(body for body in objects.values() if re.search(rb'/Type\s*/Catalog\b', body))
+    pages = []
+    stack = [_ref(catalog, b'/Pages')]
+    seen = set()
+    while stack:
+        number = stack.pop()
+        if number in seen or number not in objects:
+            continue
+        seen.add(number)
+        node = objects[number]
+        if re.search(rb'/Type\s*/Pages\b', node):
+            kids = re.search(rb'/Kids\s*\[(.*?)\]', node, re.S).group(1)
+            stack.extend(reversed([int(n) for n, _ in _REF_RE.findall(kids)]))
+        else:
+            pages.append(number)
+    return pages
+
+
+def _fingerprint(objects: dict, page: int) -> str:
+    h = hashlib.sha1()
+    order = {page: 0}
+    pending = [page]
+    while pending:
+        number = pending.pop(0)
+        body = _PARENT_RE.sub(b'', objects.get(number, b''))
+
+        def renumber(match):
+            target = int(match.group(1))
+            if target not in order:
+                order[target] = len(order)
+                pending.append(target)
+            return b'@%d' % order[target]
+
+        h.update(_REF_RE.sub(renumber, body))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def page_fingerprints(data: bytes):
+    """Returns one content hash per page, or None if the PDF was not understood."""
+    try:
+        objects = _read_objects(data)
+        pages = _page_numbers(objects)
+        if not pages:
+            return None
+        return [_fingerprint(objects, page) for page in pages]
+    except Exception:
+        return None
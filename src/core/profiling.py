@@ -0,0 +1,166 @@
+"""Per-stage build timings and counters.
+
+Code on the build path marks its stages with ``stage()`` and bumps counters
+with ``count()``. Both cost next to nothing unless a ``Profile`` is active in
+the current context::
+
+    with Profile().active() as profile:
+        compiler.build_pipeline('resume.yaml', 'resume.tex', 'cls/deedy.cls')
+    print(profile.report())
+    profile.write_trace('build-trace.json')   # chrome://tracing / Perfetto
+
+The active profile lives in a context variable. It follows asyncio tasks and
+``asyncio.to_thread`` on its own, but work handed to other threads only
+records into it when the submitter passes its context along
+(``contextvars.copy_context().run``). Work in other processes records into
+a profile of its own, whose ``export()`` the parent ``merge()``s. Stages
+nest: a stage's time includes the stages run inside it.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_active = ContextVar('latexcv_profile', default=None)
+
+
+class Profile:
+    def __init__(self, trace=True):
+        # name -> [calls, seconds]
+        self.stages = {}
+        self.counters = {}
+        # (name, start, seconds, thread, args) per stage run; None keeps
+        # only the totals, for long-lived profiles
+        self.events = [] if trace else None
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def active(self):
+        """Records the stages run in this context (and the tasks it starts) here."""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+    def add(self, name, start, seconds, args=None):
+        with self._lock:
+            entry = self.stages.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            if self.events is not None:
+                self.events.append((name, start, seconds, threading.get_ident(), args))
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def export(self) -> dict:
+        """Picklable copy of everything recorded, for ``merge()`` in another process."""
+        with self._lock:
+            return {
+                'stages': {name: list(entry) for name, entry in self.stages.items()},
+                'counters': dict(self.counters),
+                # one trace track per process: thread ids repeat across processes
+                'events': [(name, start, seconds, os.getpid(), args)
+                           for name, start, seconds, _, args in self.events or ()],
+            }
+
+    def merge(self, exported):
+        """Adds the stages, counters and events of another profile's ``export()``."""
+        with self._lock:
+            for name, (calls, seconds) in exported['stages'].items():
+                entry = self.stages.setdefault(name, [0, 0.0])
+                entry[0] += calls
+                entry[1] += seconds
+            for name, value in exported['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            if self.events is not None:
+                # perf_counter is system-wide on the platforms we run on
+                self.events.extend(tuple(event) for event in exported['events'])
+
+    def seconds(self, name) -> float:
+        return self.stages.get(name, (0, 0.0))[1]
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                'stages': {name: {'calls': calls, 'seconds': round(seconds, 6)}
+                           for name, (calls, seconds) in self.stages.items()},
+                'counters': dict(self.counters),
+            }
+
+    def report(self) -> str:
+        """A table of stages, slowest first, followed by the counters."""
+        with self._lock:
+            stages = sorted(self.stages.items(), key=lambda kv: -kv[1][1])
+            counters = sorted(self.counters.items())
+        width = max([len(name) for name, _ in stages + counters] + [5])
+        lines = [f'{"stage":<{width}}  {"calls":>6}  {"total ms":>10}  {"mean ms":>9}']
+        for name, (calls, seconds) in stages:
+            lines.append(f'{name:<{width}}  {calls:>6}  {seconds * 1000:>10.1f}  {seconds * 1000 / calls:>9.2f}')
+        for name, value in counters:
+            lines.append(f'{name:<{width}}  {value:>6}')
+        return '\n'.join(lines)
+
+    def headline(self, total='build') -> str:
+        """One line for a status bar: stage ``total`` split into generation and LaTeX."""
+        parts = []
+        generate = self.seconds('generate')
+        if generate:
+            parts.append(f'generate {generate * 1000:.0f} ms')
+        passes = self.stages.get('latex.pass', (0, 0.0))[0]
+        if passes:
+            parts.append(f'LaTeX {self.seconds("latex.pass") * 1000:.0f} ms, '
+                         f'{passes} pass{"es" if passes > 1 else ""}')
+        if self.counters.get('compile.cache_hits'):
+            parts.append('PDF from cache')
+        line = f'{total} {self.seconds(total) * 1000:.0f} ms'
+        return f'{line} ({"; ".join(parts)})' if parts else line
+
+    def trace(self) -> dict:
+        """The recorded stages in Chrome's trace event format."""
+        with self._lock:
+            events = list(self.events or ())
+        return {'traceEvents': [
+            {'name': name, 'ph': 'X', 'pid': 1, 'tid': thread,
+             'ts': round((start - self.origin) * 1e6, 1), 'dur': round(seconds * 1e6, 1), 'args': args or {}}
+            for name, start, seconds, thread, args in events
+        ], 'otherData': self.summary()}
+
+    def write_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f, indent=1, default=str)
+
+
+def current():
+    """The profile active in this context, or None."""
+    return _active.get()
+
+
+@contextmanager
+def stage(name, **args):
+    """Times the block as stage ``name`` of the active profile, if there is one.
+
+    ``args`` (a section title, a template...) are kept with the stage's trace
+    event, to tell apart which inputs are slow.
+    """
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, start, time.perf_counter() - start, args)
+
+
+def count(name, n=1):
+    """Adds ``n`` to counter ``name`` of the active profile, if there is one."""
+    profile = _active.get()
+    if profile is not None:
+        profile.count(name, n)
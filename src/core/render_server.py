@@ -0,0 +1,247 @@
+"""Local HTTP render service.
+
+``latexcv serve`` keeps one warm process around so callers do not pay for
+Python, pylatex and template start-up on every resume::
+
+    POST /render?template=deedy&format=pdf    body: resume data as YAML or JSON
+    GET  /health
+    GET  /metrics
+
+``/render`` answers with the PDF (``format=pdf``, the default) or the
+generated LaTeX (``format=tex``). Requests are put on a bounded queue served
+by a fixed pool of worker threads sharing one ``CVCompiler``, so PDF cache
+lookups and rendered section fragments are shared by all requests. When the
+queue is full the service answers 503 instead of piling up work.
+
+``/metrics`` reports the request counters and the time spent in each build
+stage (see ``core.profiling``) summed over all renders.
+"""
+import json
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import yaml
+
+from .profiling import Profile
+from .yaml_loader import loads
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8737
+DEFAULT_QUEUE_SIZE = 32
+# Largest request body accepted, in bytes
+MAX_BODY = 1024 * 1024
+FORMATS = {'pdf': 'application/pdf', 'tex': 'application/x-tex'}
+_TEMPLATE_RE = re.compile(r'[\w-]+')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif path == '/metrics':
+            self._send_json(200, self.server.render_server.metrics())
+        else:
+            self._send_json(404, {'ok': False, 'message': f'No such endpoint: {path}'})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/render':
+            self._send_json(404, {'ok': False, 'message': f'No such endpoint: {url.path}'})
+            return
+        status, headers, body = self.server.render_server.handle_render(
+            parse_qs(url.query), self.headers.get('Content-Type', ''), self._read_body())
+        self._send(status, headers, body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY:
+            return None
+        return self.rfile.read(length)
+
+    def _send_json(self, status, payload):
+        self._send(status, {'Content-Type': 'application/json'}, json.dumps(payload).encode())
+
+    def _send(self, status, headers, body):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.render_server.verbose:
+            super().log_message(format, *args)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class RenderServer:
+    def __init__(self, compiler, address=(DEFAULT_HOST, DEFAULT_PORT), templates_dir='cls', workers=None,
+                 queue_size=DEFAULT_QUEUE_SIZE, verbose=False, profile=None):
+        self.compiler = compiler
+        self.templates_dir = templates_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.verbose = verbose
+        self._jobs = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.cache_hits = 0
+        # Stage totals of every render since start-up, served by /metrics;
+        # pass a tracing Profile to keep every render's trace events too
+        self.profile = profile if profile is not None else Profile(trace=False)
+        self.started = None
+        self.server = _Server(address, _Handler)
+        self.server.render_server = self
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {'workers': self.workers, 'queued': self._jobs.qsize(), 'queue_size': self._jobs.maxsize,
+                    'running': self.running, 'completed': self.completed, 'failed': self.failed,
+                    'rejected': self.rejected, 'cache_hits': self.cache_hits,
+                    'uptime': round(time.time() - self.started, 1) if self.started else 0,
+                    'profile': self.profile.summary()}
+
+    # --- requests --------------------------------------------------------------
+
+    def handle_render(self, query: dict, content_type: str, body):
+        """Returns ``(status, headers, body)`` of the reply to a /render request."""
+        if body is None:
+            return _error(413, f'Request body larger than {MAX_BODY} bytes')
+        fmt = query.get('format', ['pdf'])[0]
+        if fmt not in FORMATS:
+            return _error(400, f'Unknown format: {fmt!r} (expected pdf or tex)')
+        template = query.get('template', ['deedy'])[0]
+        cls_file = os.path.join(self.templates_dir, f'{template}.cls')
+        if not _TEMPLATE_RE.fullmatch(template) or not os.path.isfile(cls_file):
+            return _error(404, f'Unknown template: {template!r}')
+        try:
+            if 'json' in content_type:
+                data = json.loads(body)
+            else:
+                data = loads(body)
+        except (ValueError, yaml.YAMLError) as e:
+            return _error(400, f'Invalid resume data: {e}')
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            return _error(400, 'Resume data must be a mapping')
+
+        try:
+            future = self.submit(data, cls_file, fmt)
+        except queue.Full:
+            return _error(503, 'Render queue is full, try again later', {'Retry-After': '1'})
+        try:
+            success, msg, output = future.result()
+        except Exception as e:
+            success, msg, output = False, f'Render failed: {e}', None
+        if not success:
+            return _error(422, msg)
+        return 200, {'Content-Type': FORMATS[fmt], 'X-LaTeXCV-Message': msg}, output
+
+    def submit(self, data: dict, cls_file, fmt='pdf') -> Future:
+        """Queues a render; raises queue.Full instead of waiting when the queue is full."""
+        future = Future()
+        try:
+            self._jobs.put_nowait((future, data, cls_file, fmt))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise
+        return future
+
+    # --- workers ---------------------------------------------------------------
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, data, cls_file, fmt = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._lock:
+                self.running += 1
+            try:
+                with self.profile.active():
+                    result = self.render(data, cls_file, fmt)
+            except Exception as e:
+                result = (False, f'Render failed: {e}', None)
+            with self._lock:
+                self.running -= 1
+                if result[0]:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                if result[1] == 'PDF served from cache':
+                    self.cache_hits += 1
+            future.set_result(result)
+
+    def render(self, data: dict, cls_file, fmt='pdf'):
+        """Renders ``data`` in this thread. Returns ``(success, message, output bytes)``."""
+        if fmt == 'tex':
+            try:
+                tex = self.compiler.generator(data, cls_file).to_string()
+            except Exception as e:
+                return False, f'LaTeX generation failed: {e}', None
+            return True, 'LaTeX generated', tex.encode('utf-8')
+        with self.compiler.workspaces.workspace() as tmp:
+            output_file = os.path.join(tmp, 'resume.pdf')
+            success, msg = self.compiler.compile(data, cls_file, output_file)
+            if not success:
+                return False, msg, None
+            with open(output_file, 'rb') as f:
+                return True, msg, f.read()
+
+    # --- lifecycle -------------------------------------------------------------
+
+    def start(self):
+        """Starts the worker pool; serve_forever() calls this itself."""
+        if not self._threads:
+            self._threads = [threading.Thread(target=self._work, name=f'latexcv-render-{n}', daemon=True)
+                             for n in range(self.workers)]
+            for thread in self._threads:
+                thread.start()
+            self.started = time.time()
+
+    def serve_forever(self):
+        self.start()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            self.stop()
+
+    def shutdown(self):
+        """Stops serve_forever() running in another thread."""
+        self.server.shutdown()
+
+    def stop(self):
+        """Stops the workers once they finish the jobs already queued."""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+def _error(status, message, headers=None):
+    body = json.dumps({'ok': False, 'message': message}).encode()
+    return status, {'Content-Type': 'application/json', **(headers or {})}, body
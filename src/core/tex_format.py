@@ -0,0 +1,174 @@
+"""Precompiled LaTeX formats holding a template's preamble.
+
+Loading ``\\documentclass`` and the package stack is most of the time pdflatex
+spends on a one-page resume. ``mylatexformat`` can dump everything up to
+``\\begin{document}`` into a ``.fmt`` file; a document compiled with
+``-fmt=<name>`` then skips its own preamble and starts typesetting right away.
+
+A format is named after a hash of the template bytes, the generated preamble
+and the TeX installation, so editing the ``.cls``, changing the generator's
+preamble or upgrading TeX makes the next compile dump a fresh one. Older
+formats of the same template are deleted when a new one is dumped.
+"""
+import functools
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from .profiling import stage
+
+BEGIN_DOCUMENT = r'\begin{document}'
+# Seconds a format dump may take before the engine is killed
+DUMP_TIMEOUT = 300
+# Seconds each version query of the TeX installation may take
+FINGERPRINT_TIMEOUT = 30
+
+
+def default_format_dir() -> Path:
+    """Returns ``$LATEXCV_FORMAT_DIR`` or the per-user cache directory."""
+    if os.environ.get('LATEXCV_FORMAT_DIR'):
+        return Path(os.environ['LATEXCV_FORMAT_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+    return Path(base) / 'latexcv' / 'fmt'
+
+
+@functools.lru_cache(maxsize=None)
+def tex_fingerprint(engine: str) -> str:
+    """Identifies the TeX installation a format was dumped with.
+
+    Combines the engine version with the location and mtime of its base
+    format and of ``mylatexformat.ltx``; ``fmtutil`` rewrites the base format
+    on every TeX update. Computed once per process.
+    """
+    parts = []
+    commands = [
+        [engine, '--version'],
+        ['kpsewhich', f'-engine={engine}', f'{engine}.fmt'],
+        ['kpsewhich', 'mylatexformat.ltx'],
+    ]
+    for cmd in commands:
+        try:
+            out = subprocess.run(cmd, capture_output=True, text=True, timeout=FINGERPRINT_TIMEOUT).stdout.strip()
+        except (OSError, subprocess.TimeoutExpired):
+            out = ''
+        parts.append(out.splitlines()[0] if out else '')
+    for path in parts[1:]:
+        try:
+            parts.append(str(os.stat(path).st_mtime_ns))
+        except OSError:
+            parts.append('')
+    return '\0'.join(parts)
+
+
+def split_preamble(tex: str):
+    """Returns the part of ``tex`` before ``\\begin{document}``, or None."""
+    index = tex.find(BEGIN_DOCUMENT)
+    if index < 0:
+        return None
+    return tex[:index]
+
+
+class FormatCache:
+    def __init__(self, fmt_dir=None, engine='pdflatex'):
+        self.fmt_dir = Path(fmt_dir) if fmt_dir else default_format_dir()
+        self.engine = engine
+
+    def format_name(self, cls_file, preamble: str) -> str:
+        """Names the format after the template and everything that went into it.
+
+        The name is ``<stem>-<place>-<content>``: ``place`` hashes where the
+        template lives, so templates of the same name in different directories
+        keep formats of their own; ``content`` hashes what was dumped.
+        """
+        cls_path = Path(cls_file)
+        place = hashlib.sha1(os.fsencode(cls_path.resolve())).hexdigest()[:8]
+        h = hashlib.sha1()
+        h.update(cls_path.read_bytes())
+        h.update(b'\0')
+        h.update(preamble.encode())
+        h.update(b'\0')
+        h.update(tex_fingerprint(self.engine).encode())
+        return f'{cls_path.stem}-{place}-{h.hexdigest()[:12]}'
+
+    def _failed_marker(self, name: str) -> Path:
+        return self.fmt_dir / f'{name}.failed'
+
+    def mark_broken(self, fmt):
+        """Stops using a format that dumped fine but fails to compile documents."""
+        fmt = Path(fmt)
+        try:
+            self._failed_marker(fmt.stem).touch()
+            fmt.unlink()
+        except OSError:
+            pass
+
+    def _remove_stale(self, name: str):
+        """Deletes formats and markers of the same template file with another content hash."""
+        stem = name.rsplit('-', 1)[0]
+        for path in self.fmt_dir.glob(f'{stem}-*'):
+            if path.stem != name and path.suffix in ('.fmt', '.failed') and path.stem.rsplit('-', 1)[0] == stem:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def get(self, cls_file, preamble: str, timeout=DUMP_TIMEOUT):
+        """Returns the ``.fmt`` path for this template and preamble.
+
+        The format is dumped on first use; an engine still dumping after
+        ``timeout`` seconds is killed. Returns None when it cannot be built
+        (no engine, no ``mylatexformat``, a package refusing to be dumped, no
+        time left); callers then compile the usual way.
+        """
+        if not preamble:
+            return None
+        try:
+            name = self.format_name(cls_file, preamble)
+        except OSError:
+            return None
+        fmt = self.fmt_dir / f'{name}.fmt'
+        if fmt.exists():
+            return fmt
+        # Remember failed dumps so every compile does not retry a doomed one
+        if self._failed_marker(name).exists():
+            return None
+        try:
+            dumped = self._dump(name, cls_file, preamble, timeout)
+        except subprocess.TimeoutExpired:
+            # out of time is not out of luck: the next compile tries again
+            return None
+        if dumped:
+            self._remove_stale(name)
+            return fmt
+        try:
+            self.fmt_dir.mkdir(parents=True, exist_ok=True)
+            self._failed_marker(name).touch()
+        except OSError:
+            pass
+        return None
+
+    def _dump(self, name: str, cls_file, preamble: str, timeout=DUMP_TIMEOUT) -> bool:
+        self.fmt_dir.mkdir(parents=True, exist_ok=True)
+        work = tempfile.mkdtemp(prefix=f'{name}-', dir=self.fmt_dir)
+        try:
+            shutil.copy(cls_file, work)
+            with open(os.path.join(work, f'{name}.tex'), 'w') as f:
+                f.write(preamble + BEGIN_DOCUMENT + '\n\\end{document}\n')
+            cmd = [self.engine, '-ini', '-interaction=nonstopmode', f'-jobname={name}',
+                   f'&{self.engine}', 'mylatexformat.ltx', f'{name}.tex']
+            try:
+                with stage('format.dump', template=os.path.basename(cls_file)):
+                    subprocess.run(cmd, cwd=work, check=True, capture_output=True, text=True, timeout=timeout)
+            except (OSError, subprocess.CalledProcessError):
+                return False
+            built = os.path.join(work, f'{name}.fmt')
+            if not os.path.exists(built):
+                return False
+            # Several workers may dump the same format at once; the rename is atomic
+            os.replace(built, self.fmt_dir / f'{name}.fmt')
+            return True
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
@@ -0,0 +1,166 @@
+"""Pooled per-job build directories.
+
+Every compile works in a directory of its own, so concurrent builds never
+see each other's files. Creating and deleting a directory tree per build is
+slow on busy or network filesystems, so ``WorkspacePool`` keeps emptied
+directories around for reuse and empties released ones on a background
+thread, off the build's critical path::
+
+    with pool.workspace() as work_dir:
+        link_asset('cls/deedy.cls', work_dir)
+        ...
+
+Workspaces live under ``$LATEXCV_WORK_DIR`` (point it at a tmpfs such as
+``/dev/shm`` to keep LaTeX's scratch files in memory) or the system temp
+directory. Template assets are hardlinked into them, or symlinked when the
+workspace is on another filesystem, instead of being copied.
+
+A pool deletes its directories at interpreter exit, but ``atexit`` does not
+run in the worker processes of a ``ProcessPoolExecutor`` or
+``multiprocessing.Pool``. Code running there must use a pool of its own and
+``close()`` it explicitly instead of relying on ``default_pool()``.
+"""
+import atexit
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+
+# Emptied workspaces kept for reuse; any more released at once are deleted
+MAX_IDLE_WORKSPACES = 8
+
+
+def default_work_root() -> str:
+    """Returns ``$LATEXCV_WORK_DIR`` or the system temp directory."""
+    return os.environ.get('LATEXCV_WORK_DIR') or tempfile.gettempdir()
+
+
+def link_asset(src, work_dir) -> str:
+    """Makes ``src`` available in ``work_dir`` under its own name; returns the new path.
+
+    Tries a hardlink, then a symlink, then a copy. An existing file of that
+    name is replaced.
+    """
+    src = os.path.abspath(src)
+    dest = os.path.join(work_dir, os.path.basename(src))
+    if os.path.lexists(dest):
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        try:
+            os.symlink(src, dest)
+        except OSError:
+            shutil.copy(src, dest)
+    return dest
+
+
+def _empty(path):
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+class WorkspacePool:
+    # Deleted by close(), or at exit in processes that run atexit handlers
+    def __init__(self, root=None, max_idle=MAX_IDLE_WORKSPACES):
+        self.root = root
+        self.max_idle = max_idle
+        self.created = 0
+        self.reused = 0
+        self._base = None
+        self._idle = []
+        self._lock = threading.Lock()
+        self._released = queue.Queue()
+        self._cleaner = None
+
+    def acquire(self) -> str:
+        """Returns an empty directory for one job."""
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+            if self._base is None:
+                root = self.root or default_work_root()
+                os.makedirs(root, exist_ok=True)
+                self._base = tempfile.mkdtemp(prefix='latexcv-workspaces-', dir=root)
+                atexit.register(self.close)
+            self.created += 1
+            return tempfile.mkdtemp(prefix='job-', dir=self._base)
+
+    def release(self, path):
+        """Hands ``path`` back; it is emptied in the background before its next use."""
+        with self._lock:
+            if self._cleaner is None or not self._cleaner.is_alive():
+                self._cleaner = threading.Thread(target=self._clean, name='latexcv-workspace-cleaner',
+                                                 daemon=True)
+                self._cleaner.start()
+        self._released.put(path)
+
+    @contextmanager
+    def workspace(self):
+        path = self.acquire()
+        try:
+            yield path
+        finally:
+            self.release(path)
+
+    def _clean(self):
+        while True:
+            path = self._released.get()
+            try:
+                if path is None:
+                    return
+                with self._lock:
+                    keep = len(self._idle) < self.max_idle
+                if keep:
+                    try:
+                        _empty(path)
+                    except OSError:
+                        keep = False
+                if keep:
+                    with self._lock:
+                        self._idle.append(path)
+                else:
+                    shutil.rmtree(path, ignore_errors=True)
+            finally:
+                self._released.task_done()
+
+    def drain(self):
+        """Waits until every released workspace has been cleaned up."""
+        self._released.join()
+
+    def close(self):
+        """Deletes every workspace of this pool; ones still in use go as well."""
+        with self._lock:
+            cleaner, self._cleaner = self._cleaner, None
+        if cleaner is not None and cleaner.is_alive():
+            self._released.put(None)
+            cleaner.join()
+        with self._lock:
+            base, self._base = self._base, None
+            self._idle = []
+        if base is not None:
+            shutil.rmtree(base, ignore_errors=True)
+            atexit.unregister(self.close)
+
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def default_pool() -> WorkspacePool:
+    """The pool shared by every compiler of this process that is not given its own."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = WorkspacePool()
+        return _default_pool
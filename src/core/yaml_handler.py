@@ -1,6 +1,7 @@
-import yaml
 from pathlib import Path
 
+from .yaml_loader import invalidate, load_file, loads
+
 class YAMLHandler:
     def __init__(self, yaml_path):
         self.yaml_path = yaml_path
@@ -12,12 +13,10 @@ class YAMLHandler:
         return ''
 
     def save(self, content):
-        yaml.safe_load(content)  # Validate YAML
+        loads(content)  # Validate YAML
         with open(self.yaml_path, 'w') as f:
             f.write(content)
+        invalidate(self.yaml_path)
 
     def load_dict(self):
-        if Path(self.yaml_path).exists():
-            with open(self.yaml_path, 'r') as f:
-                return yaml.safe_load(f)
-        return {}
+        return load_file(self.yaml_path, {})
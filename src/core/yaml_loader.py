@@ -0,0 +1,132 @@
+"""YAML loading and dumping shared by the generator, compiler and GUI.
+
+Uses libyaml's ``CSafeLoader``/``CSafeDumper`` when PyYAML was built with
+it and the pure-Python safe classes otherwise; both produce the same data.
+
+``load_file`` also remembers the parsed document of every file it reads,
+keyed on the file's mtime and size, so the GUI, the compiler's cache key and
+the generator loading the same unchanged resume parse it only once. Callers
+get their own copy of the cached document and are free to modify it.
+
+``iter_documents`` reads a stream of many resumes (multi-document YAML or
+JSON Lines) one document at a time, without holding the file in memory.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import yaml
+
+from .profiling import count, stage
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+HAS_LIBYAML = SafeLoader.__name__ == 'CSafeLoader'
+
+# Parsed files kept in memory
+MAX_CACHED_FILES = 32
+# Files read by iter_documents as JSON Lines rather than YAML
+JSONL_SUFFIXES = ('.jsonl', '.ndjson')
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def loads(stream):
+    """``yaml.safe_load`` through the fastest available loader."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_all(stream):
+    """``yaml.safe_load_all``: yields the documents of a multi-document stream."""
+    return yaml.load_all(stream, Loader=SafeLoader)
+
+
+def dump(data, stream=None, **kwargs):
+    """``yaml.safe_dump`` through the fastest available dumper."""
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def iter_documents(path):
+    """Yields the documents of a multi-document YAML or JSON Lines file lazily.
+
+    Empty documents and blank lines are skipped. A document that cannot be
+    parsed raises ``yaml.YAMLError`` or ``ValueError`` when it is reached.
+    """
+    if str(path).endswith(JSONL_SUFFIXES):
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f'{path}, line {number}: {e}') from None
+    else:
+        with open(path, 'rb') as f:
+            for document in load_all(f):
+                if document is not None:
+                    yield document
+
+
+def load_file(path, default=None):
+    """Returns the parsed contents of ``path``, or ``default`` if it does not exist.
+
+    An empty file gives ``default`` as well. The file is only parsed again
+    once its mtime or size changed.
+    """
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return default
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry[0] == stamp:
+            _cache.move_to_end(path)
+    if entry is None or entry[0] != stamp:
+        with stage('yaml.parse', file=os.path.basename(path), bytes=st.st_size), open(path, 'rb') as f:
+            entry = (stamp, loads(f))
+        with _lock:
+            _cache[path] = entry
+            _cache.move_to_end(path)
+            while len(_cache) > MAX_CACHED_FILES:
+                _cache.popitem(last=False)
+    else:
+        count('yaml.cache_hits')
+    if entry[1] is None:
+        return default
+    return copy_document(entry[1])
+
+
+def invalidate(path=None):
+    """Forgets the cached document of ``path``, or of every file.
+
+    Writers call this after saving, in case the new contents have the same
+    size and the filesystem's mtime resolution hides the change.
+    """
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(path), None)
+
+
+def copy_document(node):
+    """Deep copy of a parsed document.
+
+    Safe-loaded YAML only nests dicts, lists and sets around immutable
+    scalars, so this is all deepcopy would do, at a fraction of the cost.
+    """
+    if isinstance(node, dict):
+        return {key: copy_document(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [copy_document(value) for value in node]
+    if isinstance(node, set):
+        return set(node)
+    return node
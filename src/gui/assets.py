@@ -0,0 +1,21 @@
+"""Font lookups shared by every view of the process.
+
+Listing the system's font families is slow, and every view that picks a
+font asks for the same list. ``font_families()`` asks Tk once.
+
+The list belongs to the Tk interpreter it came from, so call ``clear()``
+before the main window is destroyed.
+"""
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def font_families() -> frozenset:
+    """The font families Tk knows. Before a Tk root exists this raises RuntimeError, which is not cached."""
+    import tkinter.font as tkfont
+    return frozenset(tkfont.families())
+
+
+def clear():
+    """Drops the cached font list, e.g. before the Tk root is destroyed."""
+    font_families.cache_clear()
@@ -1,33 +1,88 @@
-import threading
 import tkinter.messagebox as messagebox
 from pathlib import Path
 
+from core.build_worker import BuildWorker
+from core.compile_daemon import DaemonClient
 from core.cv_compiler import CVCompiler
+from core.generator import FragmentCache
+from core.pdf_cache import PDFCache
+from core.profiling import Profile, stage
+from core.tex_format import FormatCache
 
 
 class ResumeController:
     def __init__(self, model, build_dir="build", pdf_path="build/resume.pdf"):
         self.model = model
-        self.cv_compiler = CVCompiler(build_dir)
+        self.cv_compiler = CVCompiler(
+            build_dir,
+            cache=PDFCache(),
+            formats=FormatCache(),
+            daemon=DaemonClient(),
+            fragment_cache=FragmentCache(),
+        )
         self.pdf_path = pdf_path
+        # Every build goes through one worker so builds never share build/ at
+        # the same time; a newer request supersedes an older one
+        self.build_worker = BuildWorker(self._build, merge=self._merge_requests)
+        # Stage timings of the last build that ran to the end, for the status bar
+        self.last_profile = None
+
+    def save_and_compile(self, data, cls_file, callback=None, interactive=True):
+        """Queues a save and build of ``data``.
+
+        ``callback(success, msg)`` runs on the Tk thread from poll_builds()
+        once the build finishes, unless a newer request overtook it. Failures
+        of interactive builds are reported in a dialog; live previews leave
+        that to the callback, and do not save the YAML file either.
+        """
+        self.build_worker.submit((data, cls_file, callback, interactive))
+
+    @staticmethod
+    def _merge_requests(replaced, request):
+        # a preview that overtakes a queued Download PDF must still save the
+        # edits: the YAML file is only written by interactive requests
+        data, cls_file, callback, interactive = request
+        return data, cls_file, callback, interactive or replaced[3]
 
-    def save_and_compile(self, data, cls_file, callback=None):
-        try:
-            self.model.save(data)
-            threading.Thread(
-                target=self.compile_resume, args=(cls_file, callback)
-            ).start()
-        except Exception as e:
-            messagebox.showerror("YAML Error", f"Invalid YAML: {e}")
-
-    def compile_resume(self, cls_file, callback=None):
-        success, msg = self.cv_compiler.build_pipeline(
-            "resume.yaml", "resume.tex", cls_file
+    def _build(self, request, cancelled):
+        profile = Profile()
+        with profile.active(), stage("build"):
+            result = self._save_and_build(request, cancelled)
+        self.last_profile = profile
+        return result
+
+    def _save_and_build(self, request, cancelled):
+        data, cls_file, _, interactive = request
+        if interactive:
+            try:
+                self.model.save(data)
+            except Exception as e:
+                return False, f"Invalid YAML: {e}"
+            if cancelled():
+                return False, "Build superseded"
+        # Built straight from the editor's data; the file is not read back
+        return self.compile_resume(cls_file, cancelled, data)
+
+    def compile_resume(self, cls_file, cancelled=None, data=None):
+        source = data if data is not None else self.model.yaml_file
+        return self.cv_compiler.build_pipeline(
+            source, "resume.tex", cls_file, cancelled=cancelled
         )
-        if not success:
+
+    def poll_builds(self):
+        """Delivers the newest finished build; call periodically from the Tk thread."""
+        finished = self.build_worker.poll()
+        if finished is None:
+            return
+        (_, _, callback, interactive), (success, msg) = finished
+        if not success and interactive:
             messagebox.showerror("Compile Error", msg)
         if callback:
-            callback()
+            callback(success, msg)
+
+    @property
+    def building(self):
+        return self.build_worker.busy
 
     def pdf_exists(self):
         return Path(self.pdf_path).exists()
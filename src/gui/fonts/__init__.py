@@ -1,3 +1,5 @@
+from gui.assets import font_families
+
 FONT_FAMILY = "Helvetica"  # default
 
 FONTS = {
@@ -13,9 +15,8 @@ FONTS = {
 def update_fonts():
     global FONT_FAMILY, FONTS
     try:
-        import tkinter.font as tkfont
-
-        available_fonts = tkfont.families()
+        # asked of Tk once per process
+        available_fonts = font_families()
         FONT_FAMILY = (
             "SF Pro Display" if "SF Pro Display" in available_fonts else "Helvetica"
         )
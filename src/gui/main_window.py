@@ -1,21 +1,18 @@
 """Main window for the CV generator GUI application."""
 
 import os
+import time
 import tkinter as tk
 import tkinter.simpledialog as simpledialog
 import tkinter.messagebox as messagebox
-
-try:
-    from pdf2image import convert_from_path
-    from PIL import Image, ImageTk
-except Exception:
-    convert_from_path = None
-    ImageTk = None
+from concurrent.futures import ThreadPoolExecutor
 
 import ttkbootstrap as ttk
 from ttkbootstrap.scrolled import ScrolledFrame
 
 from controllers.resume_controller import ResumeController
+from core.profiling import Profile, stage
+from gui import assets
 from gui.fonts import FONTS
 from models.resume_model import ResumeModel
 from gui.views.contact_section import ContactSection
@@ -27,27 +24,44 @@ from gui.views.skills_section import SkillsSection
 from gui.views.summary_section import SummarySection
 from gui.views.experience_section import ExperienceSection
 from gui.section_manager import SectionManager
+from gui.pdf_preview import PREVIEW_AVAILABLE, PdfPreview
 
 RESUME_YAML = "resume.yaml"
 BUILD_DIR = "build"
 PDF_PATH = f"{BUILD_DIR}/resume.pdf"
+# Live preview rebuilds once edits have paused for this long
+PREVIEW_DEBOUNCE_MS = 800
+# How often finished builds are picked up from the build worker
+BUILD_POLL_MS = 100
+# How often the startup load is checked for completion
+LOAD_POLL_MS = 20
 
 
 class MainWindow(ttk.Window):
-    """Main application window for CV generation."""
+    """Main application window for CV generation.
+
+    Startup is staged so the window paints before the resume is read: the
+    shell is built first, the YAML file and template list are loaded on a
+    worker thread, and the section views are then built one per event-loop
+    turn. Until ``ready`` is set, saving, building and reordering are held
+    off. ``startup_profile`` records how long each step took.
+    """
 
     def __init__(self):
+        self._started = time.perf_counter()
         super().__init__()
         self.title("CV Generator")
         self.geometry("1400x800")
         self.resizable(True, True)
+        self.startup_profile = Profile()
+        self.ready = False
 
-        # model + controller
-        self.model = ResumeModel(RESUME_YAML)
+        # model + controller; the model is loaded in the background
+        self.model = ResumeModel(RESUME_YAML, load=False)
         self.controller = ResumeController(self.model, BUILD_DIR, PDF_PATH)
 
         # assets and section lists
-        self.cls_files = self.get_cls_files()
+        self.cls_files = []
         self.dynamic_sections = []
         self.section_names = [
             'name', 'contact', 'summary', 'experience', 'education', 'skills', 'interests'
@@ -57,14 +71,84 @@ class MainWindow(ttk.Window):
         # UI state
         self.current_section = 0
         self.sections = {}
+        self.live_preview = tk.BooleanVar(value=False)
+        self._preview_after = None
 
         # Section manager centralizes order/save/remove behaviors
-        self.section_manager = SectionManager(self.model, self.sections, self.all_section_names, self.dynamic_sections)
+        self.section_manager = SectionManager(self.model, self.sections, self.all_section_names, self.dynamic_sections,
+                                              scheduler=self)
+
+        # build the shell now; sections follow once the model is loaded
+        with self.startup_profile.active(), stage("startup.shell"):
+            self.create_widgets()
+        self.bind("<Map>", self._on_first_map, add="+")
+        loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="latexcv-startup")
+        self._load_future = loader.submit(self._load_in_background)
+        loader.shutdown(wait=False)
+        self.after(LOAD_POLL_MS, self._poll_load)
+
+        self.after(BUILD_POLL_MS, self._poll_builds)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    # Staged startup -------------------------------------------------------
+    def _mark(self, name):
+        """Records the time from construction to now as stage ``name``."""
+        self.startup_profile.add(name, self._started, time.perf_counter() - self._started)
+
+    def _on_first_map(self, event):
+        if event.widget is self and "startup.first_paint" not in self.startup_profile.stages:
+            self._mark("startup.first_paint")
+
+    def _load_in_background(self):
+        # runs on the startup thread: no Tk calls here
+        with self.startup_profile.active(), stage("startup.load"):
+            self.model.load()
+            return self.get_cls_files()
+
+    def _poll_load(self):
+        if not self._load_future.done():
+            self.after(LOAD_POLL_MS, self._poll_load)
+            return
+        try:
+            self.cls_files = self._load_future.result()
+        except Exception as e:
+            self._loading_label.config(text=f"Could not load {RESUME_YAML}: {e}")
+            return
+        self._mark("startup.loaded")
+        self.cls_menu.config(values=self.cls_files if self.cls_files else ["No .cls found"])
+        self.cls_menu.set(self.cls_files[0] if self.cls_files else "")
+        self._loading_label.destroy()
+        self._pending_sections = self.create_sections()
+        self._build_next_section()
 
-        # build UI
-        self.create_widgets()
-        self.create_sections()
-        self.show_current_section()
+    def _build_next_section(self):
+        if not self._pending_sections:
+            self._finish_startup()
+            return
+        name, build = self._pending_sections.pop(0)
+        with self.startup_profile.active(), stage("startup.section", section=name):
+            self.sections[name] = build()
+            self._show_section(name)
+        # let Tk redraw and handle input before building the next one
+        self.after_idle(self.after, 0, self._build_next_section)
+
+    def _finish_startup(self):
+        self.ready = True
+        for button in self._startup_buttons:
+            button.config(state="normal")
+        self._mark("startup.ready")
+
+    def on_close(self):
+        # a debounced autosave may still be waiting
+        if self.section_manager.pending:
+            try:
+                self.section_manager.flush()
+            except Exception:
+                pass
+        self.pdf_preview.close()
+        # the cached font list belongs to this window's interpreter
+        assets.clear()
+        self.destroy()
 
     def create_widgets(self):
         # Top Navigation Bar
@@ -84,10 +168,17 @@ class MainWindow(ttk.Window):
         # Right: Buttons
         button_frame = ttk.Frame(nav_frame)
         button_frame.grid(row=0, column=1, sticky="e")
-        add_section_btn = ttk.Button(button_frame, text="Add Section", command=self.add_new_section, bootstyle="secondary")
+        add_section_btn = ttk.Button(button_frame, text="Add Section", command=self.add_new_section, bootstyle="secondary",
+                                     state="disabled")
         add_section_btn.pack(side="left", padx=(0, 10))
-        download_btn = ttk.Button(button_frame, text="Download PDF", command=self.save_and_compile, bootstyle="primary")
+        live_toggle = ttk.Checkbutton(button_frame, text="Live preview", variable=self.live_preview,
+                                      command=self.schedule_preview, bootstyle="round-toggle")
+        live_toggle.pack(side="left", padx=(0, 10))
+        download_btn = ttk.Button(button_frame, text="Download PDF", command=self.save_and_compile, bootstyle="primary",
+                                  state="disabled")
         download_btn.pack(side="left")
+        # enabled once every section is built
+        self._startup_buttons = [add_section_btn, download_btn]
 
         # Main Content Area
         self.main_frame = ttk.Frame(self)
@@ -119,6 +210,8 @@ class MainWindow(ttk.Window):
 
         self.scrolled_frame = ScrolledFrame(editor_frame, autohide=False)
         self.scrolled_frame.grid(row=2, column=0, sticky="nsew")
+        self._loading_label = ttk.Label(self.scrolled_frame, text="Loading resume…", bootstyle="secondary")
+        self._loading_label.pack(anchor="w", pady=10, padx=5)
 
         # Preview panel
         preview_frame = ttk.Frame(self.main_frame, padding=20)
@@ -126,33 +219,40 @@ class MainWindow(ttk.Window):
         preview_frame.grid_columnconfigure(0, weight=1)
         preview_frame.grid_rowconfigure(0, weight=0)
         preview_frame.grid_rowconfigure(1, weight=1)
+        preview_frame.grid_rowconfigure(2, weight=0)
 
         preview_header = ttk.Label(preview_frame, text="CV Preview", font=("Helvetica", 16, "bold"), bootstyle="secondary")
         preview_header.grid(row=0, column=0, sticky="ew", pady=(0, 10))
 
         preview_container = ttk.Frame(preview_frame, borderwidth=1, relief="solid", padding=10)
         preview_container.grid(row=1, column=0, sticky="nsew")
-        self.preview_label = ttk.Label(preview_container, text="PDF Preview will appear here")
-        self.preview_label.pack(expand=True)
+        self.pdf_preview = PdfPreview(preview_container)
+        self.pdf_preview.pack(fill="both", expand=True)
+        self.pdf_preview.show_message("PDF Preview will appear here")
+        self.preview_status = ttk.Label(preview_frame, text="", bootstyle="secondary")
+        self.preview_status.grid(row=2, column=0, sticky="w", pady=(5, 0))
 
         # Drag visual state
         self._drag_indicator = None
         self._drag_state = {'name': None}
 
     def create_sections(self):
+        """Returns ``(name, build)`` for every section in order; ``build()`` creates its view."""
         data = self.model.get_data()
         saved_order = self.model.get_order()
+        # in place: the section manager holds on to this list
         if saved_order and isinstance(saved_order, list):
-            self.all_section_names = saved_order[:]
+            self.all_section_names[:] = saved_order
         else:
-            self.all_section_names = self.section_names[:]
+            self.all_section_names[:] = self.section_names
 
         cb_kwargs = dict(
             drag_callback=self.handle_drag_event,
             move_up_callback=self.move_section_up,
             move_down_callback=self.move_section_down,
             remove_callback=self.remove_section,
-            visibility_callback=self.section_manager.autosave_order,
+            visibility_callback=self._autosave_order,
+            change_callback=self._on_section_changed,
         )
 
         factory = {
@@ -165,12 +265,16 @@ class MainWindow(ttk.Window):
             'interests': lambda d: InterestsSection(self.scrolled_frame, d, **cb_kwargs),
         }
 
+        builds = []
         for name in self.all_section_names:
             section_data = data.get(name) if isinstance(data, dict) else None
             if name in factory:
-                self.sections[name] = factory[name](section_data)
+                build = lambda make=factory[name], d=section_data: make(d)
             else:
-                self.sections[name] = ItemSection(self.scrolled_frame, name, ["title", "description"], section_data, **cb_kwargs)
+                build = lambda name=name, d=section_data: ItemSection(self.scrolled_frame, name, ["title", "description"],
+                                                                    d, **cb_kwargs)
+            builds.append((name, build))
+        return builds
 
     # Drag/reorder support -------------------------------------------------
     def handle_drag_event(self, action, section_name, event):
@@ -244,7 +348,7 @@ class MainWindow(ttk.Window):
             self._drag_state['name'] = None
 
     def reorder_section(self, section_name, new_index):
-        if section_name not in self.all_section_names:
+        if not self.ready or section_name not in self.all_section_names:
             return
         old_index = self.all_section_names.index(section_name)
         if old_index == new_index:
@@ -261,8 +365,12 @@ class MainWindow(ttk.Window):
             self.section_manager.autosave_order()
         except Exception:
             pass
+        self.schedule_preview()
 
     def _autosave_order(self):
+        # sections still being built would be missing from the file
+        if not self.ready:
+            return
         try:
             self.section_manager.autosave_order()
         except Exception:
@@ -283,12 +391,15 @@ class MainWindow(ttk.Window):
     def show_current_section(self):
         for name in self.all_section_names:
             if name in self.sections:
-                section = self.sections[name]
-                section.frame.pack(fill="x", pady=10, padx=5)
-                try:
-                    section.set_enabled(section.visible)
-                except Exception:
-                    pass
+                self._show_section(name)
+
+    def _show_section(self, name):
+        section = self.sections[name]
+        section.frame.pack(fill="x", pady=10, padx=5)
+        try:
+            section.set_enabled(section.visible)
+        except Exception:
+            pass
 
     def load_yaml(self):
         self.model.load()
@@ -296,7 +407,7 @@ class MainWindow(ttk.Window):
         for section_name, section in self.sections.items():
             section.load_data(data.get(section_name))
 
-    def save_and_compile(self):
+    def collect_payload(self):
         data = {}
         for section_name, section in self.sections.items():
             data[section_name] = section.get_data()
@@ -304,24 +415,61 @@ class MainWindow(ttk.Window):
         for k, v in data.items():
             if k not in ordered_data:
                 ordered_data[k] = v
-        yaml_payload = {"_order": self.all_section_names, **ordered_data}
-        self.controller.save_and_compile(yaml_payload, self.cls_menu.get(), self.update_pdf_preview)
+        return {"_order": self.all_section_names, **ordered_data}
 
-    def update_pdf_preview(self):
-        if convert_from_path is None or ImageTk is None:
-            self.preview_label.config(text="Install pdf2image and Pillow for PDF preview.")
+    def save_and_compile(self):
+        if not self.ready:
+            return
+        if self._preview_after is not None:
+            self.after_cancel(self._preview_after)
+            self._preview_after = None
+        self.controller.save_and_compile(self.collect_payload(), self.cls_menu.get(), self.update_pdf_preview)
+
+    # Live preview ---------------------------------------------------------
+    def _on_section_changed(self, section_name):
+        # every edit, paste or added/removed item of a section
+        self.schedule_preview()
+
+    def schedule_preview(self):
+        """Restarts the debounce timer; the build runs once edits pause."""
+        if not self.ready or not self.live_preview.get():
+            return
+        if self._preview_after is not None:
+            self.after_cancel(self._preview_after)
+        self._preview_after = self.after(PREVIEW_DEBOUNCE_MS, self._build_preview)
+
+    def _build_preview(self):
+        self._preview_after = None
+        self.controller.save_and_compile(self.collect_payload(), self.cls_menu.get(), self.update_pdf_preview,
+                                         interactive=False)
+
+    def _poll_builds(self):
+        self.controller.poll_builds()
+        if self.controller.building:
+            self.preview_status.config(text="Building…")
+        elif self.preview_status.cget("text") == "Building…":
+            self.preview_status.config(text="")
+        self.after(BUILD_POLL_MS, self._poll_builds)
+
+    def update_pdf_preview(self, success=True, msg=""):
+        if not success:
+            # keep showing the last good PDF
+            lines = msg.strip().splitlines()
+            self.preview_status.config(text=f"Build failed: {lines[0] if lines else 'unknown error'}")
+            return
+        profile = self.controller.last_profile
+        self.preview_status.config(text=profile.headline() if profile else "")
+        if not PREVIEW_AVAILABLE:
+            self.pdf_preview.show_message("Install pdf2image and Pillow for PDF preview.")
             return
         if not self.controller.pdf_exists():
-            self.preview_label.config(text="PDF not found. Compile first.")
+            self.pdf_preview.show_message("PDF not found. Compile first.")
             return
         try:
-            images = convert_from_path(PDF_PATH, first_page=1, last_page=1, size=(600, 800))
-            img = images[0]
-            img_tk = ImageTk.PhotoImage(img)
-            self.preview_label.config(image=img_tk, text="")
-            self.preview_label.image = img_tk
+            # only pages whose content changed are rasterized again
+            self.pdf_preview.show(PDF_PATH)
         except Exception as e:
-            self.preview_label.config(text=f"Error loading PDF: {e}")
+            self.pdf_preview.show_message(f"Error loading PDF: {e}")
 
     def get_cls_files(self):
         cls_dir = "cls"
@@ -337,7 +485,8 @@ class MainWindow(ttk.Window):
                 move_up_callback=self.move_section_up,
                 move_down_callback=self.move_section_down,
                 remove_callback=self.remove_section,
-                visibility_callback=self.section_manager.autosave_order,
+                visibility_callback=self._autosave_order,
+                change_callback=self._on_section_changed,
             )
             self.sections[name] = ItemSection(self.scrolled_frame, name, ["title", "description"], None, **cb_kwargs)
             self.dynamic_sections.append(name)
@@ -348,6 +497,7 @@ class MainWindow(ttk.Window):
             except Exception:
                 pass
             self.show_current_section()
+            self.schedule_preview()
 
     def remove_section(self, section_name_or_obj):
         if isinstance(section_name_or_obj, str):
@@ -383,6 +533,7 @@ class MainWindow(ttk.Window):
             self.section_manager.autosave_order()
         except Exception:
             pass
+        self.schedule_preview()
         return True
 
 
@@ -0,0 +1,224 @@
+"""Scrollable multi-page PDF preview.
+
+Pages are rasterized with poppler (through pdf2image) one at a time, only
+when they scroll into view, on a background thread. Rasterized pages are
+cached by their content fingerprint (see ``core.pdf_pages``), so after a
+rebuild only the pages whose content changed go through poppler again.
+Only a few ``PhotoImage`` objects are kept alive; pages scrolled far away
+fall back to their cached PIL image. pdf2image and PIL are imported when the
+first page is rendered, not when the window is built.
+"""
+import contextvars
+import hashlib
+import importlib.util
+import os
+import tempfile
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import ttkbootstrap as ttk
+
+from core.pdf_pages import page_fingerprints
+from core.profiling import stage
+
+PREVIEW_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ('pdf2image', 'PIL'))
+
+PAGE_WIDTH = 600
+PAGE_GAP = 12
+# US Letter; replaced by the real ratio once the first page is rasterized
+DEFAULT_PAGE_RATIO = 11 / 8.5
+# Rasterized pages kept in memory, across rebuilds
+MAX_RASTERS = 32
+# Tk images alive at once
+MAX_PHOTOS = 6
+POLL_MS = 50
+
+
+class PageRasterCache:
+    """LRU of rasterized pages keyed on page fingerprint; safe to fill from a thread."""
+
+    def __init__(self, width=PAGE_WIDTH, max_pages=MAX_RASTERS):
+        self.width = width
+        self.max_pages = max_pages
+        self.rasterized = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def render(self, pdf_path, index, key):
+        """Returns page ``index`` of ``pdf_path``, running poppler only on a cache miss."""
+        image = self.get(key)
+        if image is not None:
+            return image
+        from pdf2image import convert_from_path
+        with stage('preview.rasterize', page=index + 1):
+            image = convert_from_path(pdf_path, first_page=index + 1, last_page=index + 1,
+                                      size=(self.width, None))[0]
+        with self._lock:
+            self.rasterized += 1
+            self._images[key] = image
+            while len(self._images) > self.max_pages:
+                self._images.popitem(last=False)
+        return image
+
+
+class PdfPreview(ttk.Frame):
+    def __init__(self, parent, width=PAGE_WIDTH, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.rasters = PageRasterCache(width)
+        self.page_width = width
+        self.page_ratio = DEFAULT_PAGE_RATIO
+        self.pages = []          # fingerprint per page of the PDF being shown
+        self._items = []         # canvas image item per page
+        self._photos = OrderedDict()
+        self._pending = {}       # fingerprint -> future
+        self._snapshot = None
+        # one thread: poppler runs never overlap and snapshots are removed in order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='latexcv-preview')
+        self._polling = False
+
+        self.canvas = tk.Canvas(self, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self, orient='vertical', command=self._yview)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+        self.canvas.bind('<Configure>', lambda e: self._layout())
+        self.canvas.bind('<MouseWheel>', self._on_wheel)
+        self.canvas.bind('<Button-4>', lambda e: self._yview('scroll', -1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self._yview('scroll', 1, 'units'))
+
+    # public API -----------------------------------------------------------
+    def show_message(self, text):
+        self.pages = []
+        self.canvas.delete('all')
+        self._items = []
+        self.canvas.create_text(10, 10, text=text, anchor='nw', width=self.page_width)
+        self.canvas.configure(scrollregion=(0, 0, 0, 0))
+
+    def show(self, pdf_path):
+        """Shows ``pdf_path``, reusing every page whose content did not change."""
+        with open(pdf_path, 'rb') as f:
+            data = f.read()
+        with stage('preview.fingerprint', bytes=len(data)):
+            pages = page_fingerprints(data)
+        if pages is None:
+            # not understood: every page is new whenever the file changes
+            from pdf2image import pdfinfo_from_path
+            digest = hashlib.sha1(data).hexdigest()
+            pages = [f'{digest}:{i}' for i in range(pdfinfo_from_path(pdf_path)['Pages'])]
+        # Rasterize from a private copy; the next build rewrites pdf_path
+        fd, snapshot = tempfile.mkstemp(prefix='latexcv-preview-', suffix='.pdf')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if self._snapshot:
+            self._executor.submit(os.remove, self._snapshot)
+        self._snapshot = snapshot
+        self.pages = pages
+        self._pending = {k: fut for k, fut in self._pending.items() if not fut.done()}
+        self._layout()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._snapshot:
+            try:
+                os.remove(self._snapshot)
+            except OSError:
+                pass
+
+    # layout and lazy rendering -------------------------------------------
+    def _page_height(self):
+        return int(self.page_width * self.page_ratio)
+
+    def _layout(self):
+        if not self.pages:
+            return
+        self.canvas.delete('all')
+        height = self._page_height()
+        x = max((self.canvas.winfo_width() - self.page_width) // 2, 0)
+        self._items = []
+        for i in range(len(self.pages)):
+            top = i * (height + PAGE_GAP)
+            self.canvas.create_rectangle(x, top, x + self.page_width, top + height, outline='#cccccc', fill='white')
+            self._items.append(self.canvas.create_image(x, top, anchor='nw'))
+        total = len(self.pages) * (height + PAGE_GAP) - PAGE_GAP
+        self.canvas.configure(scrollregion=(0, 0, self.page_width, total))
+        self._refresh_visible()
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self._refresh_visible()
+
+    def _on_wheel(self, event):
+        self._yview('scroll', -1 if event.delta > 0 else 1, 'units')
+
+    def _visible_pages(self):
+        height = self._page_height() + PAGE_GAP
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), 1)
+        first = max(int(top // height), 0)
+        last = min(int(bottom // height), len(self.pages) - 1)
+        return range(first, last + 1)
+
+    def _refresh_visible(self):
+        for index in self._visible_pages():
+            key = self.pages[index]
+            photo = self._photo(key)
+            if photo is not None:
+                self.canvas.itemconfigure(self._items[index], image=photo)
+            elif key not in self._pending:
+                # the caller's context carries the active build profile, if any
+                self._pending[key] = self._executor.submit(contextvars.copy_context().run, self.rasters.render,
+                                                           self._snapshot, index, key)
+                self._start_polling()
+
+    def _photo(self, key):
+        """Returns the Tk image of a page if it is rasterized, keeping at most MAX_PHOTOS alive."""
+        photo = self._photos.get(key)
+        if photo is not None:
+            self._photos.move_to_end(key)
+            return photo
+        image = self.rasters.get(key)
+        if image is None:
+            return None
+        if key == self.pages[0]:
+            self.page_ratio = image.height / image.width
+        from PIL import ImageTk
+        photo = ImageTk.PhotoImage(image)
+        self._photos[key] = photo
+        while len(self._photos) > MAX_PHOTOS:
+            evicted, _ = self._photos.popitem(last=False)
+            for index, page_key in enumerate(self.pages):
+                if page_key == evicted and index < len(self._items):
+                    self.canvas.itemconfigure(self._items[index], image='')
+        return photo
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        finished = [key for key, future in self._pending.items() if future.done()]
+        for key in finished:
+            future = self._pending.pop(key)
+            if future.exception() is not None:
+                self.show_message(f'Error loading PDF: {future.exception()}')
+                self._pending.clear()
+                break
+        if finished and self.pages:
+            ratio = self.page_ratio
+            self._refresh_visible()
+            if ratio != self.page_ratio:
+                self._layout()
+        if self._pending:
+            self.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
@@ -1,6 +1,10 @@
-import yaml
 from typing import Dict, List
 
+from core.yaml_loader import copy_document, dump, loads
+
+# Order and visibility changes are saved once they pause for this long
+AUTOSAVE_DELAY_MS = 400
+
 
 class SectionManager:
     """Manage section objects, order and YAML persistence including
@@ -8,13 +12,22 @@ class SectionManager:
 
     This manager operates on references passed in from the UI (sections dict
     and lists) so it can be introduced incrementally.
+
+    Saves are debounced through ``scheduler`` (any Tk widget: its ``after``
+    and ``after_cancel``), and each section's YAML block is cached, so only
+    sections whose data changed are dumped again.
     """
 
-    def __init__(self, model, sections: Dict[str, object], all_section_names: List[str], dynamic_sections: List[str]):
+    def __init__(self, model, sections: Dict[str, object], all_section_names: List[str], dynamic_sections: List[str],
+                 scheduler=None):
         self.model = model
         self.sections = sections
         self.all_section_names = all_section_names
         self.dynamic_sections = dynamic_sections
+        self.scheduler = scheduler
+        self._autosave_id = None
+        # section name -> (data, YAML block, section version) of the last save
+        self._blocks = {}
 
     def remove_section(self, section_name_or_obj):
         # Normalize
@@ -66,41 +79,27 @@ class SectionManager:
             pass
 
     def autosave_order(self):
-        """Write a YAML string where hidden (visible==False) sections are
-        inserted as commented YAML blocks. The order key is always present.
+        """Saves the order and every section once changes pause.
+
+        Without a scheduler the save happens right away.
         """
-        # Build _order using current list
-        order_block = yaml.dump({'_order': self.all_section_names}, default_flow_style=False)
-        parts = [order_block.strip()]
+        if self.scheduler is None:
+            self.flush()
+            return
+        if self._autosave_id is not None:
+            self.scheduler.after_cancel(self._autosave_id)
+        self._autosave_id = self.scheduler.after(AUTOSAVE_DELAY_MS, self.flush)
 
-        # For each section in order, dump its data; if the section exists and
-        # is hidden, comment the block lines.
-        for name in self.all_section_names:
-            data = None
-            sec = self.sections.get(name)
-            if sec is not None:
-                try:
-                    data = sec.get_data()
-                except Exception:
-                    data = None
-            else:
-                # fallback to model-stored data
-                try:
-                    raw = self.model.get_data()
-                    if isinstance(raw, dict):
-                        data = raw.get(name)
-                except Exception:
-                    data = None
-
-            block = yaml.dump({name: data}, default_flow_style=False).strip()
-            if sec is not None and getattr(sec, 'visible', True) is False:
-                # comment each line
-                commented = '\n'.join('# ' + l for l in block.splitlines())
-                parts.append(commented)
-            else:
-                parts.append(block)
+    @property
+    def pending(self):
+        return self._autosave_id is not None
 
-        content = '\n\n'.join(parts) + '\n'
+    def flush(self):
+        """Writes the YAML file now, cancelling a scheduled autosave."""
+        if self._autosave_id is not None:
+            self.scheduler.after_cancel(self._autosave_id)
+            self._autosave_id = None
+        content = self.render()
 
         # Write raw content to YAML file
         try:
@@ -109,7 +108,7 @@ class SectionManager:
                 self.model.save_raw(content)
             else:
                 # Fallback: parse back to dict for known visible sections
-                self.model.save(yaml.safe_load(content))
+                self.model.save(loads(content))
         except Exception:
             # As a last resort, write directly to file path if model exposes yaml_file
             try:
@@ -119,3 +118,65 @@ class SectionManager:
                         f.write(content)
             except Exception:
                 pass
+
+    def render(self) -> str:
+        """Returns the YAML document where hidden (visible==False) sections are
+        inserted as commented YAML blocks. The order key is always present.
+
+        Sections whose data is unchanged since the last call reuse the block
+        dumped then. A section view that tracks its changes (a ``version``
+        attribute) is not even asked for its data while its version stays the
+        same.
+        """
+        # Build _order using current list
+        order_block = dump({'_order': self.all_section_names}, default_flow_style=False)
+        parts = [order_block.strip()]
+
+        # For each section in order, dump its data; if the section exists and
+        # is hidden, comment the block lines.
+        for name in self.all_section_names:
+            sec = self.sections.get(name)
+            version = getattr(sec, 'version', None)
+            cached = self._blocks.get(name)
+            if version is not None and cached is not None and cached[2] == version:
+                block = cached[1]
+            else:
+                block = self._block(name, self._section_data(name, sec), version)
+            if sec is not None and getattr(sec, 'visible', True) is False:
+                # comment each line
+                commented = '\n'.join('# ' + l for l in block.splitlines())
+                parts.append(commented)
+            else:
+                parts.append(block)
+
+        # forget removed sections
+        for name in set(self._blocks) - set(self.all_section_names):
+            del self._blocks[name]
+        return '\n\n'.join(parts) + '\n'
+
+    def _section_data(self, name, sec):
+        data = None
+        if sec is not None:
+            try:
+                data = sec.get_data()
+            except Exception:
+                data = None
+        else:
+            # fallback to model-stored data
+            try:
+                raw = self.model.get_data()
+                if isinstance(raw, dict):
+                    data = raw.get(name)
+            except Exception:
+                data = None
+        return data
+
+    def _block(self, name, data, version=None):
+        cached = self._blocks.get(name)
+        if cached is not None and cached[0] == data:
+            self._blocks[name] = (cached[0], cached[1], version)
+            return cached[1]
+        block = dump({name: data}, default_flow_style=False).strip()
+        # a copy: widgets may hand out data they keep changing
+        self._blocks[name] = (copy_document(data), block, version)
+        return block
@@ -13,7 +13,7 @@ class ContactSection(SectionView):
     def create_widgets(self):
         for key in ['email', 'portfolio', 'github', 'linkedin']:
             ttk.Label(self.frame, text=key.capitalize() + ':').pack(anchor='w')
-            entry = tk.Text(self.frame, height=1, wrap='word', font=("Courier New", 12))
+            entry = self.watch(tk.Text(self.frame, height=1, wrap='word', font=("Courier New", 12)))
             entry.pack(fill='x')
             self.widgets[key] = entry
 
@@ -21,6 +21,7 @@ class ContactSection(SectionView):
         for key in ['email', 'portfolio', 'github', 'linkedin']:
             self.widgets[key].delete('1.0', tk.END)
             self.widgets[key].insert('1.0', data.get(key, ''))
+        self.mark_dirty()
 
-    def get_data(self):
+    def read_data(self):
         return {key: self.widgets[key].get('1.0', 'end-1c') for key in ['email', 'portfolio', 'github', 'linkedin']}
@@ -6,8 +6,8 @@ class ExperienceSection(ItemSection):
         fields = ["company", "title", "location", "dates", "description"]
         super().__init__(parent, "experience", fields, data, **kwargs)
 
-    def get_data(self):
-        data = super().get_data()
+    def read_data(self):
+        data = super().read_data()
         # for item in data:
             # item["left"] = True
         return data
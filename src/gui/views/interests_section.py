@@ -18,11 +18,12 @@ class InterestsSection(SectionView):
         item_frame.pack(fill='x', pady=2)
         item_frame.grid_columnconfigure(0, weight=1)
         item_frame.grid_columnconfigure(1, weight=0)
-        interest_entry = tk.Text(item_frame, height=1, wrap='word', width=25, font=("Courier New", 12))
+        interest_entry = self.watch(tk.Text(item_frame, height=1, wrap='word', width=25, font=("Courier New", 12)))
         interest_entry.grid(row=0, column=0, sticky='ew', padx=(5,5))
         remove_btn = ttk.Button(item_frame, text='Remove', command=lambda: self.remove_item(item_frame, {'frame': item_frame, 'interest': interest_entry}), bootstyle=DANGER)
         remove_btn.grid(row=0, column=1, sticky='e', padx=(0,5))
         self.items.append({'frame': item_frame, 'interest': interest_entry})
+        self.mark_dirty()
 
     def load_data(self, data):
         for item in data:
@@ -31,6 +32,7 @@ class InterestsSection(SectionView):
                 last = self.items[-1]
                 last['interest'].delete('1.0', tk.END)
                 last['interest'].insert('1.0', item)
+        self.mark_dirty()
 
-    def get_data(self):
+    def read_data(self):
         return [{'left': True}] + [item['interest'].get('1.0', 'end-1c') for item in self.items]
@@ -1,13 +1,26 @@
 import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
+from models.item_model import ItemRecord, is_nested, item_summary, merge_edits, nested_summary, normalize_item
 from .section_view import SectionView
 
+# Sections loaded with more items than this start with every item collapsed
+EXPANDED_ITEMS_LIMIT = 8
+
+
 class ItemSection(SectionView):
+    """A list of items, each shown as a summary row until it is expanded.
+
+    The items live in ``ItemRecord`` objects; editing widgets exist only for
+    expanded items, and collapsing one writes its widgets back to the record
+    and destroys them.
+    """
+
     def __init__(self, parent, section_name, fields, data=None, **kwargs):
         # forward callbacks into SectionView
         super().__init__(parent, section_name, **kwargs)
         self.fields = fields  # list of field names, e.g., ['institution', 'degree', ...]
+        self.records = []
         self.container = ttk.Frame(self.frame)
         self.container.pack(fill='x')
         self.add_button = ttk.Button(self.frame, text=f'Add {section_name.title()}', command=self.add_item, bootstyle=SUCCESS)
@@ -15,81 +28,140 @@ class ItemSection(SectionView):
         if data:
             self.load_data(data)
 
-    def add_item(self):
-        item_frame = ttk.Frame(self.container, borderwidth=1, relief='solid')
-        item_frame.pack(fill='x', pady=2)
+    def add_item(self, item_data=None, expanded=True):
+        record = ItemRecord(normalize_item(item_data, self.fields))
+        row = ttk.Frame(self.container, borderwidth=1, relief='solid')
+        row.pack(fill='x', pady=2)
+        header = ttk.Frame(row)
+        header.pack(fill='x')
+        toggle = ttk.Button(header, text='▸', width=2, command=lambda: self.toggle_item(record), bootstyle=(LINK, "secondary"))
+        toggle.pack(side='left')
+        summary = ttk.Label(header, text=item_summary(record.data, self.fields))
+        summary.pack(side='left', fill='x', expand=True, padx=(0, 5))
+        summary.bind('<Button-1>', lambda e: self.toggle_item(record))
+        remove_btn = ttk.Button(header, text='Remove', command=lambda: self.remove_record(record), bootstyle=DANGER)
+        remove_btn.pack(side='right', padx=(0,5), pady=2)
+        record.row = {'frame': row, 'toggle': toggle, 'summary': summary}
+        self.records.append(record)
+        if expanded:
+            self.expand_item(record)
+        self.mark_dirty()
+        return record
+
+    # expanding and collapsing ------------------------------------------------
+    def toggle_item(self, record):
+        if record.expanded:
+            self.collapse_item(record)
+        else:
+            self.expand_item(record)
+
+    def expand_item(self, record):
+        if record.expanded:
+            return
+        item_frame = ttk.Frame(record.row['frame'])
+        item_frame.pack(fill='x')
         item_frame.grid_columnconfigure(0, weight=0)
         item_frame.grid_columnconfigure(1, weight=1)
         item_frame.grid_columnconfigure(2, weight=0)
-        widgets = {}
-        widgets['frame'] = item_frame
+        widgets = {'frame': item_frame, 'meta_entries': []}
         row = 0
         for field in self.fields:
             ttk.Label(item_frame, text=field.capitalize() + ':').grid(row=row, column=0, sticky='w', padx=(5,5))
+            value = record.data.get(field, '')
+            if is_nested(value):
+                # no text form to edit; _read_widgets leaves it out and merge_edits keeps it
+                ttk.Label(item_frame, text=nested_summary(value)).grid(row=row, column=1, sticky='w', padx=(0,5))
+                row += 1
+                continue
             if field == 'description':
                 widget = tk.Text(item_frame, height=2, wrap='word', font=("Courier New", 12))
             else:
                 widget = tk.Text(item_frame, height=1, wrap='word', width=25, font=("Courier New", 12))
+            widget.insert('1.0', value)
+            # watch only once filled, or filling it would count as an edit
+            widget.edit_modified(False)
+            self.watch(widget)
             widget.grid(row=row, column=1, sticky='ew', padx=(0,5))
             widgets[field] = widget
             row += 1
-        widgets['meta_entries'] = []
         add_meta_btn = ttk.Button(item_frame, text='Add Meta', command=lambda: self.add_meta(item_frame, widgets, row-1), bootstyle=INFO)
         add_meta_btn.grid(row=row-1, column=2, sticky='ne', padx=(0,5))
-        remove_btn = ttk.Button(item_frame, text='Remove', command=lambda: self.remove_item(item_frame, widgets), bootstyle=DANGER)
-        remove_btn.grid(row=0, column=2, rowspan=row, sticky='ne', padx=(0,5))
-        self.items.append(widgets)
+        record.widgets = widgets
+        nested = [(key, value) for key, value in record.data.items() if key not in self.fields and is_nested(value)]
+        if nested:
+            # below the grid, so added meta rows never land on them
+            nested_frame = ttk.Frame(record.row['frame'])
+            nested_frame.pack(fill='x')
+            for key, value in nested:
+                ttk.Label(nested_frame, text=f'{key}: {nested_summary(value)}').pack(anchor='w', padx=(5,5))
+            widgets['nested_frame'] = nested_frame
+        with self.paused_tracking():
+            for key, value in record.data.items():
+                if key not in self.fields and not is_nested(value):
+                    self.add_meta(item_frame, widgets, len(self.fields) - 1)
+                    key_var, value_var = widgets['meta_entries'][-1]['vars']
+                    key_var.set(key)
+                    value_var.set(value)
+        record.row['toggle'].config(text='▾')
+        if not self.visible:
+            self.set_enabled(False)
+
+    def collapse_item(self, record):
+        if not record.expanded:
+            return
+        record.data = merge_edits(record.data, self._read_widgets(record.widgets))
+        record.widgets['frame'].destroy()
+        if 'nested_frame' in record.widgets:
+            record.widgets['nested_frame'].destroy()
+        record.widgets = None
+        record.row['toggle'].config(text='▸')
+        record.row['summary'].config(text=item_summary(record.data, self.fields))
 
+    def set_all_expanded(self, expanded):
+        for record in self.records:
+            if expanded:
+                self.expand_item(record)
+            else:
+                self.collapse_item(record)
+
+    def remove_record(self, record):
+        record.row['frame'].destroy()
+        self.records.remove(record)
+        self.mark_dirty()
+
+    # data ------------------------------------------------------------------
     def load_data(self, data):
+        expanded = len(data) <= EXPANDED_ITEMS_LIMIT
         for item_data in data:
-            self.add_item()
-            last = self.items[-1]
-            for field in self.fields:
-                if field == 'description':
-                    last[field].delete('1.0', tk.END)
-                    last[field].insert('1.0', item_data.get(field, ''))
-                else:
-                    last[field].delete('1.0', tk.END)
-                    last[field].insert('1.0', item_data.get(field, ''))
-            for k, v in item_data.items():
-                if k not in self.fields and k != 'left':
-                    # create a meta entry and fill key/value (Entry widgets)
-                    self.add_meta(last['frame'] if 'frame' in last else None, last, len(self.fields)-1)
-                    meta_last = last['meta_entries'][-1]
-                    try:
-                        meta_last['key'].delete(0, tk.END)
-                        meta_last['key'].insert(0, k)
-                        meta_last['value'].delete(0, tk.END)
-                        meta_last['value'].insert(0, str(v))
-                    except Exception:
-                        # fallback for older widget types
-                        try:
-                            meta_last['key'].delete('1.0', tk.END)
-                            meta_last['key'].insert('1.0', k)
-                            meta_last['value'].delete('1.0', tk.END)
-                            meta_last['value'].insert('1.0', str(v))
-                        except Exception:
-                            pass
+            self.add_item(item_data, expanded=expanded)
+
+    def _read_widgets(self, item):
+        data = {}
+        for field in self.fields:
+            if field not in item:
+                # shown read-only
+                continue
+            if field == 'description':
+                data[field] = item[field].get('1.0', tk.END).strip()
+            else:
+                data[field] = item[field].get('1.0', 'end-1c')
+        # collect meta entries; ignore empty keys
+        for e in item['meta_entries']:
+            try:
+                key = e['key'].get().strip()
+                val = e['value'].get().strip()
+            except Exception:
+                # fallback for text widgets
+                key = e['key'].get('1.0', 'end-1c').strip()
+                val = e['value'].get('1.0', 'end-1c').strip()
+            if key:
+                data[key] = val
+        return data
 
-    def get_data(self):
+    def read_data(self):
         result = []
-        for item in self.items:
-            data = {}
-            for field in self.fields:
-                if field == 'description':
-                    data[field] = item[field].get('1.0', tk.END).strip()
-                else:
-                    data[field] = item[field].get('1.0', 'end-1c')
-            # collect meta entries; ignore empty keys
-            for e in item['meta_entries']:
-                try:
-                    key = e['key'].get().strip()
-                    val = e['value'].get().strip()
-                except Exception:
-                    # fallback for text widgets
-                    key = e['key'].get('1.0', 'end-1c').strip()
-                    val = e['value'].get('1.0', 'end-1c').strip()
-                if key:
-                    data[key] = val
-            result.append(data)
+        for record in self.records:
+            if record.expanded:
+                record.data = merge_edits(record.data, self._read_widgets(record.widgets))
+            result.append(dict(record.data))
         return result
@@ -12,11 +12,11 @@ class NameSection(SectionView):
 
     def create_widgets(self):
         ttk.Label(self.frame, text='First Name:').pack(anchor='w')
-        first_entry = tk.Text(self.frame, height=1, wrap='word', font=("Courier New", 12))
+        first_entry = self.watch(tk.Text(self.frame, height=1, wrap='word', font=("Courier New", 12)))
         first_entry.pack(fill='x')
         self.widgets['first'] = first_entry
         ttk.Label(self.frame, text='Last Name:').pack(anchor='w')
-        last_entry = tk.Text(self.frame, height=1, wrap='word', font=("Courier New", 12))
+        last_entry = self.watch(tk.Text(self.frame, height=1, wrap='word', font=("Courier New", 12)))
         last_entry.pack(fill='x')
         self.widgets['last'] = last_entry
 
@@ -25,8 +25,9 @@ class NameSection(SectionView):
         self.widgets['first'].insert('1.0', data.get('first', ''))
         self.widgets['last'].delete('1.0', tk.END)
         self.widgets['last'].insert('1.0', data.get('last', ''))
+        self.mark_dirty()
 
-    def get_data(self):
+    def read_data(self):
         return {
             'first': self.widgets['first'].get('1.0', 'end-1c'),
             'last': self.widgets['last'].get('1.0', 'end-1c')
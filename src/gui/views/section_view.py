@@ -1,13 +1,18 @@
+import itertools
 import tkinter as tk
+from contextlib import contextmanager
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from tkfontawesome import icon_to_image
+
+# Data versions, unique across all sections: a section that is removed and
+# added again never reuses the version of its predecessor
+_versions = itertools.count(1)
 
 
 class SectionView:
     def __init__(self, parent, section_name, visible=True, drag_callback=None,
                  move_up_callback=None, move_down_callback=None,
-                 remove_callback=None, visibility_callback=None):
+                 remove_callback=None, visibility_callback=None, change_callback=None):
         self.parent = parent
         self.section_name = section_name
         self.visible = visible
@@ -25,9 +30,71 @@ class SectionView:
         self.remove_callback = remove_callback
         # Optional callback to notify container/manager of visibility change
         self.visibility_callback = visibility_callback
+        # Optional change_callback(section_name), called on every edit
+        self.change_callback = change_callback
+
+        # get_data() re-reads the widgets only when the section is dirty;
+        # version changes with every edit
+        self.dirty = True
+        self.version = next(_versions)
+        self._snapshot = None
+        self._tracking_paused = False
 
         self.create_frame()
 
+    # change tracking ------------------------------------------------------
+    def get_data(self):
+        """Returns the section's data, reading the widgets again only after a change.
+
+        The same object is returned until the next change, so treat it as
+        read-only.
+        """
+        if self.dirty or self._snapshot is None:
+            self._snapshot = self.read_data()
+            self.dirty = False
+        return self._snapshot
+
+    def read_data(self):
+        """Reads the section's data from its widgets."""
+        raise NotImplementedError
+
+    def mark_dirty(self):
+        if self._tracking_paused:
+            return
+        self.dirty = True
+        self.version = next(_versions)
+        if self.change_callback:
+            try:
+                self.change_callback(self.section_name)
+            except Exception:
+                pass
+
+    @contextmanager
+    def paused_tracking(self):
+        """Widgets filled in the block from data the section already has are not edits."""
+        self._tracking_paused = True
+        try:
+            yield
+        finally:
+            self._tracking_paused = False
+
+    def watch(self, widget):
+        """Marks the section dirty whenever the text of a tk.Text ``widget`` changes."""
+        widget.bind('<<Modified>>', lambda e: self._on_text_modified(widget), add='+')
+        return widget
+
+    def watched_var(self):
+        """A StringVar for an Entry's textvariable that marks the section dirty when written."""
+        var = tk.StringVar(self.frame)
+        var.trace_add('write', lambda *args: self.mark_dirty())
+        return var
+
+    def _on_text_modified(self, widget):
+        # <<Modified>> fires only when the flag goes up; lower it to hear the next edit
+        if widget.edit_modified():
+            widget.edit_modified(False)
+            self.mark_dirty()
+
     def create_frame(self):
         self.frame = ttk.Frame(self.parent)
         # Always pack the frame in the editor; visibility now controls enabled/muted state
@@ -166,20 +233,24 @@ class SectionView:
             return
         row = current_row + len(item_dict['meta_entries']) + 1
         # Use single-line Entry widgets for meta key/value for more predictable saving
-        key_entry = tk.Entry(item_frame, width=12, font=("Courier New", 12))
+        key_var, value_var = self.watched_var(), self.watched_var()
+        key_entry = tk.Entry(item_frame, width=12, font=("Courier New", 12), textvariable=key_var)
         key_entry.grid(row=row, column=0, sticky='w', padx=(5,5))
-        value_entry = tk.Entry(item_frame, width=30, font=("Courier New", 12))
+        value_entry = tk.Entry(item_frame, width=30, font=("Courier New", 12), textvariable=value_var)
         value_entry.grid(row=row, column=1, sticky='ew', padx=(0,5))
         remove_meta_btn = ttk.Button(item_frame, text='X', command=lambda: self.remove_meta(item_frame, item_dict, key_entry, value_entry), bootstyle=DANGER)
         remove_meta_btn.grid(row=row, column=2, sticky='e', padx=(0,5))
-        item_dict['meta_entries'].append({'key': key_entry, 'value': value_entry})
+        # the variables must outlive this call, or Tk forgets them
+        item_dict['meta_entries'].append({'key': key_entry, 'value': value_entry, 'vars': (key_var, value_var)})
         self.update_remove_button_rowspan(item_frame)
+        self.mark_dirty()
 
     def remove_meta(self, item_frame, item_dict, key_entry, value_entry):
         key_entry.destroy()
         value_entry.destroy()
         item_dict['meta_entries'] = [e for e in item_dict['meta_entries'] if not (e['key'] is key_entry and e['value'] is value_entry)]
         self.update_remove_button_rowspan(item_frame)
+        self.mark_dirty()
 
     def update_remove_button_rowspan(self, item_frame):
         for child in item_frame.winfo_children():
@@ -195,6 +266,7 @@ class SectionView:
     def remove_item(self, frame, item_dict):
         frame.destroy()
         self.items.remove(item_dict)
+        self.mark_dirty()
 
     def remove_section(self):
         """Request removal of this entire section.
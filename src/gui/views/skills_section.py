@@ -5,8 +5,8 @@ class SkillsSection(ItemSection):
         fields = ['title', 'description']
         super().__init__(parent, 'skills', fields, data, **kwargs)
 
-    def get_data(self):
-        data = super().get_data()
+    def read_data(self):
+        data = super().read_data()
         for item in data:
             item['left'] = True
         return data
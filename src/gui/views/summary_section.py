@@ -11,12 +11,13 @@ class SummarySection(SectionView):
             self.load_data(data)
 
     def create_widgets(self):
-        self.widget = tk.Text(self.frame, height=3, wrap='word', font=("Courier New", 12))
+        self.widget = self.watch(tk.Text(self.frame, height=3, wrap='word', font=("Courier New", 12)))
         self.widget.pack(fill='x')
 
     def load_data(self, data):
         self.widget.delete('1.0', tk.END)
         self.widget.insert('1.0', data[0].get('description', '') if data else '')
+        self.mark_dirty()
 
-    def get_data(self):
+    def read_data(self):
         return [{'description': self.widget.get('1.0', tk.END).strip()}]
@@ -1,5 +1,4 @@
 import sys
-import argparse
 
 def run_gui():
     from gui.main_window import MainWindow
@@ -0,0 +1,93 @@
+"""Plain data behind the editor's item sections.
+
+An ``ItemSection`` keeps one ``ItemRecord`` per entry. A collapsed record is
+just its data and a one-line summary; Tk widgets for editing it are only
+created while it is expanded, so a section with hundreds of entries opens
+as fast as a short one.
+"""
+
+# Longest summary line shown for a collapsed item
+SUMMARY_WIDTH = 90
+
+
+class ItemRecord:
+    __slots__ = ('data', 'widgets', 'row')
+
+    def __init__(self, data=None):
+        # field/meta name -> text, in the order get_data() reports them
+        self.data = data or {}
+        # editing widgets while expanded, else None
+        self.widgets = None
+        # the record's frame in the section
+        self.row = None
+
+    @property
+    def expanded(self):
+        return self.widgets is not None
+
+
+def is_nested(value) -> bool:
+    """Whether the editor shows ``value`` read-only: lists and mappings have no text form."""
+    return isinstance(value, (list, dict))
+
+
+def nested_summary(value) -> str:
+    """The read-only text shown in place of a nested value."""
+    kind = f'{len(value)} entries' if isinstance(value, list) else f'{len(value)} keys'
+    return f'({kind}; edit in the YAML file)'
+
+
+def _text(value, strip):
+    # nested lists and mappings stay as loaded; the editor shows them read-only
+    if is_nested(value):
+        return value
+    value = '' if value is None else value if isinstance(value, str) else str(value)
+    return value.strip() if strip else value
+
+
+def normalize_item(item, fields) -> dict:
+    """Returns ``item`` as the editor reports it: every field as text, then the
+    other keys as non-empty meta entries. ``left`` is left out; sections that
+    need it add it back. List and mapping values are kept as they are.
+    """
+    item = item if isinstance(item, dict) else {}
+    data = {}
+    for field in fields:
+        data[field] = _text(item.get(field, ''), field == 'description')
+    for key, value in item.items():
+        if key in fields or key == 'left':
+            continue
+        key = str(key).strip()
+        if key:
+            data[key] = _text(value, True)
+    return data
+
+
+def item_summary(data, fields, width=SUMMARY_WIDTH) -> str:
+    """One line naming the item: its first two non-empty text fields."""
+    parts = []
+    for field in fields:
+        value = data.get(field, '')
+        value = ' '.join(value.split()) if isinstance(value, str) else ''
+        if value:
+            parts.append(value)
+        if len(parts) == 2:
+            break
+    text = ' — '.join(parts) or '(empty)'
+    return text if len(text) <= width else text[:width - 1] + '…'
+
+
+def merge_edits(data, edited) -> dict:
+    """Returns what an expanded item's widgets read, ``edited``, with the nested
+    values of ``data`` they showed read-only put back in their place. A key
+    the user typed in anew replaces the nested value.
+    """
+    merged = {}
+    for key, value in data.items():
+        if key in edited:
+            merged[key] = edited[key]
+        elif is_nested(value):
+            merged[key] = value
+    for key, value in edited.items():
+        merged.setdefault(key, value)
+    return merged
@@ -1,31 +1,49 @@
-import yaml
-from pathlib import Path
+import os
+import tempfile
+
+from core.yaml_loader import dump, invalidate, load_file
 
 class ResumeModel:
-    def __init__(self, yaml_file='resume.yaml'):
+    def __init__(self, yaml_file='resume.yaml', load=True):
         self.yaml_file = yaml_file
         self.data = {}
-        self.load()
+        # the GUI passes load=False and loads on a worker thread instead
+        if load:
+            self.load()
 
     def load(self):
-        if Path(self.yaml_file).exists():
-            with open(self.yaml_file, 'r') as f:
-                self.data = yaml.safe_load(f) or {}
-        else:
-            self.data = {}
+        self.data = load_file(self.yaml_file) or {}
 
     def save(self, data):
         self.data = data
-        with open(self.yaml_file, 'w') as f:
-            yaml.dump(self.data, f)
+        self._write(dump(self.data))
 
     def save_raw(self, raw_content: str):
         """Write raw YAML content (string) directly to the yaml file.
 
         This is used by SectionManager to preserve commented-out blocks.
         """
-        with open(self.yaml_file, 'w') as f:
-            f.write(raw_content)
+        self._write(raw_content)
+
+    def _write(self, text: str):
+        """Replaces the yaml file atomically, so a crash mid-save never truncates it."""
+        directory = os.path.dirname(os.path.abspath(self.yaml_file))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(self.yaml_file) + '-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+            try:
+                os.chmod(tmp, os.stat(self.yaml_file).st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(tmp, 0o644)
+            os.replace(tmp, self.yaml_file)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        invalidate(self.yaml_file)
 
     def get_data(self):
         # return a copy without internal _order key for UI convenience
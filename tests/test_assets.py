@@ -0,0 +1,34 @@
+import importlib.util
+import tkinter.font
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# gui/__init__ imports the Tk main window; the lookup itself needs no window
+_spec = importlib.util.spec_from_file_location('assets', ROOT / 'src' / 'gui' / 'assets.py')
+assets = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(assets)
+
+
+def test_font_families_asks_tk_once(monkeypatch):
+    calls = []
+
+    def families():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('Too early to use font: no default root window')
+        return ('Helvetica', 'Courier New')
+
+    monkeypatch.setattr(tkinter.font, 'families', families)
+    assets.clear()
+    try:
+        assets.font_families()
+    except RuntimeError:
+        pass
+    # the failure before a root existed is not remembered
+    assert all(assets.font_families() == {'Helvetica', 'Courier New'} for _ in range(5))
+    assert len(calls) == 2
+
+    assets.clear()
+    assets.font_families()
+    assert len(calls) == 3
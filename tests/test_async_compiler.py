@@ -0,0 +1,129 @@
+import asyncio
+import os
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.async_compiler import AsyncCompiler
+from src.core.cv_compiler import CVCompiler
+from src.core.tex_format import FormatCache
+
+
+def fake_engine(tmp_path, delay):
+    """A 'pdflatex' that sleeps, then copies the .tex it was given into <name>.pdf."""
+    engine = tmp_path / 'fakelatex'
+    engine.write_text(textwrap.dedent(f'''\
+        #!{sys.executable}
+        import sys, time
+        tex = sys.argv[-1]
+        time.sleep({delay})
+        with open(tex) as f, open(tex[:-4] + '.pdf', 'w') as out:
+            out.write(f.read())
+        '''))
+    engine.chmod(0o755)
+    return str(engine)
+
+
+def make_jobs(tmp_path, count):
+    (tmp_path / 'deedy.cls').write_text('')
+    jobs = []
+    for n in range(count):
+        yaml_file = tmp_path / f'r{n}.yaml'
+        yaml_file.write_text(f'name: {{first: Person{n}, last: Doe}}\n')
+        jobs.append((str(yaml_file), str(tmp_path / 'deedy.cls'), str(tmp_path / 'out' / f'r{n}.pdf')))
+    return jobs
+
+
+def test_queue_limits_concurrency(tmp_path):
+    compiler = CVCompiler(str(tmp_path / 'build'), silent=True, engine=fake_engine(tmp_path, 0.05), backend='string')
+    jobs = make_jobs(tmp_path, 6)
+    peak = 0
+
+    async def main():
+        nonlocal peak
+        async with AsyncCompiler(compiler, concurrency=2, queue_size=2) as runner:
+            futures = [await runner.submit(*job) for job in jobs]
+            while not all(f.done() for f in futures):
+                peak = max(peak, runner.running)
+                await asyncio.sleep(0.005)
+            return [f.result() for f in futures]
+
+    results = asyncio.run(main())
+
+    assert all(success for success, _ in results)
+    assert 1 <= peak <= 2
+    for n, (_, _, pdf) in enumerate(jobs):
+        assert '\\namesection{Person%d}' % n in Path(pdf).read_text()
+
+
+def test_timeout_kills_engine(tmp_path):
+    compiler = CVCompiler(str(tmp_path / 'build'), silent=True, engine=fake_engine(tmp_path, 30), backend='string')
+    (job,) = make_jobs(tmp_path, 1)
+
+    async def main():
+        async with AsyncCompiler(compiler, timeout=0.5) as runner:
+            return await runner.compile(*job), runner.timed_out
+
+    start = time.monotonic()
+    (success, msg), timed_out = asyncio.run(main())
+
+    assert time.monotonic() - start < 10
+    assert not success and 'timed out' in msg
+    assert timed_out == 1
+
+
+def test_cancelling_future_cancels_job(tmp_path):
+    compiler = CVCompiler(str(tmp_path / 'build'), silent=True, engine=fake_engine(tmp_path, 30), backend='string')
+    (job,) = make_jobs(tmp_path, 1)
+
+    async def main():
+        async with AsyncCompiler(compiler, concurrency=1) as runner:
+            future = await runner.submit(*job)
+            while not runner.running:
+                await asyncio.sleep(0.01)
+            future.cancel()
+            await asyncio.wait_for(runner.join(), 10)
+            return runner.running
+
+    assert asyncio.run(main()) == 0
+    assert not Path(job[2]).exists()
+
+
+def test_timeout_kills_format_dump(tmp_path):
+    # an engine whose format dump hangs; it leaves its pid behind
+    engine = tmp_path / 'fakelatex'
+    engine.write_text(textwrap.dedent(f'''\
+        #!{sys.executable}
+        import os, sys, time
+        if '-ini' in sys.argv:
+            with open({str(tmp_path / 'dump.pid')!r}, 'w') as f:
+                f.write(str(os.getpid()))
+            time.sleep(60)
+        '''))
+    engine.chmod(0o755)
+    formats = FormatCache(str(tmp_path / 'fmt'), engine=str(engine))
+    compiler = CVCompiler(str(tmp_path / 'build'), silent=True, engine=str(engine), formats=formats,
+                          backend='string')
+    (job,) = make_jobs(tmp_path, 1)
+
+    async def main():
+        async with AsyncCompiler(compiler, timeout=1) as runner:
+            return await runner.compile(*job)
+
+    start = time.monotonic()
+    success, msg = asyncio.run(main())
+
+    assert time.monotonic() - start < 20
+    assert not success and 'timed out' in msg
+    pid = int((tmp_path / 'dump.pid').read_text())
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        pass
+    else:
+        raise AssertionError('format dump still running')
+    # running out of time does not mark the template as unable to dump
+    assert not list((tmp_path / 'fmt').glob('*.failed'))
@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.batch import plan_jobs, resolve_sources, stream_jobs
+
+
+def test_resolve_sources_expands_glob(tmp_path):
+    for name in ['b.yaml', 'a.yaml', 'notes.md']:
+        (tmp_path / name).write_text('name: {}\n')
+    entries = resolve_sources(str(tmp_path / '*.yaml'))
+    assert [Path(e['yaml']).name for e in entries] == ['a.yaml', 'b.yaml']
+
+
+def test_resolve_sources_reads_manifests_relative_to_manifest(tmp_path):
+    (tmp_path / 'list.txt').write_text('# candidates\none.yaml\n\nsub/two.yaml  # second\n')
+    entries = resolve_sources(str(tmp_path / 'list.txt'))
+    assert [e['yaml'] for e in entries] == [str(tmp_path / 'one.yaml'), str(tmp_path / 'sub' / 'two.yaml')]
+
+    (tmp_path / 'list.json').write_text(json.dumps(['one.yaml', {'yaml': 'two.yaml', 'template': 'bauhaus'}]))
+    entries = resolve_sources(str(tmp_path / 'list.json'))
+    assert entries[1] == {'yaml': str(tmp_path / 'two.yaml'), 'template': 'bauhaus'}
+
+
+def test_plan_jobs_gives_each_job_its_own_build_dir(tmp_path):
+    entries = [{'yaml': 'x/resume.yaml'}, {'yaml': 'y/resume.yaml'}, {'yaml': 'z/other.yaml', 'template': 'bauhaus'}]
+    jobs = plan_jobs(entries, str(tmp_path), 'cls/deedy.cls')
+    assert [j['name'] for j in jobs] == ['resume', 'resume-2', 'other']
+    assert len({j['build_dir'] for j in jobs}) == 3
+    assert jobs[1]['pdf'] == os.path.join(str(tmp_path), 'resume-2.pdf')
+    assert jobs[2]['cls'].endswith(os.path.join('cls', 'bauhaus.cls'))
+
+
+def test_stream_jobs_reads_documents_lazily(tmp_path):
+    source = tmp_path / 'people.yaml'
+    source.write_text('name: {first: Ada}\n---\n- not a resume\n---\nname: [unclosed\n')
+    jobs = stream_jobs(str(source), str(tmp_path / 'out'), 'cls/deedy.cls')
+
+    first = next(jobs)
+    assert (first['name'], first['data']) == ('people-1', {'name': {'first': 'Ada'}})
+    assert 'error' in next(jobs)
+    # the broken third document is only reached now
+    with pytest.raises(yaml.YAMLError):
+        next(jobs)
+
+
+def test_stream_jobs_reads_json_lines(tmp_path):
+    source = tmp_path / 'people.jsonl'
+    source.write_text('{"name": {"first": "Ada"}}\n\n{"name": {"first": "Grace"}}\n')
+    jobs = list(stream_jobs(str(source), str(tmp_path / 'out'), 'cls/deedy.cls'))
+    assert [j['document'] for j in jobs] == [1, 2]
+    assert jobs[1]['data']['name']['first'] == 'Grace'
+
+
+def test_string_backend_jobs_never_import_pylatex(tmp_path):
+    import subprocess
+    import textwrap
+
+    (tmp_path / 'deedy.cls').write_text('')
+    (tmp_path / 'ada.yaml').write_text('name: {first: Ada, last: Lovelace}\n')
+    # a fresh interpreter, since other tests put a pylatex stub in sys.modules;
+    # the job runs in it rather than in a batch worker so its imports can be seen
+    code = textwrap.dedent(f'''\
+        import json, sys
+        sys.path.insert(0, {str(Path(__file__).resolve().parents[1])!r})
+        from src.core.batch import compile_job, plan_jobs
+        job, = plan_jobs([{{'yaml': 'ada.yaml'}}], 'out', 'deedy.cls')
+        result = compile_job({{**job, 'backend': 'string'}}, keep_build=True)
+        print(json.dumps({{'pylatex': 'pylatex' in sys.modules, 'result': result}}))
+        ''')
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=tmp_path)
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout.splitlines()[-1])
+
+    assert result['pylatex'] is False
+    # without TeX the job fails, but only once LaTeX runs
+    assert 'generation failed' not in result['result']['message']
+    assert '\\namesection{Ada}' in (tmp_path / 'out' / '.build' / 'ada' / 'ada.tex').read_text()
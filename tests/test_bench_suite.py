@@ -0,0 +1,38 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.bench_suite import compare, parse_size, run_suite
+from benchmarks.synthetic import synthetic_resume
+
+
+def test_synthetic_resume_is_reproducible_and_nests_to_depth():
+    def depth(items):
+        nested = [value for item in items if isinstance(item, dict)
+                  for value in item.values() if isinstance(value, list) and value and isinstance(value[0], dict)]
+        return 1 + max((depth(value) for value in nested), default=0)
+
+    shallow = synthetic_resume(6, 4, seed=1)
+    deep = synthetic_resume(6, 4, seed=1, depth=6)
+    assert shallow == synthetic_resume(6, 4, seed=1)
+    assert max(depth(v) for v in shallow.values() if isinstance(v, list)) <= 3
+    assert max(depth(v) for v in deep.values() if isinstance(v, list)) > 3
+
+
+def test_suite_results_round_trip_and_compare():
+    assert parse_size('12x8') == (12, 8, 2)
+    # the pylatex cases are left out: other tests may have stubbed pylatex
+    only = ['generate.string', 'latex_text', 'yaml', 'autosave_order']
+    results = run_suite(['2x2', '2x2x4'], repeat=1, only=only)
+    results = json.loads(json.dumps(results))
+
+    names = {result['case'] for result in results['results'].values()}
+    assert {'generate.string', 'latex_text', 'yaml.load', 'yaml.dump', 'autosave_order'} <= names
+    assert 'autosave_order/2x2x4' in results['results']
+    assert compare(results, results) == []
+
+    slower = json.loads(json.dumps(results))
+    slower['results']['yaml.load/2x2x2']['median_ms'] = results['results']['yaml.load/2x2x2']['median_ms'] * 2 + 1
+    assert [key for key, _, _ in compare(slower, results)] == ['yaml.load/2x2x2']
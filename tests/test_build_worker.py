@@ -0,0 +1,89 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.build_worker import BuildWorker
+
+
+def wait_for_result(worker, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        finished = worker.poll()
+        if finished is not None:
+            return finished
+        time.sleep(0.01)
+    raise AssertionError('no build result')
+
+
+def test_newer_requests_supersede_pending_and_running_builds():
+    started = threading.Event()
+    release = threading.Event()
+    built, saw_cancel = [], []
+
+    def build(request, cancelled):
+        built.append(request)
+        if request == 'first':
+            started.set()
+            release.wait(5)
+            saw_cancel.append(cancelled())
+        return True, request
+
+    worker = BuildWorker(build)
+    worker.submit('first')
+    started.wait(5)
+    # first is running; second is replaced by third before it ever starts
+    worker.submit('second')
+    worker.submit('third')
+    release.set()
+
+    assert wait_for_result(worker) == ('third', (True, 'third'))
+    assert built == ['first', 'third']
+    assert saw_cancel == [True]
+    assert worker.poll() is None
+    worker.stop()
+
+
+def test_build_errors_become_failed_results():
+    def build(request, cancelled):
+        raise RuntimeError('boom')
+
+    worker = BuildWorker(build)
+    worker.submit('x')
+    assert wait_for_result(worker) == ('x', (False, 'boom'))
+    worker.stop()
+
+
+def test_preview_overtaking_a_queued_download_still_saves(tmp_path):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+    from controllers.resume_controller import ResumeController
+
+    class Model:
+        yaml_file = str(tmp_path / 'resume.yaml')
+        saved = []
+
+        def save(self, data):
+            self.saved.append(data)
+
+    started, release = threading.Event(), threading.Event()
+    controller = ResumeController(Model(), str(tmp_path / 'build'), str(tmp_path / 'build' / 'resume.pdf'))
+
+    def compile_resume(cls_file, cancelled=None, data=None):
+        started.set()
+        release.wait(5)
+        return True, 'built'
+
+    controller.compile_resume = compile_resume
+    controller.save_and_compile({'v': 1}, 'deedy.cls', interactive=False)
+    started.wait(5)
+    # Download PDF waits behind the running preview, then a preview replaces it
+    controller.save_and_compile({'v': 2}, 'deedy.cls', interactive=True)
+    controller.save_and_compile({'v': 3}, 'deedy.cls', interactive=False)
+    release.set()
+
+    (data, _, _, interactive), result = wait_for_result(controller.build_worker)
+    assert (data, interactive, result) == ({'v': 3}, True, (True, 'built'))
+    assert controller.model.saved == [{'v': 3}]
+    controller.build_worker.stop()
@@ -0,0 +1,108 @@
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.compile_daemon import CompileDaemon, DaemonClient
+from src.core.cv_compiler import CVCompiler
+
+
+def fake_engine(tmp_path):
+    """A 'pdflatex' that writes the .tex it was given into <name>.pdf."""
+    engine = tmp_path / 'fakelatex'
+    engine.write_text(textwrap.dedent(f'''\
+        #!{sys.executable}
+        import sys
+        tex = sys.argv[-1]
+        if not tex.endswith('.tex'):
+            sys.exit(1)
+        with open(tex) as f, open(tex[:-4] + '.pdf', 'w') as out:
+            out.write(f.read())
+        '''))
+    engine.chmod(0o755)
+    return str(engine)
+
+
+def start_daemon(tmp_path):
+    address = str(tmp_path / 'daemon.sock')
+    daemon = CompileDaemon(address, workers=1, fmt_dir=str(tmp_path / 'fmt'), engine=fake_engine(tmp_path))
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    client = DaemonClient(address, timeout=30)
+    deadline = time.monotonic() + 30
+    while client.ping() is None:
+        assert time.monotonic() < deadline, 'daemon did not start'
+        time.sleep(0.05)
+    return daemon, thread, client
+
+
+def test_daemon_round_trip(tmp_path):
+    (tmp_path / 'deedy.cls').write_text('')
+    daemon, thread, client = start_daemon(tmp_path)
+    try:
+        assert stat.S_IMODE(os.stat(client.address).st_mode) == 0o600
+        assert client.ping()['workers'] == 1
+
+        # CVCompiler hands the build to the daemon, which uses the compiler's backend
+        compiler = CVCompiler(str(tmp_path / 'build'), silent=True, daemon=client, backend='string')
+        data = {'name': {'first': 'Ada', 'last': 'Lovelace'}}
+        success, msg = compiler.compile(data, str(tmp_path / 'deedy.cls'), str(tmp_path / 'ada.pdf'))
+        assert success, msg
+        assert '\\namesection{Ada}' in (tmp_path / 'ada.pdf').read_text()
+        assert (daemon.completed, daemon.failed) == (1, 0)
+
+        reply = client.request({'op': 'nonsense'})
+        assert not reply['ok'] and 'Unknown op' in reply['message']
+    finally:
+        assert client.shutdown()
+        thread.join(30)
+    assert not thread.is_alive()
+    assert not os.path.exists(client.address)
+    assert client.ping() is None
+
+
+def test_daemon_leaves_no_temp_files(tmp_path, monkeypatch):
+    temp = tmp_path / 'tmp'
+    temp.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(temp))
+    (tmp_path / 'deedy.cls').write_text('')
+    daemon, thread, client = start_daemon(tmp_path)
+    try:
+        success, msg = client.compile({'name': {'first': 'Ada'}}, str(tmp_path / 'deedy.cls'),
+                                      str(tmp_path / 'ada.pdf'), backend='string')
+        assert success, msg
+        # the workers keep everything inside the daemon's own directory
+        assert [p.name.split('-')[1] for p in temp.glob('latexcv-*')] == ['daemon']
+    finally:
+        assert client.shutdown()
+        thread.join(30)
+    assert list(temp.glob('latexcv-*')) == []
+
+
+def test_compiler_falls_back_without_a_daemon(tmp_path):
+    (tmp_path / 'deedy.cls').write_text('')
+    # a stale socket path nobody listens on, then no socket at all
+    (tmp_path / 'stale.sock').write_text('')
+    for address in (tmp_path / 'stale.sock', tmp_path / 'missing.sock'):
+        compiler = CVCompiler(str(tmp_path / 'build'), silent=True, engine=fake_engine(tmp_path),
+                              daemon=DaemonClient(str(address)), backend='string')
+        success, msg = compiler.compile({'name': {'first': 'Ada'}}, str(tmp_path / 'deedy.cls'),
+                                        str(tmp_path / 'ada.pdf'))
+        assert success, msg
+        assert '\\namesection{Ada}' in (tmp_path / 'ada.pdf').read_text()
+
+
+def test_tcp_requests_need_the_token(tmp_path):
+    daemon = CompileDaemon(('127.0.0.1', 0), workers=1, token_path=str(tmp_path / 'token'))
+    daemon.started = time.time()
+    assert not daemon.handle({'op': 'ping'})['ok']
+    assert not daemon.handle({'op': 'ping', 'token': 'guess'})['ok']
+    assert daemon.handle({'op': 'ping', 'token': daemon.token})['ok']
+    # without the token file the client behaves as if no daemon were running
+    assert DaemonClient(('127.0.0.1', 1), token_path=str(tmp_path / 'token')).ping() is None
@@ -0,0 +1,115 @@
+import os
+import sys
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.cv_compiler import CVCompiler
+
+
+def fake_engine(tmp_path):
+    """A 'pdflatex' that writes the .tex it was given into <name>.pdf."""
+    engine = tmp_path / 'fakelatex'
+    engine.write_text(textwrap.dedent(f'''\
+        #!{sys.executable}
+        import sys, time
+        tex = sys.argv[-1]
+        time.sleep(0.05)
+        with open(tex) as f, open(tex[:-4] + '.pdf', 'w') as out:
+            out.write(f.read())
+        '''))
+    engine.chmod(0o755)
+    return str(engine)
+
+
+def test_concurrent_compiles_do_not_share_directories(tmp_path):
+    (tmp_path / 'deedy.cls').write_text('')
+    compiler = CVCompiler(str(tmp_path / 'build'), silent=True, engine=fake_engine(tmp_path), backend='string')
+    jobs = []
+    for n in range(8):
+        yaml_file = tmp_path / f'r{n}.yaml'
+        yaml_file.write_text(f'name: {{first: Person{n}, last: Doe}}\n')
+        jobs.append((str(yaml_file), str(tmp_path / 'out' / f'r{n}.pdf')))
+    cwd = os.getcwd()
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda job: compiler.compile(job[0], str(tmp_path / 'deedy.cls'), job[1]), jobs))
+
+    assert os.getcwd() == cwd
+    assert all(success for success, _ in results)
+    for n, (_, pdf) in enumerate(jobs):
+        assert '\\namesection{Person%d}' % n in Path(pdf).read_text()
+
+
+def test_compile_from_data(tmp_path):
+    (tmp_path / 'deedy.cls').write_text('')
+    compiler = CVCompiler(str(tmp_path / 'build'), silent=True, engine=fake_engine(tmp_path), backend='string')
+    data = {'name': {'first': 'Ada', 'last': 'Lovelace'}, 'skills': [{'left': True}, {'title': 'Maths'}]}
+
+    success, msg = compiler.compile(data, str(tmp_path / 'deedy.cls'), str(tmp_path / 'ada.pdf'))
+
+    assert success, msg
+    assert '\\namesection{Ada}' in (tmp_path / 'ada.pdf').read_text()
+    assert data['skills'][0] == {'left': True}
+
+
+def test_passes_stop_once_aux_files_settle(tmp_path):
+    """The second build of a document starts from its saved .aux and needs one pass."""
+    engine = tmp_path / 'auxlatex'
+    engine.write_text(textwrap.dedent(f'''\
+        #!{sys.executable}
+        import hashlib, sys
+        tex = sys.argv[-1]
+        with open(tex) as f:
+            source = f.read()
+        with open({str(tmp_path / 'passes.log')!r}, 'a') as log:
+            log.write('pass\\n')
+        # the labels of this document are known after one pass
+        with open(tex[:-4] + '.aux', 'w') as aux:
+            aux.write(hashlib.sha1(source.encode()).hexdigest())
+        with open(tex[:-4] + '.pdf', 'w') as out:
+            out.write(source)
+        '''))
+    engine.chmod(0o755)
+    (tmp_path / 'deedy.cls').write_text('')
+    compiler = CVCompiler(str(tmp_path / 'build'), silent=True, engine=str(engine), backend='string')
+    data = {'name': {'first': 'Ada', 'last': 'Lovelace'}}
+
+    def passes():
+        log = tmp_path / 'passes.log'
+        count = len(log.read_text().splitlines())
+        log.unlink()
+        return count
+
+    success, msg = compiler.build_pipeline(data, 'resume.tex', str(tmp_path / 'deedy.cls'))
+    assert success and msg == 'PDF compiled in 2 LaTeX passes'
+    assert passes() == 2
+
+    success, msg = compiler.build_pipeline(data, 'resume.tex', str(tmp_path / 'deedy.cls'))
+    assert success and msg == 'PDF compiled in 1 LaTeX pass'
+    assert passes() == 1
+
+    # an edited document reads stale labels, so it needs the second pass again
+    data['name']['first'] = 'Grace'
+    assert compiler.build_pipeline(data, 'resume.tex', str(tmp_path / 'deedy.cls'))[0]
+    assert passes() == 2
+
+
+def test_cache_hit_still_writes_matching_tex(tmp_path):
+    from src.core.pdf_cache import PDFCache
+
+    (tmp_path / 'deedy.cls').write_text('')
+    compiler = CVCompiler(str(tmp_path / 'build'), silent=True, cache=PDFCache(tmp_path / 'cache'),
+                          engine=fake_engine(tmp_path), backend='string')
+    ada, bob = {'name': {'first': 'Ada'}}, {'name': {'first': 'Bob'}}
+    tex = tmp_path / 'build' / 'resume.tex'
+    for data in (ada, bob):
+        assert compiler.build_pipeline(data, 'resume.tex', str(tmp_path / 'deedy.cls'))[0]
+
+    success, msg = compiler.build_pipeline(ada, 'resume.tex', str(tmp_path / 'deedy.cls'))
+
+    assert (success, msg) == (True, 'PDF served from cache')
+    assert '\\namesection{Ada}' in tex.read_text()
+    assert tex.read_text() == (tmp_path / 'build' / 'resume.pdf').read_text()
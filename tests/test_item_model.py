@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / 'src'), str(ROOT)]
+
+from models.item_model import ItemRecord, item_summary, merge_edits, normalize_item
+
+
+def test_normalize_item_matches_editor_output():
+    fields = ['title', 'date', 'description']
+    item = {'date': 2021, 'description': '  Did things.\n', 'left': True, 'title': 'Engineer',
+            ' url ': ' https://example.com ', '  ': 'dropped'}
+    data = normalize_item(item, fields)
+    assert data == {'title': 'Engineer', 'date': '2021', 'description': 'Did things.',
+                    'url': 'https://example.com'}
+    assert list(data) == ['title', 'date', 'description', 'url']
+    assert normalize_item(None, fields) == {'title': '', 'date': '', 'description': ''}
+    assert not ItemRecord(data).expanded
+
+
+def test_item_summary_uses_first_filled_fields():
+    fields = ['institution', 'degree', 'date']
+    assert item_summary({'institution': '', 'degree': 'BSc\n CS', 'date': '2020'}, fields) == 'BSc CS — 2020'
+    assert item_summary({}, fields) == '(empty)'
+    summary = item_summary({'institution': 'x' * 200}, fields, width=20)
+    assert len(summary) == 20 and summary.endswith('…')
+
+
+def test_normalize_item_keeps_nested_values():
+    fields = ['title', 'description']
+    item = {'title': None, 'description': ['Built a thing', {'contribution': 'Led it'}],
+            'links': {'repo': 'https://example.com'}}
+    data = normalize_item(item, fields)
+    assert data == {'title': '', 'description': ['Built a thing', {'contribution': 'Led it'}],
+                    'links': {'repo': 'https://example.com'}}
+    assert item_summary(data, fields) == '(empty)'
+
+
+def test_expand_then_collapse_keeps_nested_values():
+    fields = ['title', 'description']
+    data = normalize_item({'title': 'Engineer', 'description': ['Built a thing', 'Led it'],
+                           'links': {'repo': 'https://example.com'}, 'url': 'x'}, fields)
+    # what the expanded item's widgets read back: text fields and meta rows only
+    edited = {'title': 'Lead engineer', 'url': 'https://example.com'}
+    merged = merge_edits(data, edited)
+    assert merged == {'title': 'Lead engineer', 'description': ['Built a thing', 'Led it'],
+                      'links': {'repo': 'https://example.com'}, 'url': 'https://example.com'}
+    assert list(merged) == ['title', 'description', 'links', 'url']
+    # expanding and collapsing again changes nothing
+    assert merge_edits(merged, edited) == merged
+    # a removed meta row is gone; a key typed in anew replaces the nested value
+    assert merge_edits(data, {'title': 'Engineer', 'links': 'none'}) == {
+        'title': 'Engineer', 'description': ['Built a thing', 'Led it'], 'links': 'none'}
@@ -0,0 +1,54 @@
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.generator.latex_escape import escape_text
+
+
+def chained_replace_escape(text):
+    """The escaper escape_text replaced, kept as a baseline."""
+    text = text.replace('&', r'\&').replace('%', r'\%').replace('$', r'\$')
+    text = text.replace('#', r'\#').replace('_', r'\_').replace('{', r'\{').replace('}', r'\}')
+    return re.sub(r'\[(.*?)\]\((.*?)\)', r'\\href{\2}{\1}', text)
+
+
+SAMPLES = [
+    'Google', 'Senior Software Engineer', 'Jan 2020 - Present', 'Python', 'C# (.NET)',
+    'Web & Mobile', 'Improved p99 latency by 40% across 3 regions',
+    'Built the [ingest pipeline](https://example.com/a_b#c) for snake_case {configs}',
+    'Worked on distributed systems and caching for large scale services in production',
+]
+
+
+def test_escapes_like_before_for_previously_handled_text():
+    for text in SAMPLES:
+        assert escape_text(text) == chained_replace_escape(text)
+
+
+def test_escapes_tilde_caret_and_backslash():
+    assert escape_text(r'~/bin ^2 C:\tmp') == r'\textasciitilde{}/bin \^{}2 C:\textbackslash{}tmp'
+
+
+def test_links_keep_urls_intact():
+    text = '[50% off](https://x.org/~me?a=1&b=2) and ~more'
+    assert escape_text(text) == r'\href{https://x.org/~me?a=1\&b=2}{50\% off} and \textasciitilde{}more'
+
+
+def test_micro_benchmark_beats_chained_replace():
+    def best(func):
+        return min(timeit.repeat(func, number=1000, repeat=5))
+
+    def uncached():
+        escape_text.cache_clear()
+        for t in SAMPLES:
+            escape_text(t)
+    baseline = best(lambda: [chained_replace_escape(t) for t in SAMPLES])
+    cold = best(uncached)
+    warm = best(lambda: [escape_text(t) for t in SAMPLES])
+    print(f'\nchained replace {baseline * 1000:.1f} ms, single pass {cold * 1000:.1f} ms '
+          f'({baseline / cold:.1f}x), memoized {warm * 1000:.1f} ms ({baseline / warm:.1f}x)')
+    # Only the memoized path has a margin wide enough to assert on a busy machine
+    assert warm < baseline
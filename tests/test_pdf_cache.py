@@ -0,0 +1,45 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.pdf_cache import PDFCache
+
+
+def test_key_depends_on_data_template_and_version():
+    data = {'name': {'first': 'A'}, 'skills': ['python']}
+    key = PDFCache.make_key(data, b'cls', 1)
+    assert key == PDFCache.make_key({'name': {'first': 'A'}, 'skills': ['python']}, b'cls', 1)
+    assert key != PDFCache.make_key({'name': {'first': 'B'}, 'skills': ['python']}, b'cls', 1)
+    assert key != PDFCache.make_key(data, b'other cls', 1)
+    assert key != PDFCache.make_key(data, b'cls', 2)
+    # mapping order decides section order, so it is part of the key
+    assert key != PDFCache.make_key({'skills': ['python'], 'name': {'first': 'A'}}, b'cls', 1)
+
+
+def test_get_returns_stored_pdf(tmp_path):
+    cache = PDFCache(tmp_path / 'cache')
+    pdf = tmp_path / 'resume.pdf'
+    pdf.write_bytes(b'%PDF-1.5 resume')
+    assert not cache.get('ab' * 32, tmp_path / 'out.pdf')
+    cache.put('ab' * 32, pdf)
+    assert cache.get('ab' * 32, tmp_path / 'out.pdf')
+    assert (tmp_path / 'out.pdf').read_bytes() == b'%PDF-1.5 resume'
+
+
+def test_prune_evicts_least_recently_used_first(tmp_path):
+    cache = PDFCache(tmp_path / 'cache', max_bytes=10_000)
+    pdf = tmp_path / 'resume.pdf'
+    pdf.write_bytes(b'x' * 400)
+    keys = [c * 64 for c in 'abc']
+    for i, key in enumerate(keys):
+        cache.put(key, pdf)
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    # touching 'a' makes 'b' the least recently used entry
+    assert cache.get(keys[0], tmp_path / 'out.pdf')
+    assert cache.prune(max_bytes=800) == 1
+    assert not cache._path(keys[1]).exists()
+    assert cache.stats()['entries'] == 2
+    assert cache.clear() == 2
+    assert cache.stats()['bytes'] == 0
@@ -0,0 +1,65 @@
+import sys
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.pdf_pages import page_fingerprints
+
+
+def make_pdf(page_texts, first_number=1, packed=False):
+    """A minimal PDF with one content stream per page.
+
+    ``packed`` puts the page dictionaries into a compressed object stream,
+    the way pdfTeX writes them.
+    """
+    n = first_number
+    catalog, pages, font = n, n + 1, n + 2
+    objects = {
+        catalog: b'<< /Type /Catalog /Pages %d 0 R >>' % pages,
+        font: b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    }
+    kids, page_objects = [], {}
+    number = font + 1
+    for text in page_texts:
+        content = zlib.compress(b'BT /F1 12 Tf 72 720 Td (' + text.encode() + b') Tj ET')
+        objects[number] = b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream' % (len(content), content)
+        page_objects[number + 1] = (b'<< /Type /Page /Parent %d 0 R /Contents %d 0 R '
+                                    b'/Resources << /Font << /F1 %d 0 R >> >> >>' % (pages, number, font))
+        kids.append(b'%d 0 R' % (number + 1))
+        number += 2
+    objects[pages] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(kids), len(kids))
+    if packed:
+        header = b' '.join(b'%d %d' % (num, 0) for num in page_objects)
+        offsets, body = [], b''
+        for num, obj in page_objects.items():
+            offsets.append(b'%d %d' % (num, len(body)))
+            body += obj + b'\n'
+        header = b' '.join(offsets) + b'\n'
+        stream = zlib.compress(header + body)
+        objects[number] = (b'<< /Type /ObjStm /N %d /First %d /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream'
+                           % (len(page_objects), len(header), len(stream), stream))
+    else:
+        objects.update(page_objects)
+    out = b'%PDF-1.5\n'
+    for num in sorted(objects):
+        out += b'%d 0 obj\n%s\nendobj\n' % (num, objects[num])
+    return out + b'trailer\n<< /Root %d 0 R >>\n%%%%EOF\n' % catalog
+
+
+def test_only_edited_pages_change_fingerprint():
+    before = page_fingerprints(make_pdf(['one', 'two', 'three']))
+    after = page_fingerprints(make_pdf(['one', 'TWO', 'three']))
+    assert len(before) == 3
+    assert before[0] == after[0] and before[2] == after[2]
+    assert before[1] != after[1]
+
+
+def test_fingerprints_ignore_object_numbers_and_packing():
+    plain = page_fingerprints(make_pdf(['one', 'two']))
+    assert page_fingerprints(make_pdf(['one', 'two'], first_number=40)) == plain
+    assert page_fingerprints(make_pdf(['one', 'two'], packed=True)) == plain
+
+
+def test_unreadable_pdf_gives_none():
+    assert page_fingerprints(b'not a pdf') is None
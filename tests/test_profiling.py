@@ -0,0 +1,88 @@
+import json
+import sys
+import textwrap
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core import profiling
+from src.core.cv_compiler import CVCompiler
+from src.core.profiling import Profile, count, stage
+
+
+def test_stages_record_only_while_active():
+    with stage('ignored'):
+        count('ignored')
+    assert profiling.current() is None
+
+    profile = Profile()
+    with profile.active():
+        for n in range(3):
+            with stage('outer', n=n), stage('inner'):
+                count('items', 2)
+    with stage('after'):
+        pass
+
+    assert profile.stages['outer'][0] == 3
+    assert profile.stages['inner'][0] == 3
+    assert profile.seconds('outer') >= profile.seconds('inner')
+    assert 'after' not in profile.stages
+    assert profile.counters == {'items': 6}
+    assert 'outer' in profile.report()
+
+    trace = profile.trace()
+    events = [e for e in trace['traceEvents'] if e['name'] == 'outer']
+    assert [e['args'] for e in events] == [{'n': 0}, {'n': 1}, {'n': 2}]
+    assert all(e['ph'] == 'X' and e['dur'] >= 0 for e in events)
+    assert trace['otherData']['counters'] == {'items': 6}
+
+
+def test_compile_records_build_stages(tmp_path):
+    engine = tmp_path / 'fakelatex'
+    engine.write_text(textwrap.dedent(f'''\
+        #!{sys.executable}
+        import sys
+        tex = sys.argv[-1]
+        with open(tex) as f, open(tex[:-4] + '.pdf', 'w') as out:
+            out.write(f.read())
+        '''))
+    engine.chmod(0o755)
+    cls_file = tmp_path / 'deedy.cls'
+    cls_file.write_text('')
+    yaml_file = tmp_path / 'resume.yaml'
+    yaml_file.write_text('name: {first: Ada, last: Lovelace}\n')
+    compiler = CVCompiler(str(tmp_path / 'build'), silent=True, engine=str(engine), backend='string')
+
+    profile = Profile()
+    with profile.active():
+        success, _ = compiler.build_pipeline(str(yaml_file), 'resume.tex', str(cls_file))
+    assert success
+
+    for name in ('compile', 'generate', 'latex.pass', 'compile.publish'):
+        assert name in profile.stages, name
+    assert profile.seconds('compile') >= profile.seconds('latex.pass')
+    assert 'LaTeX' in profile.headline(total='compile')
+    trace_file = tmp_path / 'trace.json'
+    profile.write_trace(trace_file)
+    assert json.loads(trace_file.read_text())['traceEvents']
+
+
+def test_batch_merges_worker_profiles(tmp_path):
+    from src.core.batch import run_batch
+
+    for n in range(3):
+        (tmp_path / f'r{n}.yaml').write_text(f'name: {{first: P{n}}}\n')
+    (tmp_path / 'deedy.cls').write_text('')
+
+    profile = Profile()
+    with profile.active():
+        report = run_batch(str(tmp_path / 'r*.yaml'), str(tmp_path / 'out'), str(tmp_path / 'deedy.cls'), workers=2)
+
+    # every job is timed, whether or not this machine has LaTeX
+    assert profile.stages['compile'][0] == 3
+    assert all('profile' not in result for result in report['results'])
+
+    merged = Profile()
+    merged.merge(profile.export())
+    merged.merge(profile.export())
+    assert merged.stages['compile'][0] == 6
@@ -0,0 +1,66 @@
+import json
+import sys
+import textwrap
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.cv_compiler import CVCompiler
+from src.core.render_server import RenderServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    engine = tmp_path / 'fakelatex'
+    engine.write_text(textwrap.dedent(f'''\
+        #!{sys.executable}
+        import sys
+        tex = sys.argv[-1]
+        with open(tex) as f, open(tex[:-4] + '.pdf', 'w') as out:
+            out.write(f.read())
+        '''))
+    engine.chmod(0o755)
+    (tmp_path / 'cls').mkdir()
+    (tmp_path / 'cls' / 'deedy.cls').write_text('')
+    compiler = CVCompiler(str(tmp_path / 'build'), silent=True, engine=str(engine), backend='string')
+    server = RenderServer(compiler, ('127.0.0.1', 0), templates_dir=str(tmp_path / 'cls'), workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+def request(server, path, body=None, content_type='application/json'):
+    host, port = server.address
+    req = urllib.request.Request(f'http://{host}:{port}{path}', data=body, headers={'Content-Type': content_type})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as reply:
+            return reply.status, reply.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_render_pdf_and_tex(server):
+    body = json.dumps({'name': {'first': 'Ada', 'last': 'Lovelace'}}).encode()
+    status, pdf = request(server, '/render', body)
+    assert status == 200 and b'\\namesection{Ada}' in pdf
+
+    status, tex = request(server, '/render?format=tex', b'name: {first: Alan, last: Turing}\n', 'application/yaml')
+    assert status == 200 and tex.startswith(b'\\documentclass')
+
+    metrics = json.loads(request(server, '/metrics')[1])
+    assert metrics['completed'] == 2 and metrics['failed'] == 0
+
+
+def test_bad_requests(server):
+    assert request(server, '/health') == (200, b'{"status": "ok"}')
+    assert request(server, '/render', b'[1, 2]')[0] == 400
+    assert request(server, '/render', b'{"broken"')[0] == 400
+    assert request(server, '/render?template=../secret', b'{}')[0] == 404
+    assert request(server, '/render?format=docx', b'{}')[0] == 400
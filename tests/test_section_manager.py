@@ -0,0 +1,95 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / 'src'), str(ROOT)]
+
+from models.resume_model import ResumeModel
+
+# gui/__init__ imports the Tk main window; the manager itself needs no toolkit
+_spec = importlib.util.spec_from_file_location('section_manager', ROOT / 'src' / 'gui' / 'section_manager.py')
+section_manager = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(section_manager)
+
+
+class Section:
+    def __init__(self, data, visible=True):
+        self.data = data
+        self.visible = visible
+
+    def get_data(self):
+        return self.data
+
+
+class Scheduler:
+    """Records after() calls instead of running a Tk event loop."""
+
+    def __init__(self):
+        self.jobs = {}
+
+    def after(self, ms, callback):
+        job = f'after#{len(self.jobs)}'
+        self.jobs[job] = callback
+        return job
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run(self):
+        jobs, self.jobs = self.jobs, {}
+        for callback in jobs.values():
+            callback()
+
+
+def test_autosave_is_debounced_and_redumps_only_changed_sections(tmp_path, monkeypatch):
+    yaml_file = tmp_path / 'resume.yaml'
+    yaml_file.write_text('{}\n')
+    sections = {'skills': Section(['Python']), 'projects': Section([{'title': 'LaTeXCV'}], visible=False)}
+    names = ['skills', 'projects']
+    scheduler = Scheduler()
+    manager = section_manager.SectionManager(ResumeModel(str(yaml_file)), sections, names, [], scheduler=scheduler)
+    dumped = []
+    real_dump = section_manager.dump
+    monkeypatch.setattr(section_manager, 'dump', lambda data, **kw: dumped.append(list(data)) or real_dump(data, **kw))
+
+    manager.reorder_section('projects', 0)
+    manager.reorder_section('projects', 1)
+    manager.autosave_order()
+    assert yaml_file.read_text() == '{}\n' and len(scheduler.jobs) == 1
+
+    scheduler.run()
+    assert dumped == [['_order'], ['skills'], ['projects']]
+    assert yaml_file.read_text() == ('_order:\n- skills\n- projects\n\nskills:\n- Python\n\n'
+                                     '# projects:\n# - title: LaTeXCV\n')
+
+    dumped.clear()
+    sections['skills'].data = ['Python', 'TeX']
+    manager.autosave_order()
+    scheduler.run()
+    assert dumped == [['_order'], ['skills']]
+    assert '- TeX' in yaml_file.read_text()
+    assert not list(tmp_path.glob('.resume.yaml-*'))
+
+
+def test_unchanged_section_versions_skip_reading_widgets(tmp_path):
+    class TrackedSection(Section):
+        version = 1
+        reads = 0
+
+        def get_data(self):
+            self.reads += 1
+            return self.data
+
+    yaml_file = tmp_path / 'resume.yaml'
+    section = TrackedSection({'first': 'Ada'})
+    manager = section_manager.SectionManager(ResumeModel(str(yaml_file)), {'name': section}, ['name'], [])
+
+    manager.autosave_order()
+    manager.autosave_order()
+    assert section.reads == 1
+
+    section.data, section.version = {'first': 'Grace'}, 2
+    manager.autosave_order()
+    assert section.reads == 2
+    assert 'first: Grace' in yaml_file.read_text()
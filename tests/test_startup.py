@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.bench_startup import forbidden_imports, startup_profile
+
+
+def test_generate_imports_only_what_it_needs(tmp_path):
+    (tmp_path / 'resume.yaml').write_text('name: {first: Ada, last: Lovelace}\nskills: [Python]\n')
+    profile = startup_profile(['generate', 'resume.yaml', '--output', 'out.tex', '--backend', 'string'], cwd=tmp_path)
+
+    assert profile['returncode'] == 0, profile['stderr'][-2000:]
+    assert '\\namesection{Ada}' in (tmp_path / 'out.tex').read_text()
+    assert forbidden_imports(profile['modules']) == []
+    # the compile stack is only loaded by the subcommands that compile
+    assert not any(name.startswith('src.core.cv_compiler') or name.startswith('src.core.compile_daemon')
+                   for name in profile['modules'])
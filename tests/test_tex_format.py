@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.tex_format import FormatCache, split_preamble
+
+PREAMBLE = '\\documentclass{deedy}%\n\\usepackage{hyperref}%\n'
+
+
+class FakeDumpCache(FormatCache):
+    """FormatCache whose dumps just write a file, or fail on request."""
+
+    def __init__(self, fmt_dir, fail=False):
+        super().__init__(fmt_dir)
+        self.fail = fail
+        self.dumps = 0
+
+    def _dump(self, name, cls_file, preamble, timeout):
+        self.dumps += 1
+        if self.fail:
+            return False
+        self.fmt_dir.mkdir(parents=True, exist_ok=True)
+        (self.fmt_dir / f'{name}.fmt').write_text(preamble)
+        return True
+
+
+def test_split_preamble():
+    assert split_preamble(PREAMBLE + '\\begin{document}%\nbody') == PREAMBLE
+    assert split_preamble('no document here') is None
+
+
+def test_format_is_dumped_once_and_rebuilt_when_template_changes(tmp_path):
+    cls_file = tmp_path / 'deedy.cls'
+    cls_file.write_text('\\ProvidesClass{deedy}')
+    cache = FakeDumpCache(tmp_path / 'fmt')
+
+    first = cache.get(cls_file, PREAMBLE)
+    assert first.exists()
+    assert cache.get(cls_file, PREAMBLE) == first
+    assert cache.dumps == 1
+
+    cls_file.write_text('\\ProvidesClass{deedy}\n% edited')
+    second = cache.get(cls_file, PREAMBLE)
+    assert second != first and second.exists()
+    assert not first.exists()  # the stale format of the same template is gone
+    assert cache.get(cls_file, PREAMBLE + '\\usepackage{xcolor}%\n') != second
+
+
+def test_failed_dump_is_not_retried(tmp_path):
+    cls_file = tmp_path / 'deedy.cls'
+    cls_file.write_text('\\ProvidesClass{deedy}')
+    cache = FakeDumpCache(tmp_path / 'fmt', fail=True)
+    assert cache.get(cls_file, PREAMBLE) is None
+    assert cache.get(cls_file, PREAMBLE) is None
+    assert cache.dumps == 1
+
+
+def test_templates_of_the_same_name_keep_their_own_formats(tmp_path):
+    cache = FakeDumpCache(tmp_path / 'fmt')
+    formats = []
+    for folder in ('cls', 'custom'):
+        (tmp_path / folder).mkdir()
+        cls_file = tmp_path / folder / 'deedy.cls'
+        cls_file.write_text(f'\\ProvidesClass{{deedy}} % {folder}')
+        formats.append(cache.get(cls_file, PREAMBLE))
+    assert formats[0] != formats[1]
+    assert all(fmt.exists() for fmt in formats)
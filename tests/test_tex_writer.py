@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.generator.tex_writer import TexWriter, escape_latex, section_marker
+
+DATA = {
+    'name': {'first': 'Jane', 'last': 'Doe'},
+    'contact': {'email': 'jane@example.com', 'github': 'https://github.com/jane'},
+    '_order': ['experience', 'skills'],
+    'skills': [{'left': True}, {'title': 'C# & C++', 'details': '100% {braces} [link](https://x.org)'}],
+    'experience': [{
+        'position': 'SDE', 'company': 'ACME_Corp', 'dates': '2020 - 2024', 'url': 'https://acme.org',
+        'description': '- shipped things\n  across lines\n- fixed #42',
+        'contribution': [{'project': 'Nested', 'details': 'inner'}, 'ignored'],
+        'technologies': ['python', 'rust'],
+    }, {'title': 'Empty nested', 'contribution': []}],
+    'hobbies': ['Chess', 'Trail_Running'],
+}
+
+
+def test_writer_matches_pylatex_layout():
+    w = TexWriter()
+    w.item('a')
+    with w.environment('enumerate', '[x]', omit_if_empty=True):
+        pass
+    with w.section('R&D_1'):
+        w.newline()
+        with w.environment('minipage', arguments='{w}'):
+            w.command('descript', 'b')
+    assert w.getvalue() == ('a%\n%\n\\section{R\\&D\\_1}%\n\\label{sec:RD1}%\n\\newline%\n'
+                            '\\begin{minipage}{w}%\n\\descript{b}%\n\\end{minipage}\n\n')
+    assert escape_latex('a-b~') == 'a{-}b\\textasciitilde{}'
+    assert section_marker('Work: "2024"') == 'Work2024'
+
+
+def test_string_backend_is_byte_identical_to_pylatex(tmp_path, monkeypatch):
+    pylatex = pytest.importorskip('pylatex')
+    if not hasattr(pylatex, '__version__'):
+        pytest.skip('pylatex is stubbed out in this session')
+    from src.core.generator import FragmentCache, ResumeGenerator
+
+    yaml_path = tmp_path / 'resume.yaml'
+    yaml_path.write_text(yaml.safe_dump(DATA, sort_keys=False))
+    monkeypatch.chdir(tmp_path)
+    ResumeGenerator(str(yaml_path), 'deedy.cls').generate('pylatex.tex')
+    ResumeGenerator(str(yaml_path), 'deedy.cls', backend='string').generate('string.tex')
+    cache = FragmentCache()
+    for _ in range(2):
+        ResumeGenerator(str(yaml_path), 'deedy.cls', fragment_cache=cache, backend='string').generate('cached.tex')
+    expected = (tmp_path / 'pylatex.tex').read_text()
+    assert (tmp_path / 'string.tex').read_text() == expected
+    assert (tmp_path / 'cached.tex').read_text() == expected
+
+
+def test_generator_renders_from_memory(tmp_path):
+    from src.core.generator import ResumeGenerator
+
+    yaml_path = tmp_path / 'resume.yaml'
+    yaml_path.write_text(yaml.safe_dump(DATA, sort_keys=False))
+    from_file = ResumeGenerator(str(yaml_path), 'deedy.cls', backend='string').to_string()
+    generator = ResumeGenerator.from_data(DATA, 'deedy.cls', backend='string')
+    assert generator.to_string() == from_file
+    # rendering leaves the data alone, so it can be repeated
+    assert generator.to_string() == from_file
+    assert DATA['skills'][0] == {'left': True}
+    with yaml_path.open() as f:
+        assert ResumeGenerator.from_stream(f, 'deedy.cls', backend='string').to_string() == from_file
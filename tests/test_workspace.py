@@ -0,0 +1,51 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core import workspace
+from src.core.workspace import WorkspacePool, link_asset
+
+
+def test_released_workspaces_are_emptied_and_reused(tmp_path):
+    pool = WorkspacePool(root=str(tmp_path), max_idle=1)
+    first = pool.acquire()
+    second = pool.acquire()
+    (Path(first) / 'resume.aux').write_text('stale')
+    (Path(first) / 'sub').mkdir()
+    (Path(first) / 'sub' / 'file').write_text('x')
+
+    pool.release(first)
+    pool.release(second)
+    pool.drain()
+
+    # only max_idle workspaces are kept; the other one is deleted
+    assert [os.path.exists(first), os.path.exists(second)].count(True) == 1
+    again = pool.acquire()
+    assert again in (first, second)
+    assert os.listdir(again) == []
+    assert (pool.created, pool.reused) == (2, 1)
+
+    pool.close()
+    assert not os.path.exists(again)
+
+
+def test_link_asset_falls_back_to_symlink_and_copy(tmp_path, monkeypatch):
+    src = tmp_path / 'deedy.cls'
+    src.write_text('\\ProvidesClass{deedy}')
+    work = tmp_path / 'work'
+    work.mkdir()
+
+    linked = link_asset(str(src), str(work))
+    assert os.path.samefile(linked, src) and not os.path.islink(linked)
+
+    def no_link(*args):
+        raise OSError('cross-device link')
+    monkeypatch.setattr(workspace.os, 'link', no_link)
+    assert os.path.islink(link_asset(str(src), str(work)))
+
+    monkeypatch.setattr(workspace.os, 'symlink', no_link)
+    copied = link_asset(str(src), str(work))
+    assert not os.path.islink(copied) and not os.path.samefile(copied, src)
+    assert Path(copied).read_text() == '\\ProvidesClass{deedy}'
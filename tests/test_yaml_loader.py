@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core import yaml_loader
+from src.core.yaml_loader import invalidate, load_file
+
+
+def test_load_file_parses_once_and_hands_out_copies(tmp_path, monkeypatch):
+    path = tmp_path / 'resume.yaml'
+    path.write_text('name: {first: Ada}\nskills: [Python, C]\n')
+    parses = []
+    real_loads = yaml_loader.loads
+    monkeypatch.setattr(yaml_loader, 'loads', lambda stream: parses.append(1) or real_loads(stream))
+
+    first = load_file(path)
+    first['skills'].append('mutated')
+    second = load_file(str(path))
+
+    assert second == {'name': {'first': 'Ada'}, 'skills': ['Python', 'C']}
+    assert len(parses) == 1
+
+    path.write_text('name: {first: Grace}\n')
+    assert load_file(path) == {'name': {'first': 'Grace'}}
+    invalidate(path)
+    load_file(path)
+    assert len(parses) == 3
+
+
+def test_load_file_defaults(tmp_path):
+    (tmp_path / 'empty.yaml').write_text('')
+    assert load_file(tmp_path / 'missing.yaml', {}) == {}
+    assert load_file(tmp_path / 'empty.yaml', {}) == {}
+    assert load_file(tmp_path / 'missing.yaml') is None